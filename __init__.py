@@ -1,4 +1,5 @@
 from .core.detector import TokopediaFakeDetector
+from .core.result import AnalysisResult
 
 __version__ = "1.0.0"
-__all__ = ["TokopediaFakeDetector"]
+__all__ = ["TokopediaFakeDetector", "AnalysisResult"]
@@ -1,10 +1,15 @@
-from .patterns import PatternAnalyzer
-from .buyers import BuyerAnalyzer
-from .ratings import RatingAnalyzer
-from .time_analysis import TimeAnalyzer
-from .variants import VariantAnalyzer
+from .patterns import PatternAnalyzer, PatternAccumulator
+from .buyers import BuyerAnalyzer, BuyerAccumulator
+from .ratings import RatingAnalyzer, RatingAccumulator
+from .time_analysis import TimeAnalyzer, TimeAccumulator
+from .variants import VariantAnalyzer, VariantAccumulator
 from .trust import TrustAnalyzer
 from .scorer import FakeScorer
+from .similarity import SimilarityEngine, ExactSimilarityEngine, PrefixFilterSimilarityEngine
+from .pipeline import ReviewPipeline, StreamingAnalysis
+from .table import ReviewTable
+from .reviewer_graph import ReviewerGraph
+from .text import TokenizedReview, TokenCache
 
 __all__ = [
     "PatternAnalyzer",
@@ -13,5 +18,19 @@ __all__ = [
     "TimeAnalyzer",
     "VariantAnalyzer",
     "TrustAnalyzer",
-    "FakeScorer"
+    "FakeScorer",
+    "SimilarityEngine",
+    "ExactSimilarityEngine",
+    "PrefixFilterSimilarityEngine",
+    "PatternAccumulator",
+    "BuyerAccumulator",
+    "RatingAccumulator",
+    "TimeAccumulator",
+    "VariantAccumulator",
+    "ReviewPipeline",
+    "StreamingAnalysis",
+    "ReviewTable",
+    "ReviewerGraph",
+    "TokenizedReview",
+    "TokenCache"
 ]
@@ -1,9 +1,81 @@
-from typing import List, Dict
+from bisect import bisect_left
+from typing import List, Dict, Optional
 from collections import Counter
+from datetime import datetime
+from ..utils import parse_timestamp
+from .table import ReviewTable, ordered_counts, np
+
+class BuyerAccumulator:
+    def __init__(self):
+        self.total_reviews = 0
+        self.anonymous_count = 0
+        self.user_review_times = {}
+        self.label_counter = Counter()
+        self._burst_users = []
+        self._burst_set = set()
+        self._burst_sorted = True
+        self._user_order = {}
+    
+    def update(self, review: Dict, timestamp: int = 0, moment: Optional[datetime] = None):
+        self.total_reviews += 1
+        if review.get('isAnonymous', False):
+            self.anonymous_count += 1
+        
+        if review.get('user') and review['user'].get('userID'):
+            user_id = review['user']['userID']
+            
+            if user_id not in self.user_review_times:
+                self.user_review_times[user_id] = []
+                self._user_order[user_id] = len(self._user_order)
+            timestamps = self.user_review_times[user_id]
+            position = bisect_left(timestamps, timestamp)
+            timestamps.insert(position, timestamp)
+            if ((position > 0 and timestamp - timestamps[position - 1] < 300) or
+                    (position + 1 < len(timestamps) and timestamps[position + 1] - timestamp < 300)):
+                if user_id not in self._burst_set:
+                    self._burst_set.add(user_id)
+                    self._burst_users.append(user_id)
+                    self._burst_sorted = False
+            
+            if review['user'].get('label'):
+                self.label_counter[review['user']['label']] += 1
+    
+    def finalize(self) -> Dict:
+        buyer_analysis = {
+            'anonymous_percentage': 0,
+            'new_accounts': 0,
+            'single_review_accounts': [],
+            'burst_reviewers': [],
+            'verified_buyers': 0,
+            'labeled_users': {}
+        }
+        
+        total_reviews = self.total_reviews
+        if total_reviews > 0:
+            buyer_analysis['anonymous_percentage'] = (self.anonymous_count / total_reviews) * 100
+        
+        buyer_analysis['labeled_users'] = dict(self.label_counter)
+        
+        if 'Verified Buyer' in self.label_counter:
+            buyer_analysis['verified_buyers'] = (self.label_counter['Verified Buyer'] / total_reviews * 100) if total_reviews > 0 else 0
+        
+        if not self._burst_sorted:
+            self._burst_users.sort(key=self._user_order.__getitem__)
+            self._burst_sorted = True
+        buyer_analysis['burst_reviewers'] = list(self._burst_users)
+        
+        return buyer_analysis
 
 class BuyerAnalyzer:
     @staticmethod
     def analyze(reviews: List[Dict]) -> Dict:
+        accumulator = BuyerAccumulator()
+        for review in reviews:
+            accumulator.update(review, parse_timestamp(review.get('reviewCreateTimestamp', 0)))
+        return accumulator.finalize()
+    
+    @staticmethod
+    def analyze_table(table: ReviewTable) -> Dict:
         buyer_analysis = {
             'anonymous_percentage': 0,
             'new_accounts': 0,
@@ -13,42 +85,40 @@ class BuyerAnalyzer:
             'labeled_users': {}
         }
         
-        total_reviews = len(reviews)
-        anonymous_count = sum(1 for r in reviews if r.get('isAnonymous', False))
-        
+        total_reviews = len(table)
         if total_reviews > 0:
+            anonymous_count = int(np.count_nonzero(table.column('anonymous'))) if np is not None else sum(table.anonymous)
             buyer_analysis['anonymous_percentage'] = (anonymous_count / total_reviews) * 100
         
-        user_review_times = {}
-        label_counter = Counter()
-        
-        for review in reviews:
-            if review.get('user') and review['user'].get('userID'):
-                user_id = review['user']['userID']
-                timestamp = review.get('reviewCreateTimestamp', 0)
-                try:
-                    timestamp = int(timestamp) if timestamp else 0
-                except (ValueError, TypeError):
-                    timestamp = 0
-                
-                if user_id not in user_review_times:
-                    user_review_times[user_id] = []
-                user_review_times[user_id].append(timestamp)
-                
-                if review['user'].get('label'):
-                    label_counter[review['user']['label']] += 1
-        
-        buyer_analysis['labeled_users'] = dict(label_counter)
+        label_counter = {table.label_names[label]: count for label, count in ordered_counts(table.column('labels'))}
+        buyer_analysis['labeled_users'] = label_counter
         
         if 'Verified Buyer' in label_counter:
             buyer_analysis['verified_buyers'] = (label_counter['Verified Buyer'] / total_reviews * 100) if total_reviews > 0 else 0
         
-        for user_id, timestamps in user_review_times.items():
-            if len(timestamps) > 1:
-                timestamps.sort()
-                time_diffs = [timestamps[i+1] - timestamps[i] for i in range(len(timestamps)-1)]
-                
-                if any(diff < 300 for diff in time_diffs):
-                    buyer_analysis['burst_reviewers'].append(user_id)
-        
+        buyer_analysis['burst_reviewers'] = [table.users[user] for user in BuyerAnalyzer._burst_users(table)]
         return buyer_analysis
+    
+    @staticmethod
+    def _burst_users(table: ReviewTable) -> List[int]:
+        if np is not None:
+            users = table.column('user_ids')
+            timestamps = table.column('timestamps')
+            known = users >= 0
+            users, timestamps = users[known], timestamps[known]
+            order = np.lexsort((timestamps, users))
+            users, timestamps = users[order], timestamps[order]
+            bursts = (users[1:] == users[:-1]) & ((timestamps[1:] - timestamps[:-1]) < 300)
+            return [int(user) for user in np.unique(users[1:][bursts])]
+        
+        user_review_times: Dict[int, List[int]] = {}
+        for user, timestamp in zip(table.user_ids, table.timestamps):
+            if user >= 0:
+                user_review_times.setdefault(user, []).append(timestamp)
+        
+        burst_users = []
+        for user, timestamps in user_review_times.items():
+            timestamps.sort()
+            if any(timestamps[i+1] - timestamps[i] < 300 for i in range(len(timestamps) - 1)):
+                burst_users.append(user)
+        return sorted(burst_users)
@@ -1,55 +1,105 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
+from datetime import datetime
 from collections import Counter
-from ..utils import calculate_similarity
+from .similarity import SimilarityEngine, PrefixFilterSimilarityEngine
+from .table import ReviewTable
+from .text import TokenCache, TokenizedReview, TOKEN_CACHE
 
-class PatternAnalyzer:
-    @staticmethod
-    def analyze(reviews: List[Dict]) -> Dict:
-        patterns = {
-            'duplicate_phrases': [],
-            'generic_reviews': 0,
-            'suspiciously_similar': [],
-            'excessive_praise': 0,
-            'keyword_stuffing': 0
-        }
-        
-        generic_phrases = [
-            'bagus', 'mantap', 'oke', 'recommended', 'puas', 'sesuai',
-            'cepat', 'original', 'terima kasih', 'makasih', 'thanks'
-        ]
+STUFFED_KEYWORDS = ('bagus', 'mantap')
+PRAISE_PHRASES = ('terbaik', 'sempurna', 'luar biasa', 'sangat bagus sekali')
+
+def message_flags(review: TokenizedReview) -> tuple:
+    if review.flags is None:
+        text = review.text
+        review.flags = (
+            len(review) < 5,
+            any(text.count(keyword) > 2 for keyword in STUFFED_KEYWORDS),
+            any(phrase in text for phrase in PRAISE_PHRASES)
+        )
+    return review.flags
+
+class PatternAccumulator:
+    def __init__(self, engine: Optional[SimilarityEngine] = None, cache: Optional[TokenCache] = None):
+        self.engine = engine or PatternAnalyzer.similarity_engine
+        self.cache = cache or TOKEN_CACHE
+        self.vocabulary = self.cache.vocabulary
+        self.messages = []
+        self.reviews = []
+        self.generic_reviews = 0
+        self.keyword_stuffing = 0
+        self.excessive_praise = 0
+        self.phrase_counter = Counter()
+        self._pair_index = self.engine.index(PatternAnalyzer.similarity_threshold)
+        self._first_seen = {}
+        self._duplicates = []
+        self._decoded = {}
+        self._duplicates_sorted = True
+    
+    def update(self, review: Dict, timestamp: int = 0, moment: Optional[datetime] = None):
+        msg = review.get('message')
+        if msg:
+            self.add_message(msg)
+    
+    def add_message(self, msg: str):
+        self.messages.append(msg)
+        review = self.cache.get(msg, self.vocabulary)
+        self.reviews.append(review)
+        generic, stuffed, praise = message_flags(review)
         
-        messages = [r['message'] for r in reviews if r.get('message')]
+        if generic:
+            self.generic_reviews += 1
         
-        for i, msg1 in enumerate(messages):
-            if not msg1:
-                continue
-                
-            msg1_lower = msg1.lower()
-            
-            if len(msg1_lower.split()) < 5:
-                patterns['generic_reviews'] += 1
-            
-            if msg1_lower.count('bagus') > 2 or msg1_lower.count('mantap') > 2:
-                patterns['keyword_stuffing'] += 1
-            
-            if any(phrase in msg1_lower for phrase in ['terbaik', 'sempurna', 'luar biasa', 'sangat bagus sekali']):
-                patterns['excessive_praise'] += 1
-            
-            for j, msg2 in enumerate(messages[i+1:], i+1):
-                if not msg2:
-                    continue
-                similarity = calculate_similarity(msg1, msg2)
-                if similarity > 0.8:
-                    patterns['suspiciously_similar'].append((i, j, similarity))
+        if stuffed:
+            self.keyword_stuffing += 1
         
-        phrase_counter = Counter()
-        for msg in messages:
-            if msg:
-                words = msg.lower().split()
-                for i in range(len(words) - 2):
-                    phrase = ' '.join(words[i:i+3])
-                    phrase_counter[phrase] += 1
+        if praise:
+            self.excessive_praise += 1
         
-        patterns['duplicate_phrases'] = [(phrase, count) for phrase, count in phrase_counter.items() if count > 3]
+        phrase_counter = self.phrase_counter
+        for phrase in review.trigrams:
+            count = phrase_counter[phrase] + 1
+            phrase_counter[phrase] = count
+            if count == 1:
+                self._first_seen[phrase] = len(self._first_seen)
+            elif count == 4:
+                self._duplicates.append(phrase)
+                self._decoded[phrase] = self.vocabulary.decode(phrase)
+                self._duplicates_sorted = False
         
-        return patterns
+        self._pair_index.add(msg, review)
+    
+    def similar_pairs(self) -> List:
+        return self._pair_index.pairs(self.messages, self.reviews)
+    
+    def duplicate_phrases(self) -> List:
+        if not self._duplicates_sorted:
+            self._duplicates.sort(key=self._first_seen.__getitem__)
+            self._duplicates_sorted = True
+        return [(self._decoded[phrase], self.phrase_counter[phrase]) for phrase in self._duplicates]
+    
+    def finalize(self) -> Dict:
+        return {
+            'duplicate_phrases': self.duplicate_phrases(),
+            'generic_reviews': self.generic_reviews,
+            'suspiciously_similar': self.similar_pairs(),
+            'excessive_praise': self.excessive_praise,
+            'keyword_stuffing': self.keyword_stuffing
+        }
+
+class PatternAnalyzer:
+    similarity_engine: SimilarityEngine = PrefixFilterSimilarityEngine()
+    similarity_threshold = 0.8
+    
+    @staticmethod
+    def analyze(reviews: List[Dict], engine: Optional[SimilarityEngine] = None) -> Dict:
+        accumulator = PatternAccumulator(engine)
+        for review in reviews:
+            accumulator.update(review)
+        return accumulator.finalize()
+    
+    @staticmethod
+    def analyze_table(table: ReviewTable, engine: Optional[SimilarityEngine] = None) -> Dict:
+        accumulator = PatternAccumulator(engine)
+        for msg in table.messages():
+            accumulator.add_message(msg)
+        return accumulator.finalize()
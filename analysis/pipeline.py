@@ -0,0 +1,139 @@
+from typing import List, Dict, Optional
+from .patterns import PatternAccumulator, PatternAnalyzer
+from .buyers import BuyerAccumulator, BuyerAnalyzer
+from .ratings import RatingAccumulator, RatingAnalyzer
+from .time_analysis import TimeAccumulator, TimeAnalyzer
+from .variants import VariantAccumulator, VariantAnalyzer
+from .similarity import SimilarityEngine
+from .table import ReviewTable
+from .scorer import FakeScorer
+from ..utils import parse_timestamp, timestamp_to_datetime, review_key
+from ..metrics import current_trace
+
+class ReviewPipeline:
+    def __init__(self, engine: Optional[SimilarityEngine] = None):
+        self.patterns = PatternAccumulator(engine)
+        self.buyers = BuyerAccumulator()
+        self.ratings = RatingAccumulator()
+        self.time_data = TimeAccumulator()
+        self.variants = VariantAccumulator()
+        self.review_count = 0
+        self._accumulators = (self.patterns, self.buyers, self.ratings, self.time_data, self.variants)
+    
+    def update(self, review: Dict):
+        timestamp = parse_timestamp(review.get('reviewCreateTimestamp', 0))
+        moment = timestamp_to_datetime(timestamp)
+        for accumulator in self._accumulators:
+            accumulator.update(review, timestamp, moment)
+        self.review_count += 1
+    
+    def extend(self, reviews: List[Dict]):
+        for review in reviews:
+            self.update(review)
+    
+    def finalize(self) -> Dict[str, Dict]:
+        return {
+            'patterns': self.patterns.finalize(),
+            'buyers': self.buyers.finalize(),
+            'ratings': self.ratings.finalize(),
+            'time_data': self.time_data.finalize(),
+            'variants': self.variants.finalize()
+        }
+    
+    @staticmethod
+    def run(reviews: List[Dict], engine: Optional[SimilarityEngine] = None) -> Dict[str, Dict]:
+        with current_trace().span("analyze:pipeline", reviews=len(reviews)):
+            pipeline = ReviewPipeline(engine)
+            pipeline.extend(reviews)
+            return pipeline.finalize()
+    
+    @staticmethod
+    def run_table(table: ReviewTable, engine: Optional[SimilarityEngine] = None) -> Dict[str, Dict]:
+        trace = current_trace()
+        reviews = len(table)
+        with trace.span("analyze:patterns", reviews=reviews):
+            patterns = PatternAnalyzer.analyze_table(table, engine)
+        with trace.span("analyze:buyers", reviews=reviews):
+            buyers = BuyerAnalyzer.analyze_table(table)
+        with trace.span("analyze:ratings", reviews=reviews):
+            ratings = RatingAnalyzer.analyze_table(table)
+        with trace.span("analyze:time", reviews=reviews):
+            time_data = TimeAnalyzer.analyze_table(table)
+        with trace.span("analyze:variants", reviews=reviews):
+            variants = VariantAnalyzer.analyze_table(table)
+        return {
+            'patterns': patterns,
+            'buyers': buyers,
+            'ratings': ratings,
+            'time_data': time_data,
+            'variants': variants
+        }
+
+class StreamingAnalysis:
+    def __init__(self, rating_topics: Optional[Dict] = None, engine: Optional[SimilarityEngine] = None,
+                 keep_reviews: bool = False):
+        self.pipeline = ReviewPipeline(engine)
+        self.engine = engine
+        self.rating_topics = rating_topics
+        self.pages = 0
+        self.restored = 0
+        self.keep_reviews = keep_reviews
+        self.known: List[Dict] = []
+        self.reviews: List[Dict] = []
+        self._seen_ids = set()
+        self._snapshot: Optional[Dict[str, Dict]] = None
+        self._snapshot_size = -1
+    
+    @property
+    def review_count(self) -> int:
+        return self.pipeline.review_count
+    
+    def feed_page(self, reviews: List[Dict]) -> Dict[str, Dict]:
+        reviews = self._unseen(reviews)
+        with current_trace().span("ingest", reviews=len(reviews)):
+            self.pipeline.extend(reviews)
+        if self.keep_reviews:
+            self.reviews.extend(reviews)
+        self.pages += 1
+        return self.snapshot()
+    
+    def restore(self, reviews: List[Dict]):
+        reviews = self._unseen(reviews)
+        with current_trace().span("restore", reviews=len(reviews)):
+            self.pipeline.extend(reviews)
+        if self.keep_reviews:
+            self.known.extend(reviews)
+        self.restored += len(reviews)
+    
+    def all_reviews(self) -> List[Dict]:
+        return self.known + self.reviews
+    
+    def _unseen(self, reviews: List[Dict]) -> List[Dict]:
+        fresh = []
+        for review in reviews:
+            key = review_key(review)
+            if key in self._seen_ids:
+                continue
+            self._seen_ids.add(key)
+            fresh.append(review)
+        return fresh
+    
+    def snapshot(self) -> Dict[str, Dict]:
+        if self._snapshot is None or self._snapshot_size != self.review_count:
+            with current_trace().span("analyze:snapshot", reviews=self.review_count):
+                self._snapshot = self.pipeline.finalize()
+            self._snapshot_size = self.review_count
+        return self._snapshot
+    
+    def final(self) -> Dict[str, Dict]:
+        return self.snapshot()
+    
+    def provisional_score(self, analysis: Optional[Dict[str, Dict]] = None) -> float:
+        analysis = analysis or self.snapshot()
+        return FakeScorer.calculate(analysis['patterns'], analysis['buyers'], analysis['ratings'],
+                                    analysis['time_data'], self.rating_topics, analysis['variants'])
+    
+    def is_saturated(self, analysis: Optional[Dict[str, Dict]] = None) -> bool:
+        analysis = analysis or self.snapshot()
+        return FakeScorer.is_saturated(analysis['patterns'], analysis['buyers'], analysis['ratings'],
+                                       analysis['time_data'], self.rating_topics)
@@ -1,11 +1,27 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 from collections import Counter
 from datetime import datetime
 import statistics
+from .table import ReviewTable, ordered_counts, timestamp_array, wib_calendar, day_label
 
-class RatingAnalyzer:
-    @staticmethod
-    def analyze(reviews: List[Dict]) -> Dict:
+INFLUX_PER_DAY = 10
+
+class RatingAccumulator:
+    def __init__(self):
+        self.rating_counter = Counter()
+        self.timestamps_by_day = {}
+    
+    def update(self, review: Dict, timestamp: int = 0, moment: Optional[datetime] = None):
+        if review.get('productRating'):
+            self.rating_counter[review['productRating']] += 1
+        
+        if moment is not None:
+            date = moment.date()
+            if date not in self.timestamps_by_day:
+                self.timestamps_by_day[date] = 0
+            self.timestamps_by_day[date] += 1
+    
+    def finalize(self) -> Dict:
         rating_analysis = {
             'distribution': {},
             'average': 0,
@@ -14,36 +30,70 @@ class RatingAnalyzer:
             'sudden_influx': []
         }
         
-        ratings = [r['productRating'] for r in reviews if r.get('productRating')]
-        
-        if ratings:
-            rating_counter = Counter(ratings)
+        rating_counter = self.rating_counter
+        if rating_counter:
+            total_ratings = sum(rating_counter.values())
             rating_analysis['distribution'] = dict(rating_counter)
-            rating_analysis['average'] = statistics.mean(ratings)
+            if all(type(rating) is int for rating in rating_counter):
+                rating_sum = sum(rating * count for rating, count in rating_counter.items())
+                rating_analysis['average'] = rating_sum // total_ratings if rating_sum % total_ratings == 0 else rating_sum / total_ratings
+            else:
+                rating_analysis['average'] = statistics.mean(rating_counter.elements())
             
-            if len(set(ratings)) == 1:
+            if len(rating_counter) == 1:
                 rating_analysis['all_same_rating'] = True
             
-            five_star_percentage = rating_counter.get(5, 0) / len(ratings) * 100
+            five_star_percentage = rating_counter.get(5, 0) / total_ratings * 100
             if five_star_percentage > 90:
                 rating_analysis['suspicious_pattern'] = True
         
-        timestamps_by_day = {}
+        for date, count in self.timestamps_by_day.items():
+            if count > INFLUX_PER_DAY:
+                rating_analysis['sudden_influx'].append((str(date), count))
+        
+        return rating_analysis
+
+class RatingAnalyzer:
+    @staticmethod
+    def analyze(reviews: List[Dict]) -> Dict:
+        accumulator = RatingAccumulator()
         for review in reviews:
-            timestamp = review.get('reviewCreateTimestamp', 0)
-            if timestamp:
-                try:
-                    timestamp = int(timestamp) if timestamp else 0
-                    if timestamp > 0:
-                        date = datetime.fromtimestamp(timestamp).date()
-                        if date not in timestamps_by_day:
-                            timestamps_by_day[date] = 0
-                        timestamps_by_day[date] += 1
-                except (ValueError, TypeError, OSError):
-                    continue
+            accumulator.update(review)
+        rating_analysis = accumulator.finalize()
         
-        for date, count in timestamps_by_day.items():
-            if count > 10:
-                rating_analysis['sudden_influx'].append((str(date), count))
+        _, _, days = wib_calendar(timestamp_array(reviews))
+        rating_analysis['sudden_influx'] = RatingAnalyzer._sudden_influx(days)
+        return rating_analysis
+    
+    @staticmethod
+    def analyze_table(table: ReviewTable) -> Dict:
+        rating_analysis = {
+            'distribution': {},
+            'average': 0,
+            'suspicious_pattern': False,
+            'all_same_rating': False,
+            'sudden_influx': []
+        }
         
+        distribution = dict(ordered_counts(table.column('ratings')))
+        distribution.pop(0, None)
+        if distribution:
+            total_ratings = sum(distribution.values())
+            rating_sum = sum(rating * count for rating, count in distribution.items())
+            rating_analysis['distribution'] = distribution
+            rating_analysis['average'] = rating_sum // total_ratings if rating_sum % total_ratings == 0 else rating_sum / total_ratings
+            
+            if len(distribution) == 1:
+                rating_analysis['all_same_rating'] = True
+            
+            five_star_percentage = distribution.get(5, 0) / total_ratings * 100
+            if five_star_percentage > 90:
+                rating_analysis['suspicious_pattern'] = True
+        
+        _, _, days = table.calendar()
+        rating_analysis['sudden_influx'] = RatingAnalyzer._sudden_influx(days)
         return rating_analysis
+    
+    @staticmethod
+    def _sudden_influx(days) -> List:
+        return [(day_label(day), count) for day, count in ordered_counts(days) if count > INFLUX_PER_DAY]
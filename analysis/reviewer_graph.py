@@ -0,0 +1,285 @@
+from array import array
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from ..utils import parse_timestamp
+from .table import ReviewTable, clamp_timestamp, np
+
+class Adjacency:
+    def __init__(self):
+        self.order = array('q')
+        self.offsets = array('q', [0])
+        self.delta: Dict[int, List[int]] = {}
+        self.pending = 0
+    
+    def edges(self, node: int) -> List[int]:
+        edges = []
+        if node + 1 < len(self.offsets):
+            edges.extend(self.order[self.offsets[node]:self.offsets[node + 1]])
+        edges.extend(self.delta.get(node, ()))
+        return edges
+    
+    def add(self, node: int, edge: int):
+        self.delta.setdefault(node, []).append(edge)
+        self.pending += 1
+    
+    def rebuild(self, keys: array, nodes: int):
+        self.order = array('q')
+        self.offsets = array('q')
+        if np is not None:
+            values = np.frombuffer(keys, dtype=np.int32) if len(keys) else np.zeros(0, dtype=np.int32)
+            self.order.frombytes(np.argsort(values, kind='stable').astype(np.int64).tobytes())
+            counts = np.bincount(values, minlength=nodes) if len(values) else np.zeros(nodes, dtype=np.int64)
+            self.offsets.frombytes(np.concatenate(([0], np.cumsum(counts))).astype(np.int64).tobytes())
+        else:
+            self.order.extend(sorted(range(len(keys)), key=keys.__getitem__))
+            counts = [0] * nodes
+            for key in keys:
+                counts[key] += 1
+            self.offsets.append(0)
+            for count in counts:
+                self.offsets.append(self.offsets[-1] + count)
+        self.delta = {}
+        self.pending = 0
+
+class ReviewerGraph:
+    def __init__(self, window: int = 7 * 86400, min_ring_products: int = 3, min_co_reviews: int = 3,
+                 max_edges: Optional[int] = 2_000_000, rebuild_ratio: float = 0.25):
+        self.window = window
+        self.min_ring_products = min_ring_products
+        self.min_co_reviews = min_co_reviews
+        self.max_edges = max_edges
+        self.rebuild_ratio = rebuild_ratio
+        self.pruned = 0
+        self._reset()
+    
+    def _reset(self):
+        self.users: List[Any] = []
+        self.products: List[str] = []
+        self.shops: List[str] = []
+        self.product_shops = array('i')
+        self.edge_users = array('i')
+        self.edge_products = array('i')
+        self.edge_times = array('q')
+        self.co_reviews: Dict[Tuple[int, int], int] = {}
+        self._user_index: Dict[Any, int] = {}
+        self._product_index: Dict[str, int] = {}
+        self._shop_index: Dict[str, int] = {}
+        self._parent = array('i')
+        self._size = array('i')
+        self._by_user = Adjacency()
+        self._by_product = Adjacency()
+    
+    def __len__(self) -> int:
+        return len(self.edge_users)
+    
+    @staticmethod
+    def product_key(product_url: str) -> str:
+        return product_url.split('?')[0].rstrip('/')
+    
+    @staticmethod
+    def _intern(value: Any, index: Dict[Any, int], values: List[Any]) -> int:
+        position = index.get(value)
+        if position is None:
+            position = len(values)
+            index[value] = position
+            values.append(value)
+        return position
+    
+    def _product(self, product_url: str, shop: str) -> int:
+        key = self.product_key(product_url)
+        product = self._product_index.get(key)
+        if product is None:
+            product = self._intern(key, self._product_index, self.products)
+            self.product_shops.append(self._intern(shop or '', self._shop_index, self.shops))
+            self._parent.append(product)
+            self._size.append(1)
+        return product
+    
+    def _find(self, product: int) -> int:
+        parent = self._parent
+        while parent[product] != product:
+            parent[product] = parent[parent[product]]
+            product = parent[product]
+        return product
+    
+    def _union(self, a: int, b: int):
+        a, b = self._find(a), self._find(b)
+        if a == b:
+            return
+        if self._size[a] < self._size[b]:
+            a, b = b, a
+        self._parent[b] = a
+        self._size[a] += self._size[b]
+    
+    @staticmethod
+    def _pair(a: int, b: int) -> Tuple[int, int]:
+        return (a, b) if a < b else (b, a)
+    
+    def _within(self, a: int, b: int) -> bool:
+        first, second = self.edge_times[a], self.edge_times[b]
+        return first > 0 and second > 0 and abs(first - second) <= self.window
+    
+    def _add_edge(self, product: int, user: int, timestamp: int):
+        edge = len(self.edge_users)
+        self.edge_users.append(user)
+        self.edge_products.append(product)
+        self.edge_times.append(timestamp)
+        for other in self._by_user.edges(user):
+            if self._within(edge, other):
+                other_product = self.edge_products[other]
+                pair = self._pair(product, other_product)
+                count = self.co_reviews.get(pair, 0) + 1
+                self.co_reviews[pair] = count
+                if count == self.min_co_reviews:
+                    self._union(product, other_product)
+        self._by_user.add(user, edge)
+        self._by_product.add(product, edge)
+    
+    def add_edges(self, product_url: str, shop: str, users: Iterable[Any], timestamps: Iterable[int]) -> int:
+        product = self._product(product_url, shop)
+        known = {self.edge_users[edge] for edge in self._by_product.edges(product)}
+        added = 0
+        for user_id, timestamp in zip(users, timestamps):
+            if user_id is None or user_id == '':
+                continue
+            user = self._intern(user_id, self._user_index, self.users)
+            if user in known:
+                continue
+            known.add(user)
+            self._add_edge(product, user, timestamp)
+            added += 1
+        
+        if self.max_edges is not None and len(self.edge_users) > self.max_edges:
+            self.prune(self.max_edges * 3 // 4)
+        elif self._by_user.pending > max(1024, self.rebuild_ratio * len(self.edge_users)):
+            self._rebuild()
+        return added
+    
+    def add_reviews(self, product_url: str, shop: str, reviews: Iterable[Dict]) -> int:
+        users, timestamps = [], []
+        for review in reviews:
+            user = review.get('user')
+            if user and user.get('userID'):
+                users.append(user['userID'])
+                timestamps.append(clamp_timestamp(parse_timestamp(review.get('reviewCreateTimestamp', 0))))
+        return self.add_edges(product_url, shop, users, timestamps)
+    
+    def add_table(self, product_url: str, shop: str, table: ReviewTable) -> int:
+        users, timestamps = [], []
+        for user, timestamp in zip(table.user_ids, table.timestamps):
+            if user >= 0:
+                users.append(table.users[user])
+                timestamps.append(timestamp)
+        return self.add_edges(product_url, shop, users, timestamps)
+    
+    def _rebuild(self):
+        self._by_user.rebuild(self.edge_users, len(self.users))
+        self._by_product.rebuild(self.edge_products, len(self.products))
+    
+    def _retain(self, edges: List[int]) -> int:
+        dropped = len(self.edge_users) - len(edges)
+        if not dropped:
+            return 0
+        kept = [(self.products[self.edge_products[edge]], self.shops[self.product_shops[self.edge_products[edge]]],
+                 self.users[self.edge_users[edge]], self.edge_times[edge]) for edge in sorted(edges)]
+        self._reset()
+        for product_key, shop, user_id, timestamp in kept:
+            self._add_edge(self._product(product_key, shop), self._intern(user_id, self._user_index, self.users), timestamp)
+        self._rebuild()
+        self.pruned += dropped
+        return dropped
+    
+    def prune(self, keep: int) -> int:
+        if len(self.edge_users) <= keep:
+            return 0
+        edges = sorted(range(len(self.edge_users)), key=self.edge_times.__getitem__)
+        return self._retain(edges[len(edges) - keep:] if keep > 0 else [])
+    
+    def expire(self, before: int) -> int:
+        return self._retain([edge for edge, timestamp in enumerate(self.edge_times) if timestamp >= before])
+    
+    def reviewers(self, product_url: str) -> List[Any]:
+        product = self._product_index.get(self.product_key(product_url))
+        if product is None:
+            return []
+        return [self.users[self.edge_users[edge]] for edge in self._by_product.edges(product)]
+    
+    def products_of(self, user_id: Any) -> List[str]:
+        user = self._user_index.get(user_id)
+        if user is None:
+            return []
+        return [self.products[self.edge_products[edge]] for edge in self._by_user.edges(user)]
+    
+    def shared_reviewers(self, product_a: str, product_b: str) -> int:
+        return len(set(self.reviewers(product_a)) & set(self.reviewers(product_b)))
+    
+    def co_review_counts(self, product_url: str, limit: Optional[int] = 10) -> List[Tuple[str, int]]:
+        product = self._product_index.get(self.product_key(product_url))
+        if product is None:
+            return []
+        counts = Counter()
+        for edge in self._by_product.edges(product):
+            for other in self._by_user.edges(self.edge_users[edge]):
+                if self.edge_products[other] != product:
+                    counts[self.edge_products[other]] += 1
+        return [(self.products[other], count) for other, count in counts.most_common(limit)]
+    
+    def _ring_edge(self, edge: int, product: int) -> bool:
+        for other in self._by_user.edges(self.edge_users[edge]):
+            other_product = self.edge_products[other]
+            if (other_product != product and self._within(edge, other)
+                    and self.co_reviews.get(self._pair(product, other_product), 0) >= self.min_co_reviews):
+                return True
+        return False
+    
+    def component(self, product_url: str) -> List[str]:
+        product = self._product_index.get(self.product_key(product_url))
+        if product is None:
+            return []
+        root = self._find(product)
+        return [self.products[other] for other in range(len(self.products)) if self._find(other) == root]
+    
+    def components(self, min_size: int = 2) -> List[List[str]]:
+        groups: Dict[int, List[str]] = {}
+        for product in range(len(self.products)):
+            root = self._find(product)
+            if self._size[root] >= min_size:
+                groups.setdefault(root, []).append(self.products[product])
+        return sorted(groups.values(), key=len, reverse=True)
+    
+    def ring_signal(self, product_url: str) -> Dict:
+        signal = {
+            'reviewers': 0,
+            'ring_reviewers': 0,
+            'ring_percentage': 0,
+            'ring_products': 0,
+            'ring_shops': 0
+        }
+        
+        product = self._product_index.get(self.product_key(product_url))
+        if product is None:
+            return signal
+        
+        edges = self._by_product.edges(product)
+        signal['reviewers'] = len(edges)
+        root = self._find(product)
+        if self._size[root] < self.min_ring_products or not edges:
+            return signal
+        
+        ring_reviewers = sum(1 for edge in edges if self._ring_edge(edge, product))
+        signal['ring_reviewers'] = ring_reviewers
+        signal['ring_percentage'] = ring_reviewers / len(edges) * 100
+        signal['ring_products'] = self._size[root]
+        signal['ring_shops'] = len({self.product_shops[other] for other in range(len(self.products))
+                                    if self._find(other) == root})
+        return signal
+    
+    def stats(self) -> Dict[str, int]:
+        return {
+            'users': len(self.users),
+            'products': len(self.products),
+            'shops': len(self.shops),
+            'edges': len(self.edge_users),
+            'linked_pairs': sum(1 for count in self.co_reviews.values() if count >= self.min_co_reviews),
+            'pruned_edges': self.pruned
+        }
@@ -1,67 +1,229 @@
-from typing import Dict, Optional
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from .table import np
 
-class FakeScorer:
-    @staticmethod
-    def calculate(patterns: Dict, buyers: Dict, ratings: Dict, time_data: Dict, 
-                 rating_topics: Optional[Dict] = None, variants: Optional[Dict] = None) -> float:
-        score = 0
-        max_score = 100
-        
-        if patterns['generic_reviews'] > 10:
-            score += 15
-        elif patterns['generic_reviews'] > 5:
-            score += 8
-        
-        if len(patterns['suspiciously_similar']) > 5:
-            score += 20
-        elif len(patterns['suspiciously_similar']) > 2:
-            score += 10
-        
-        if patterns['keyword_stuffing'] > 5:
-            score += 10
-        
-        if patterns['excessive_praise'] > 8:
-            score += 10
-        
-        if buyers['anonymous_percentage'] > 50:
-            score += 15
-        elif buyers['anonymous_percentage'] > 30:
-            score += 8
-        
-        if len(buyers['burst_reviewers']) > 3:
-            score += 15
-        
-        if ratings['all_same_rating']:
-            score += 20
-        elif ratings['suspicious_pattern']:
-            score += 15
-        
-        if len(ratings['sudden_influx']) > 2:
-            score += 10
+FEATURES = (
+    'generic_reviews',
+    'suspiciously_similar',
+    'keyword_stuffing',
+    'excessive_praise',
+    'burst_reviewers',
+    'sudden_influx',
+    'suspicious_hours',
+    'five_star_percentage',
+    'unrated_one_star_total',
+    'anonymous_percentage',
+    'all_same_rating',
+    'suspicious_pattern',
+    'night_reviews',
+    'single_variant_dominance',
+    'verified_buyers',
+    'ring_percentage'
+)
+
+@dataclass(frozen=True)
+class ScoreRule:
+    name: str
+    feature: str
+    threshold: float
+    points: int
+    above: bool = True
+    group: Optional[str] = None
+    guaranteed: bool = True
+    
+    def fires(self, value: float) -> bool:
+        return value > self.threshold if self.above else value < self.threshold
+
+RULES = (
+    ScoreRule('generic_reviews_high', 'generic_reviews', 10, 15, group='generic_reviews'),
+    ScoreRule('generic_reviews', 'generic_reviews', 5, 8, group='generic_reviews'),
+    ScoreRule('similar_reviews_high', 'suspiciously_similar', 5, 20, group='similar_reviews'),
+    ScoreRule('similar_reviews', 'suspiciously_similar', 2, 10, group='similar_reviews'),
+    ScoreRule('keyword_stuffing', 'keyword_stuffing', 5, 10),
+    ScoreRule('excessive_praise', 'excessive_praise', 8, 10),
+    ScoreRule('burst_reviewers', 'burst_reviewers', 3, 15),
+    ScoreRule('sudden_influx', 'sudden_influx', 2, 10),
+    ScoreRule('suspicious_hours', 'suspicious_hours', 2, 10),
+    ScoreRule('five_star_dominance', 'five_star_percentage', 95, 15),
+    ScoreRule('no_one_star', 'unrated_one_star_total', 100, 10),
+    ScoreRule('anonymous_high', 'anonymous_percentage', 50, 15, group='anonymous', guaranteed=False),
+    ScoreRule('anonymous', 'anonymous_percentage', 30, 8, group='anonymous', guaranteed=False),
+    ScoreRule('all_same_rating', 'all_same_rating', 0, 20, group='rating_shape', guaranteed=False),
+    ScoreRule('suspicious_rating_pattern', 'suspicious_pattern', 0, 15, group='rating_shape', guaranteed=False),
+    ScoreRule('night_reviews', 'night_reviews', 30, 10, guaranteed=False),
+    ScoreRule('single_variant_dominance', 'single_variant_dominance', 0, 15, guaranteed=False),
+    ScoreRule('few_verified_buyers', 'verified_buyers', 20, 10, above=False, guaranteed=False),
+    ScoreRule('ring_high', 'ring_percentage', 30, 15, group='rings', guaranteed=False),
+    ScoreRule('ring', 'ring_percentage', 15, 8, group='rings', guaranteed=False)
+)
+
+class RuleTable:
+    def __init__(self, rules: Sequence[ScoreRule] = RULES, features: Sequence[str] = FEATURES):
+        groups: Dict[str, List[ScoreRule]] = {}
+        for rule in rules:
+            if rule.feature not in features:
+                raise ValueError(f"Unknown feature: {rule.feature}")
+            groups.setdefault(rule.group or rule.name, []).append(rule)
         
-        if time_data['night_reviews'] > 30:
-            score += 10
+        self.features = tuple(features)
+        self.rules = tuple(rule for members in groups.values() for rule in members)
+        self.names = [rule.name for rule in self.rules]
+        self.columns = [self.features.index(rule.feature) for rule in self.rules]
+        self.group_starts = []
+        self.group_of = []
+        for members in groups.values():
+            self.group_starts.append(len(self.group_of))
+            self.group_of.extend([len(self.group_starts) - 1] * len(members))
+        self._steps = [(column, rule.threshold, rule.above, rule.points, rule.guaranteed, group, rule.name)
+                       for rule, column, group in zip(self.rules, self.columns, self.group_of)]
         
-        if len(time_data['suspicious_hours']) > 2:
-            score += 10
+        if np is not None:
+            self._columns = np.asarray(self.columns, dtype=np.int64)
+            self._directions = np.asarray([1.0 if rule.above else -1.0 for rule in self.rules])
+            self._thresholds = np.asarray([rule.threshold for rule in self.rules], dtype=np.float64) * self._directions
+            self._points = np.asarray([rule.points for rule in self.rules], dtype=np.float64)
+            self._guaranteed = np.asarray([rule.guaranteed for rule in self.rules], dtype=bool)
+            self._starts = np.asarray(self.group_starts, dtype=np.int64)
+            self._group_of = np.asarray(self.group_of, dtype=np.int64)
+    
+    def __len__(self) -> int:
+        return len(self.rules)
+    
+    def evaluate(self, values: Sequence[float]) -> Tuple[int, int, List[str]]:
+        score, guaranteed, fired = 0, 0, []
+        group = -1
+        for column, threshold, above, points, is_guaranteed, rule_group, name in self._steps:
+            if rule_group == group:
+                continue
+            value = values[column]
+            if not (value > threshold if above else value < threshold):
+                continue
+            group = rule_group
+            score += points
+            if is_guaranteed:
+                guaranteed += points
+            fired.append(name)
+        return score, guaranteed, fired
+    
+    def evaluate_matrix(self, matrix) -> Tuple[Any, Any, Any]:
+        matrix = np.asarray(matrix, dtype=np.float64).reshape(-1, len(self.features))
+        mask = matrix[:, self._columns] * self._directions > self._thresholds
+        counts = np.cumsum(mask, axis=1)
+        before = np.concatenate((np.zeros((len(matrix), 1), dtype=counts.dtype), counts[:, self._starts[1:] - 1]), axis=1)
+        fired = mask & (counts - before[:, self._group_of] == 1)
+        points = np.where(fired, self._points, 0.0)
+        return points.sum(axis=1), points[:, self._guaranteed].sum(axis=1), fired
+
+@dataclass
+class ScoreBatch:
+    scores: Any
+    guaranteed: Any
+    fired: Any
+    rules: Sequence[str]
+    
+    def __len__(self) -> int:
+        return len(self.scores)
+    
+    def fired_rules(self, index: int) -> List[str]:
+        return [name for name, fired in zip(self.rules, self.fired[index]) if fired]
+
+class FakeScorer:
+    MAX_SCORE = 100
+    FEATURES = FEATURES
+    TABLE = RuleTable()
+    
+    @staticmethod
+    def calculate(patterns: Dict, buyers: Dict, ratings: Dict, time_data: Dict,
+                 rating_topics: Optional[Dict] = None, variants: Optional[Dict] = None,
+                 rings: Optional[Dict] = None) -> float:
+        return FakeScorer.evaluate(patterns, buyers, ratings, time_data, rating_topics, variants, rings)[0]
+    
+    @staticmethod
+    def evaluate(patterns: Dict, buyers: Dict, ratings: Dict, time_data: Dict,
+                 rating_topics: Optional[Dict] = None, variants: Optional[Dict] = None,
+                 rings: Optional[Dict] = None) -> Tuple[float, List[str]]:
+        values = FakeScorer.feature_vector(patterns, buyers, ratings, time_data, rating_topics, variants, rings)
+        score, _, fired = FakeScorer.TABLE.evaluate(values)
+        return min(score, FakeScorer.MAX_SCORE), fired
+    
+    @staticmethod
+    def guaranteed_score(patterns: Dict, buyers: Dict, ratings: Dict, time_data: Dict,
+                         rating_topics: Optional[Dict] = None) -> float:
+        values = FakeScorer.feature_vector(patterns, buyers, ratings, time_data, rating_topics)
+        return min(FakeScorer.TABLE.evaluate(values)[1], FakeScorer.MAX_SCORE)
+    
+    @staticmethod
+    def is_saturated(patterns: Dict, buyers: Dict, ratings: Dict, time_data: Dict,
+                     rating_topics: Optional[Dict] = None) -> bool:
+        return FakeScorer.guaranteed_score(patterns, buyers, ratings, time_data, rating_topics) >= FakeScorer.MAX_SCORE
+    
+    @staticmethod
+    def score_batch(features_matrix, table: Optional[RuleTable] = None) -> ScoreBatch:
+        table = table or FakeScorer.TABLE
+        if np is None:
+            rows = [table.evaluate(values) for values in features_matrix]
+            return ScoreBatch(
+                scores=[min(score, FakeScorer.MAX_SCORE) for score, _, _ in rows],
+                guaranteed=[min(guaranteed, FakeScorer.MAX_SCORE) for _, guaranteed, _ in rows],
+                fired=[[name in fired for name in table.names] for _, _, fired in rows],
+                rules=table.names
+            )
         
+        scores, guaranteed, fired = table.evaluate_matrix(features_matrix)
+        return ScoreBatch(
+            scores=np.minimum(scores, FakeScorer.MAX_SCORE),
+            guaranteed=np.minimum(guaranteed, FakeScorer.MAX_SCORE),
+            fired=fired,
+            rules=table.names
+        )
+    
+    @staticmethod
+    def feature_vector(patterns: Dict, buyers: Dict, ratings: Dict, time_data: Dict,
+                       rating_topics: Optional[Dict] = None, variants: Optional[Dict] = None,
+                       rings: Optional[Dict] = None) -> List[float]:
+        five_star_percentage = 0.0
+        unrated_one_star_total = 0.0
         if rating_topics and rating_topics.get('rating'):
             rating_data = rating_topics['rating']
             if rating_data.get('detail'):
                 five_star = next((d for d in rating_data['detail'] if d.get('rate') == 5), None)
                 one_star = next((d for d in rating_data['detail'] if d.get('rate') == 1), None)
                 
-                if five_star and five_star.get('percentageFloat', 0) > 95:
-                    score += 15
+                if five_star:
+                    five_star_percentage = five_star.get('percentageFloat', 0)
                 
-                if one_star and one_star.get('totalReviews', 0) == 0 and rating_data.get('totalRating', 0) > 100:
-                    score += 10
-        
-        if variants:
-            if variants.get('single_variant_dominance'):
-                score += 15
+                if one_star and one_star.get('totalReviews', 0) == 0:
+                    unrated_one_star_total = rating_data.get('totalRating', 0)
         
-        if buyers.get('verified_buyers', 0) < 20:
-            score += 10
-        
-        return min(score, max_score)
+        return [
+            patterns['generic_reviews'],
+            len(patterns['suspiciously_similar']),
+            patterns['keyword_stuffing'],
+            patterns['excessive_praise'],
+            len(buyers['burst_reviewers']),
+            len(ratings['sudden_influx']),
+            len(time_data['suspicious_hours']),
+            five_star_percentage,
+            unrated_one_star_total,
+            buyers['anonymous_percentage'],
+            1.0 if ratings['all_same_rating'] else 0.0,
+            1.0 if ratings['suspicious_pattern'] else 0.0,
+            time_data['night_reviews'],
+            1.0 if variants and variants.get('single_variant_dominance') else 0.0,
+            buyers.get('verified_buyers', 0),
+            rings.get('ring_percentage', 0) if rings else 0.0
+        ]
+    
+    @staticmethod
+    def indicator_vector(indicators: Dict) -> List[float]:
+        return FakeScorer.feature_vector(indicators['review_patterns'], indicators['suspicious_buyers'],
+                                         indicators['rating_anomalies'], indicators['time_patterns'],
+                                         indicators.get('rating_topics'), indicators.get('variants'),
+                                         indicators.get('rings'))
+    
+    @staticmethod
+    def feature_matrix(indicators: Iterable[Dict]):
+        rows = [FakeScorer.indicator_vector(item) for item in indicators]
+        if np is None:
+            return rows
+        return np.asarray(rows, dtype=np.float64).reshape(-1, len(FakeScorer.FEATURES))
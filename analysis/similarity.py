@@ -0,0 +1,192 @@
+import math
+from abc import ABC, abstractmethod
+from typing import List, Tuple, Dict, Optional
+from collections import Counter, defaultdict
+from .text import TokenCache, TokenizedReview, TOKEN_CACHE
+
+SimilarPair = Tuple[int, int, float]
+
+class SimilarityEngine(ABC):
+    def __init__(self, cache: Optional[TokenCache] = None):
+        self.cache = cache or TOKEN_CACHE
+    
+    @abstractmethod
+    def find_pairs(self, messages: List[str], threshold: float = 0.8,
+                   reviews: Optional[List[TokenizedReview]] = None) -> List[SimilarPair]:
+        pass
+    
+    def token_sets(self, messages: List[str], reviews: Optional[List[TokenizedReview]] = None) -> List[frozenset]:
+        return [review.token_set for review in (reviews or self.cache.tokenize_all(messages))]
+    
+    def index(self, threshold: float = 0.8) -> "PairIndex":
+        return PairIndex(self, threshold)
+
+class PairIndex:
+    def __init__(self, engine: SimilarityEngine, threshold: float):
+        self.engine = engine
+        self.threshold = threshold
+        self.count = 0
+        self._cache = (0, [])
+    
+    def add(self, msg: str, review: TokenizedReview):
+        self.count += 1
+    
+    def pairs(self, messages: List[str], reviews: Optional[List[TokenizedReview]] = None) -> List[SimilarPair]:
+        cached_count, cached_pairs = self._cache
+        if cached_count != len(messages):
+            cached_pairs = self.engine.find_pairs(messages, self.threshold, reviews)
+            self._cache = (len(messages), cached_pairs)
+        return list(cached_pairs)
+
+class IncrementalPairIndex(PairIndex):
+    EPSILON = 1e-9
+    
+    def __init__(self, engine: SimilarityEngine, threshold: float):
+        super().__init__(engine, threshold)
+        self._found: List[SimilarPair] = []
+        self._sorted: List[SimilarPair] = []
+        self._empty: Dict[str, List[int]] = defaultdict(list)
+        self._sets: Dict[int, frozenset] = {}
+    
+    def add(self, msg: str, review: TokenizedReview):
+        idx = self.count
+        self.count += 1
+        if not msg:
+            return
+        
+        tokens = review.token_set
+        if not tokens:
+            if self.threshold < 1.0:
+                members = self._empty[msg.lower()]
+                self._found.extend((other, idx, 1.0) for other in members)
+                members.append(idx)
+        else:
+            for other in self._candidates(idx, tokens):
+                other_tokens = self._sets[other]
+                overlap = len(tokens & other_tokens)
+                similarity = overlap / (len(tokens) + len(other_tokens) - overlap)
+                if similarity > self.threshold:
+                    self._found.append((other, idx, similarity))
+            self._sets[idx] = tokens
+    
+    def _candidates(self, idx: int, tokens: frozenset):
+        return list(self._sets)
+    
+    def pairs(self, messages: List[str], reviews: Optional[List[TokenizedReview]] = None) -> List[SimilarPair]:
+        if self._found:
+            self._sorted.extend(self._found)
+            self._sorted.sort()
+            self._found = []
+        return list(self._sorted)
+
+class PrefixPairIndex(IncrementalPairIndex):
+    def __init__(self, engine: SimilarityEngine, threshold: float):
+        super().__init__(engine, threshold)
+        self._postings: Dict[int, List[int]] = defaultdict(list)
+    
+    def _candidates(self, idx: int, tokens: frozenset):
+        size = len(tokens)
+        min_overlap = max(1, math.ceil(self.threshold * size - self.EPSILON))
+        prefix = sorted(tokens, reverse=True)[:size - min_overlap + 1]
+        
+        candidates = set()
+        for token in prefix:
+            candidates.update(self._postings[token])
+            self._postings[token].append(idx)
+        
+        for other in candidates:
+            other_size = len(self._sets[other])
+            if min(size, other_size) >= self.threshold * max(size, other_size) - self.EPSILON:
+                yield other
+
+class ExactSimilarityEngine(SimilarityEngine):
+    def index(self, threshold: float = 0.8) -> PairIndex:
+        return IncrementalPairIndex(self, threshold)
+    
+    def find_pairs(self, messages: List[str], threshold: float = 0.8,
+                   reviews: Optional[List[TokenizedReview]] = None) -> List[SimilarPair]:
+        token_sets = self.token_sets(messages, reviews)
+        pairs = []
+        for i, msg1 in enumerate(messages):
+            if not msg1:
+                continue
+            for j, msg2 in enumerate(messages[i+1:], i+1):
+                if not msg2:
+                    continue
+                similarity = self.similarity(msg1, msg2, token_sets[i], token_sets[j])
+                if similarity > threshold:
+                    pairs.append((i, j, similarity))
+        return pairs
+    
+    @staticmethod
+    def similarity(msg1: str, msg2: str, tokens1: frozenset, tokens2: frozenset) -> float:
+        if not tokens1 or not tokens2:
+            return 1.0 if not tokens1 and not tokens2 and msg1.lower() == msg2.lower() else 0.0
+        overlap = len(tokens1 & tokens2)
+        return overlap / (len(tokens1) + len(tokens2) - overlap)
+
+class PrefixFilterSimilarityEngine(SimilarityEngine):
+    EPSILON = 1e-9
+    
+    def index(self, threshold: float = 0.8) -> PairIndex:
+        return PrefixPairIndex(self, threshold)
+    
+    def find_pairs(self, messages: List[str], threshold: float = 0.8,
+                   reviews: Optional[List[TokenizedReview]] = None) -> List[SimilarPair]:
+        token_sets = self.token_sets(messages, reviews)
+        pairs = self._empty_token_pairs(messages, token_sets, threshold)
+        
+        doc_freq = Counter(token for tokens in token_sets for token in tokens)
+        rank = {token: r for r, token in enumerate(sorted(doc_freq, key=lambda t: (doc_freq[t], t)))}
+        
+        records = [(idx, sorted(rank[t] for t in tokens)) for idx, tokens in enumerate(token_sets)
+                   if messages[idx] and tokens]
+        records.sort(key=lambda record: len(record[1]))
+        
+        index: Dict[int, List[int]] = defaultdict(list)
+        sizes: Dict[int, int] = {}
+        
+        for idx, ranks in records:
+            size = len(ranks)
+            min_overlap = max(1, math.ceil(threshold * size - self.EPSILON))
+            prefix = ranks[:size - min_overlap + 1]
+            
+            candidates = set()
+            for token in prefix:
+                for other in index[token]:
+                    if sizes[other] >= threshold * size - self.EPSILON:
+                        candidates.add(other)
+            
+            tokens = token_sets[idx]
+            for other in candidates:
+                other_tokens = token_sets[other]
+                overlap = len(tokens & other_tokens)
+                similarity = overlap / (len(tokens) + len(other_tokens) - overlap)
+                if similarity > threshold:
+                    i, j = (other, idx) if other < idx else (idx, other)
+                    pairs.append((i, j, similarity))
+            
+            sizes[idx] = size
+            for token in prefix:
+                index[token].append(idx)
+        
+        pairs.sort(key=lambda pair: (pair[0], pair[1]))
+        return pairs
+    
+    @staticmethod
+    def _empty_token_pairs(messages: List[str], token_sets: List[frozenset],
+                           threshold: float) -> List[SimilarPair]:
+        if threshold >= 1.0:
+            return []
+        
+        groups: Dict[str, List[int]] = defaultdict(list)
+        for idx, msg in enumerate(messages):
+            if msg and not token_sets[idx]:
+                groups[msg.lower()].append(idx)
+        
+        pairs = []
+        for members in groups.values():
+            for a, i in enumerate(members):
+                for j in members[a+1:]:
+                    pairs.append((i, j, 1.0))
+        return pairs
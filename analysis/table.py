@@ -0,0 +1,182 @@
+from array import array
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Tuple
+from ..utils import parse_timestamp, WIB_OFFSET
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SECONDS_PER_DAY = 86400
+EPOCH = date(1970, 1, 1)
+MAX_DAY = date.max.toordinal() - EPOCH.toordinal()
+TIMESTAMP_LIMIT = 2 ** 63 - 1
+
+def clamp_timestamp(timestamp: int) -> int:
+    return max(-TIMESTAMP_LIMIT, min(timestamp, TIMESTAMP_LIMIT))
+
+def timestamp_array(reviews: Iterable[Dict]) -> array:
+    timestamps = [parse_timestamp(review.get('reviewCreateTimestamp', 0)) for review in reviews]
+    try:
+        return array('q', timestamps)
+    except OverflowError:
+        return array('q', map(clamp_timestamp, timestamps))
+
+def wib_calendar(timestamps) -> Tuple[Any, Any, Any]:
+    if np is not None:
+        if isinstance(timestamps, array):
+            timestamps = np.frombuffer(timestamps, dtype=np.int64) if len(timestamps) else np.zeros(0, dtype=np.int64)
+        timestamps = np.asarray(timestamps, dtype=np.int64)
+        days, seconds = np.divmod(timestamps + WIB_OFFSET, SECONDS_PER_DAY)
+        valid = (timestamps > 0) & (days >= 0) & (days <= MAX_DAY)
+        hours = np.where(valid, seconds // 3600, -1)
+        weekdays = np.where(valid, (days + 3) % 7, -1)
+        days = np.where(valid, days, -1)
+        return hours, weekdays, days
+    
+    hours, weekdays, days = [], [], []
+    for timestamp in timestamps:
+        day, seconds = divmod(timestamp + WIB_OFFSET, SECONDS_PER_DAY)
+        if timestamp > 0 and day <= MAX_DAY:
+            hours.append(seconds // 3600)
+            weekdays.append((day + 3) % 7)
+            days.append(day)
+        else:
+            hours.append(-1)
+            weekdays.append(-1)
+            days.append(-1)
+    return hours, weekdays, days
+
+def day_label(day: int) -> str:
+    return str(EPOCH + timedelta(days=int(day)))
+
+class ReviewTable:
+    def __init__(self):
+        self.timestamps = array('q')
+        self.ratings = array('b')
+        self.anonymous = array('b')
+        self.user_ids = array('i')
+        self.labels = array('i')
+        self.variants = array('i')
+        self.message_offsets = array('q', [0])
+        self.users: List[Any] = []
+        self.label_names: List[str] = []
+        self.variant_names: List[str] = []
+        self._user_index: Dict[Any, int] = {}
+        self._label_index: Dict[str, int] = {}
+        self._variant_index: Dict[str, int] = {}
+        self._text_parts: List[str] = []
+        self._text = ''
+        self._calendar = None
+    
+    @classmethod
+    def from_reviews(cls, reviews: Iterable[Dict]) -> "ReviewTable":
+        table = cls()
+        table.append_page(reviews)
+        return table
+    
+    @classmethod
+    def from_pages(cls, pages: Iterable[Dict]) -> "ReviewTable":
+        table = cls()
+        for review_data in pages:
+            if review_data and review_data.get('list'):
+                table.append_page(review_data['list'])
+        return table
+    
+    def __len__(self) -> int:
+        return len(self.timestamps)
+    
+    @staticmethod
+    def _intern(value: Any, index: Dict[Any, int], values: List[Any]) -> int:
+        position = index.get(value)
+        if position is None:
+            position = len(values)
+            index[value] = position
+            values.append(value)
+        return position
+    
+    def append_page(self, reviews: Iterable[Dict]):
+        offset = self.message_offsets[-1]
+        for review in reviews:
+            self.timestamps.append(clamp_timestamp(parse_timestamp(review.get('reviewCreateTimestamp', 0))))
+            
+            rating = review.get('productRating')
+            try:
+                self.ratings.append(int(rating) if rating else 0)
+            except (ValueError, TypeError, OverflowError):
+                self.ratings.append(0)
+            
+            self.anonymous.append(1 if review.get('isAnonymous', False) else 0)
+            
+            user = review.get('user')
+            if user and user.get('userID'):
+                self.user_ids.append(self._intern(user['userID'], self._user_index, self.users))
+                label = user.get('label')
+                self.labels.append(self._intern(label, self._label_index, self.label_names) if label else -1)
+            else:
+                self.user_ids.append(-1)
+                self.labels.append(-1)
+            
+            variant_name = review.get('variantName', '')
+            self.variants.append(self._intern(variant_name, self._variant_index, self.variant_names) if variant_name else -1)
+            
+            message = review.get('message') or ''
+            self._text_parts.append(message)
+            offset += len(message)
+            self.message_offsets.append(offset)
+        
+        self._calendar = None
+    
+    @property
+    def text(self) -> str:
+        if self._text_parts:
+            self._text += ''.join(self._text_parts)
+            self._text_parts = []
+        return self._text
+    
+    def message(self, index: int) -> str:
+        return self.text[self.message_offsets[index]:self.message_offsets[index + 1]]
+    
+    def messages(self) -> List[str]:
+        text = self.text
+        offsets = self.message_offsets
+        return [text[offsets[i]:offsets[i + 1]] for i in range(len(self)) if offsets[i + 1] > offsets[i]]
+    
+    def column(self, name: str):
+        values = getattr(self, name)
+        if np is None:
+            return values
+        return np.frombuffer(values, dtype=values.typecode) if len(values) else np.zeros(0, dtype=values.typecode)
+    
+    def calendar(self) -> Tuple[Any, Any, Any]:
+        if self._calendar is None:
+            self._calendar = wib_calendar(self.column('timestamps'))
+        return self._calendar
+    
+    def nbytes(self) -> int:
+        columns = (self.timestamps, self.ratings, self.anonymous, self.user_ids,
+                   self.labels, self.variants, self.message_offsets)
+        return sum(column.itemsize * len(column) for column in columns) + len(self.text)
+
+def ordered_counts(values) -> List[Tuple[int, int]]:
+    if np is not None:
+        values = np.asarray(values, dtype=np.int64)
+        positions = np.flatnonzero(values >= 0)
+        if not len(positions):
+            return []
+        values = values[positions]
+        base = int(values.min())
+        values = values - base
+        counts = np.bincount(values)
+        first_seen = np.full(len(counts), len(positions), dtype=np.int64)
+        np.minimum.at(first_seen, values, np.arange(len(values)))
+        present = np.flatnonzero(counts)
+        present = present[np.argsort(first_seen[present], kind='stable')]
+        return [(int(value) + base, int(counts[value])) for value in present]
+    
+    counts: Dict[int, int] = {}
+    for value in values:
+        if value >= 0:
+            counts[value] = counts.get(value, 0) + 1
+    return list(counts.items())
@@ -0,0 +1,117 @@
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+NON_WORD = re.compile(r"[^\w\s]|_")
+REPEATED_LETTER = re.compile(r"([^\W\d_])\1{2,}")
+
+def normalize(message: str) -> str:
+    text = NON_WORD.sub(' ', message.lower())
+    return ' '.join(REPEATED_LETTER.sub(r'\1', text).split())
+
+class Vocabulary:
+    def __init__(self):
+        self.words: List[str] = []
+        self._ids: Dict[str, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self.words)
+    
+    def intern(self, word: str) -> int:
+        token = self._ids.get(word)
+        if token is None:
+            token = len(self.words)
+            self._ids[word] = token
+            self.words.append(word)
+        return token
+    
+    def decode(self, tokens: Iterable[int]) -> str:
+        return ' '.join(self.words[token] for token in tokens)
+
+class TokenizedReview:
+    __slots__ = ('text', 'tokens', 'token_set', 'flags', '_trigrams')
+    
+    def __init__(self, message: str, vocabulary: Vocabulary):
+        self.text = normalize(message)
+        self.tokens = tuple(vocabulary.intern(word) for word in self.text.split())
+        self.token_set = frozenset(self.tokens)
+        self.flags: Optional[Any] = None
+        self._trigrams: Optional[Tuple[Tuple[int, int, int], ...]] = None
+    
+    def __len__(self) -> int:
+        return len(self.tokens)
+    
+    @property
+    def trigrams(self) -> Tuple[Tuple[int, int, int], ...]:
+        if self._trigrams is None:
+            tokens = self.tokens
+            self._trigrams = tuple(zip(tokens, tokens[1:], tokens[2:]))
+        return self._trigrams
+
+class TokenCache:
+    def __init__(self, max_entries: int = 50000, max_words: int = 200000):
+        self.max_entries = max_entries
+        self.max_words = max_words
+        self.vocabulary = Vocabulary()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.resets = 0
+        self._entries: "OrderedDict[str, TokenizedReview]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, message: str, vocabulary: Optional[Vocabulary] = None) -> TokenizedReview:
+        with self._lock:
+            if vocabulary is not None and vocabulary is not self.vocabulary:
+                return TokenizedReview(message, vocabulary)
+            review = self._entries.get(message)
+            if review is not None:
+                self._entries.move_to_end(message)
+                self.hits += 1
+                return review
+            
+            if len(self.vocabulary) >= self.max_words:
+                self._reset()
+                self.resets += 1
+                if vocabulary is not None:
+                    return TokenizedReview(message, vocabulary)
+            review = TokenizedReview(message, self.vocabulary)
+            self._entries[message] = review
+            self.misses += 1
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return review
+    
+    def tokenize_all(self, messages: Iterable[str]) -> List[TokenizedReview]:
+        vocabulary = self.vocabulary
+        return [self.get(message or '', vocabulary) for message in messages]
+    
+    def decode(self, tokens: Iterable[int]) -> str:
+        return self.vocabulary.decode(tokens)
+    
+    def _reset(self):
+        self._entries.clear()
+        self.vocabulary = Vocabulary()
+    
+    def clear(self):
+        with self._lock:
+            self._reset()
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / lookups * 100) if lookups > 0 else 0,
+            'evictions': self.evictions,
+            'resets': self.resets,
+            'entries': len(self._entries),
+            'vocabulary': len(self.vocabulary)
+        }
+
+TOKEN_CACHE = TokenCache()
+
+def tokenize(message: str) -> TokenizedReview:
+    return TOKEN_CACHE.get(message)
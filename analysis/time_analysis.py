@@ -1,10 +1,64 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 from collections import Counter
 from datetime import datetime
+from .table import ReviewTable, ordered_counts, timestamp_array, wib_calendar, np
+
+SUSPICIOUS_HOURS = (2, 5)
+SUSPICIOUS_HOUR_COUNT = 5
+
+class TimeAccumulator:
+    def __init__(self):
+        self.total_reviews = 0
+        self.hour_counter = Counter()
+        self.weekend_count = 0
+        self.night_count = 0
+    
+    def update(self, review: Dict, timestamp: int = 0, moment: Optional[datetime] = None):
+        self.total_reviews += 1
+        if moment is None:
+            return
+        
+        hour = moment.hour
+        self.hour_counter[hour] += 1
+        
+        if moment.weekday() >= 5:
+            self.weekend_count += 1
+        
+        if hour >= 0 and hour < 6:
+            self.night_count += 1
+    
+    def finalize(self) -> Dict:
+        time_analysis = {
+            'reviews_per_hour': {},
+            'suspicious_hours': [],
+            'weekend_ratio': 0,
+            'night_reviews': 0
+        }
+        
+        time_analysis['reviews_per_hour'] = dict(self.hour_counter)
+        
+        for hour, count in self.hour_counter.items():
+            if SUSPICIOUS_HOURS[0] <= hour <= SUSPICIOUS_HOURS[1] and count > SUSPICIOUS_HOUR_COUNT:
+                time_analysis['suspicious_hours'].append(hour)
+        
+        total_reviews = self.total_reviews
+        if total_reviews > 0:
+            time_analysis['weekend_ratio'] = (self.weekend_count / total_reviews) * 100
+            time_analysis['night_reviews'] = (self.night_count / total_reviews) * 100
+        
+        return time_analysis
 
 class TimeAnalyzer:
     @staticmethod
     def analyze(reviews: List[Dict]) -> Dict:
+        return TimeAnalyzer._from_calendar(wib_calendar(timestamp_array(reviews)), len(reviews))
+    
+    @staticmethod
+    def analyze_table(table: ReviewTable) -> Dict:
+        return TimeAnalyzer._from_calendar(table.calendar(), len(table))
+    
+    @staticmethod
+    def _from_calendar(calendar, total_reviews: int) -> Dict:
         time_analysis = {
             'reviews_per_hour': {},
             'suspicious_hours': [],
@@ -12,35 +66,20 @@ class TimeAnalyzer:
             'night_reviews': 0
         }
         
-        hour_counter = Counter()
-        weekend_count = 0
-        night_count = 0
-        
-        for review in reviews:
-            timestamp = review.get('reviewCreateTimestamp', 0)
-            if timestamp:
-                try:
-                    timestamp = int(timestamp) if timestamp else 0
-                    if timestamp > 0:
-                        dt = datetime.fromtimestamp(timestamp)
-                        hour = dt.hour
-                        hour_counter[hour] += 1
-                        
-                        if dt.weekday() >= 5:
-                            weekend_count += 1
-                        
-                        if hour >= 0 and hour < 6:
-                            night_count += 1
-                except (ValueError, TypeError, OSError):
-                    continue
-        
-        time_analysis['reviews_per_hour'] = dict(hour_counter)
+        hours, weekdays, days = calendar
+        hour_counter = dict(ordered_counts(hours))
+        time_analysis['reviews_per_hour'] = hour_counter
         
         for hour, count in hour_counter.items():
-            if 2 <= hour <= 5 and count > 5:
+            if SUSPICIOUS_HOURS[0] <= hour <= SUSPICIOUS_HOURS[1] and count > SUSPICIOUS_HOUR_COUNT:
                 time_analysis['suspicious_hours'].append(hour)
         
-        total_reviews = len(reviews)
+        if np is not None:
+            weekend_count = int(np.count_nonzero(np.asarray(weekdays) >= 5))
+        else:
+            weekend_count = sum(1 for weekday in weekdays if weekday >= 5)
+        night_count = sum(count for hour, count in hour_counter.items() if hour < 6)
+        
         if total_reviews > 0:
             time_analysis['weekend_ratio'] = (weekend_count / total_reviews) * 100
             time_analysis['night_reviews'] = (night_count / total_reviews) * 100
@@ -2,10 +2,13 @@ from typing import Dict, Optional
 import time
 
 class TrustAnalyzer:
+    MAX_SCORE = 100
+    MAX_RATING_POINTS = 25
+    
     @staticmethod
     def analyze(shop_info: Dict, shop_rating: Optional[Dict] = None) -> Dict:
         trust_score = 0
-        max_score = 100
+        max_score = TrustAnalyzer.MAX_SCORE
         trust_analysis = {
             'trust_score': 0,
             'badges': [],
@@ -125,3 +128,8 @@ class TrustAnalyzer:
         
         trust_analysis['trust_score'] = min(trust_score, max_score)
         return trust_analysis
+    
+    @staticmethod
+    def upper_bound(shop_info: Dict) -> int:
+        base_score = TrustAnalyzer.analyze(shop_info)['trust_score']
+        return min(base_score + TrustAnalyzer.MAX_RATING_POINTS, TrustAnalyzer.MAX_SCORE)
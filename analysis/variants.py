@@ -1,9 +1,23 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 from collections import Counter
+from datetime import datetime
+from .table import ReviewTable, ordered_counts
 
-class VariantAnalyzer:
-    @staticmethod
-    def analyze(reviews: List[Dict]) -> Dict:
+class VariantAccumulator:
+    def __init__(self):
+        self.total_reviews = 0
+        self.variant_counter = Counter()
+        self.no_variant_count = 0
+    
+    def update(self, review: Dict, timestamp: int = 0, moment: Optional[datetime] = None):
+        self.total_reviews += 1
+        variant_name = review.get('variantName', '')
+        if variant_name:
+            self.variant_counter[variant_name] += 1
+        else:
+            self.no_variant_count += 1
+    
+    def finalize(self) -> Dict:
         variant_analysis = {
             'variant_distribution': {},
             'no_variant_percentage': 0,
@@ -11,22 +25,13 @@ class VariantAnalyzer:
             'variant_count': 0
         }
         
-        variant_counter = Counter()
-        no_variant_count = 0
-        
-        for review in reviews:
-            variant_name = review.get('variantName', '')
-            if variant_name:
-                variant_counter[variant_name] += 1
-            else:
-                no_variant_count += 1
-        
+        variant_counter = self.variant_counter
         variant_analysis['variant_distribution'] = dict(variant_counter)
         variant_analysis['variant_count'] = len(variant_counter)
         
-        total_reviews = len(reviews)
+        total_reviews = self.total_reviews
         if total_reviews > 0:
-            variant_analysis['no_variant_percentage'] = (no_variant_count / total_reviews) * 100
+            variant_analysis['no_variant_percentage'] = (self.no_variant_count / total_reviews) * 100
             
             if variant_counter:
                 most_common_variant = variant_counter.most_common(1)[0]
@@ -34,3 +39,36 @@ class VariantAnalyzer:
                     variant_analysis['single_variant_dominance'] = True
         
         return variant_analysis
+
+class VariantAnalyzer:
+    @staticmethod
+    def analyze(reviews: List[Dict]) -> Dict:
+        accumulator = VariantAccumulator()
+        for review in reviews:
+            accumulator.update(review)
+        return accumulator.finalize()
+    
+    @staticmethod
+    def analyze_table(table: ReviewTable) -> Dict:
+        variant_analysis = {
+            'variant_distribution': {},
+            'no_variant_percentage': 0,
+            'single_variant_dominance': False,
+            'variant_count': 0
+        }
+        
+        variant_counts = ordered_counts(table.column('variants'))
+        variant_analysis['variant_distribution'] = {table.variant_names[variant]: count for variant, count in variant_counts}
+        variant_analysis['variant_count'] = len(variant_counts)
+        
+        total_reviews = len(table)
+        if total_reviews > 0:
+            no_variant_count = total_reviews - sum(count for variant, count in variant_counts)
+            variant_analysis['no_variant_percentage'] = (no_variant_count / total_reviews) * 100
+            
+            if variant_counts:
+                most_common_count = max(count for variant, count in variant_counts)
+                if most_common_count / total_reviews > 0.8:
+                    variant_analysis['single_variant_dominance'] = True
+        
+        return variant_analysis
@@ -1,3 +1,9 @@
 from .fetcher import APIFetcher
+from .async_fetcher import AsyncAPIFetcher
+from .ratelimit import TokenBucket, RequestScheduler, EndpointBudget
+from .cache import ResponseCache
+from .fixtures import FixtureArchive
+from .batch import GraphQLBatch, BatchCall, FetchError
+from .queries import GraphQLRequest, GRAPHQL_ENDPOINT
 
-__all__ = ["APIFetcher"]
+__all__ = ["APIFetcher", "AsyncAPIFetcher", "TokenBucket", "RequestScheduler", "EndpointBudget", "ResponseCache", "FixtureArchive", "GraphQLBatch", "BatchCall", "FetchError", "GraphQLRequest", "GRAPHQL_ENDPOINT"]
@@ -0,0 +1,187 @@
+import asyncio
+from typing import Dict, List, Optional, Tuple, Union
+import aiohttp
+from ..utils import HeaderGenerator
+from ..metrics import current_trace
+from . import queries
+from .queries import GraphQLRequest, GRAPHQL_ENDPOINT
+from .ratelimit import RequestScheduler
+from .cache import ResponseCache
+from .fixtures import FixtureArchive
+from .batch import batch_url, batch_headers, batch_payload, batch_operations, decode_response, split_response, FetchError
+
+class AsyncAPIFetcher:
+    def __init__(self, endpoint: str = GRAPHQL_ENDPOINT, concurrency: int = 4,
+                 scheduler: Optional[RequestScheduler] = None,
+                 timeout: float = 30.0, cache: Optional[ResponseCache] = None, max_batch_size: int = 10,
+                 fixtures: Optional[FixtureArchive] = None):
+        self.header_gen = HeaderGenerator()
+        self.endpoint = endpoint
+        self.concurrency = concurrency
+        self.scheduler = scheduler or RequestScheduler()
+        self.timeout = timeout
+        self.cache = cache
+        self.max_batch_size = max_batch_size
+        self.fixtures = fixtures
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+    
+    async def __aenter__(self) -> "AsyncAPIFetcher":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            self._semaphore = None
+    
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._session
+    
+    async def execute(self, request: GraphQLRequest) -> Optional[Dict]:
+        return (await self.execute_batch([request]))[0]
+    
+    async def execute_batch(self, calls: List[GraphQLRequest], strict: bool = False) -> List[Optional[Dict]]:
+        results: List[Optional[Dict]] = [None] * len(calls)
+        pending = []
+        with current_trace().span("fetch:" + batch_operations(calls)) as stage:
+            if self.cache:
+                keys = [(request.operation_name, request.cache_variables) for request in calls]
+                cached = await asyncio.to_thread(self.cache.get_many, keys)
+            else:
+                cached = [None] * len(calls)
+            for index, value in enumerate(cached):
+                if value is not None:
+                    results[index] = value
+                else:
+                    pending.append(index)
+            stage.cache_hits = len(calls) - len(pending)
+            
+            chunks = [pending[start:start + self.max_batch_size] for start in range(0, len(pending), self.max_batch_size)]
+            responses = await asyncio.gather(*(self._post([calls[index] for index in indexes], strict) for indexes in chunks))
+        
+        fetched = []
+        for indexes, chunk_results in zip(chunks, responses):
+            for index, result in zip(indexes, chunk_results):
+                results[index] = result
+                fetched.append((calls[index].operation_name, calls[index].cache_variables, result))
+        if self.cache and fetched:
+            await asyncio.to_thread(self.cache.set_many, fetched)
+        
+        return results
+    
+    async def _post(self, batch: List[GraphQLRequest], strict: bool = False) -> List[Optional[Dict]]:
+        if self.fixtures is not None and self.fixtures.replaying:
+            return split_response(batch, self.fixtures.replay(batch))
+        
+        trace = current_trace()
+        session = self._ensure_session()
+        operation = batch[0].operation_name
+        url, payload = batch_url(self.endpoint, batch), batch_payload(batch)
+        headers = batch_headers(self.header_gen, batch)
+        
+        attempt = 0
+        while True:
+            status, retry_hint, raw, error = None, None, None, None
+            async with self._semaphore:
+                with trace.span("ratelimit"):
+                    await self.scheduler.acquire_async(operation)
+                with trace.span("http:" + batch_operations(batch), requests=len(batch)) as stage:
+                    try:
+                        async with session.post(url, data=payload, headers=headers) as response:
+                            status = stage.status = response.status
+                            retry_hint = response.headers.get('Retry-After')
+                            if status == 200:
+                                raw = await response.read()
+                                stage.bytes_received = len(raw)
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                        status, error = None, e
+                        stage.error = type(e).__name__
+            
+            self.scheduler.record(operation, status, retry_hint)
+            if status == 200 or not self.scheduler.should_retry(operation, status, attempt):
+                break
+            with trace.span("backoff"):
+                await asyncio.sleep(self.scheduler.backoff(operation, attempt, retry_hint))
+            attempt += 1
+        
+        if error is not None:
+            if strict:
+                raise FetchError(operation, reason=type(error).__name__) from error
+            raise error
+        if status != 200:
+            if strict:
+                raise FetchError(operation, status)
+            return [None] * len(batch)
+        
+        body = decode_response(batch, raw)
+        if self.fixtures is not None:
+            self.fixtures.record(batch, body)
+        return split_response(batch, body)
+    
+    async def fetch_product_info(self, product_url: str) -> Optional[Dict]:
+        return await self.execute(queries.product_info(product_url))
+    
+    async def fetch_reviews(self, product_url: str, product_id: Optional[str] = None,
+                            page: int = 1, limit: int = 20, sort_by: str = "informative_score desc") -> Optional[Dict]:
+        return await self.execute(queries.product_reviews(product_url, page, limit, sort_by))
+    
+    async def fetch_review_pages(self, product_url: str, pages: List[int], limit: int = 20,
+                                 sort_by: str = "informative_score desc") -> List[Optional[Dict]]:
+        return await self.execute_batch([queries.product_reviews(product_url, page, limit, sort_by) for page in pages])
+    
+    async def fetch_review_sample(self, product_url: str, pages: List[Tuple[int, str, str]],
+                                  limit: int = 20) -> List[Optional[Dict]]:
+        return await self.execute_batch([
+            queries.product_reviews(product_url, page, limit, sort_by, filter_by) for page, sort_by, filter_by in pages
+        ])
+    
+    async def fetch_product_bundle(self, product_url: str, limit: int = 20,
+                                   sort_by: str = "informative_score desc") -> Tuple[Optional[Dict], Optional[Dict], Optional[Dict]]:
+        product_info, rating_topics, first_page = await self.execute_batch([
+            queries.product_info(product_url),
+            queries.rating_and_topics(product_url),
+            queries.product_reviews(product_url, 1, limit, sort_by)
+        ], strict=True)
+        return product_info, rating_topics, first_page
+    
+    async def fetch_rating_and_topics(self, product_url: str) -> Optional[Dict]:
+        return await self.execute(queries.rating_and_topics(product_url))
+    
+    async def search_products(self, query: str, page: int = 1, rows: int = 8) -> Optional[Dict]:
+        return await self.execute(queries.search_products(query, page, rows))
+    
+    async def fetch_shop_detail(self, shop_domain: Union[str, List[str]]) -> Union[Optional[Dict], List[Optional[Dict]]]:
+        if isinstance(shop_domain, (list, tuple)):
+            return await self.execute_batch([queries.shop_detail(domain) for domain in shop_domain])
+        return await self.execute(queries.shop_detail(shop_domain))
+    
+    async def fetch_shop_rating(self, shop_id: Union[str, List[str]]) -> Union[Optional[Dict], List[Optional[Dict]]]:
+        if isinstance(shop_id, (list, tuple)):
+            return await self.execute_batch([queries.shop_rating(sid) for sid in shop_id])
+        return await self.execute(queries.shop_rating(shop_id))
+    
+    async def fetch_shop_products(self, shop_id: str, page: int = 1, per_page: int = 10) -> Optional[Dict]:
+        return await self.execute(queries.shop_products(shop_id, page, per_page))
+    
+    async def fetch_shop_catalog(self, shop_id: str, per_page: int = 80, max_products: Optional[int] = None) -> List[Dict]:
+        products, page = [], 1
+        while max_products is None or len(products) < max_products:
+            response = await self.fetch_shop_products(shop_id, page, per_page)
+            if not response or not response.get('data'):
+                break
+            products.extend(response['data'])
+            if not (response.get('links') or {}).get('next'):
+                break
+            page += 1
+        return products[:max_products]
+    
+    async def fetch_first_review_pages(self, product_urls: List[str], limit: int = 20,
+                                       sort_by: str = "informative_score desc") -> List[Optional[Dict]]:
+        return await self.execute_batch([queries.product_reviews(url, 1, limit, sort_by) for url in product_urls])
@@ -0,0 +1,74 @@
+from typing import Any, Dict, List, Optional
+from ..utils import HeaderGenerator
+from .queries import GraphQLRequest
+from .ratelimit import THROTTLE_STATUSES
+from . import codec
+
+class FetchError(Exception):
+    def __init__(self, operation: str, status: Optional[int] = None, reason: str = ''):
+        self.operation = operation
+        self.status = status
+        detail = f"HTTP {status}" if status is not None else reason or "no response"
+        super().__init__(f"{operation} failed after retries ({detail})")
+    
+    @property
+    def throttled(self) -> bool:
+        return self.status in THROTTLE_STATUSES
+
+def batch_url(endpoint: str, requests: List[GraphQLRequest]) -> str:
+    return f"{endpoint}/{requests[0].operation_name}"
+
+def batch_headers(header_gen: HeaderGenerator, requests: List[GraphQLRequest]) -> Dict[str, str]:
+    referer = next((request.referer for request in requests if request.referer), None)
+    headers = header_gen.generate(referer)
+    for request in requests:
+        headers.update(request.headers)
+    return headers
+
+def batch_operations(requests: List[GraphQLRequest]) -> str:
+    return '+'.join(dict.fromkeys(request.operation_name for request in requests))
+
+def batch_payload(requests: List[GraphQLRequest]) -> bytes:
+    return codec.dumps([request.payload() for request in requests])
+
+def decode_response(requests: List[GraphQLRequest], raw: bytes) -> Any:
+    return codec.decode_batch([request.schema for request in requests], raw)
+
+def split_response(requests: List[GraphQLRequest], body: Any) -> List[Optional[Dict]]:
+    if not isinstance(body, list) or len(body) != len(requests):
+        return [None] * len(requests)
+    return [request.parse(item) if isinstance(item, dict) else None for request, item in zip(requests, body)]
+
+class BatchCall:
+    def __init__(self, request: GraphQLRequest):
+        self.request = request
+        self.result: Optional[Dict] = None
+        self.done = False
+
+class GraphQLBatch:
+    def __init__(self, fetcher):
+        self.fetcher = fetcher
+        self.pending: List[BatchCall] = []
+    
+    def add(self, request: GraphQLRequest) -> BatchCall:
+        call = BatchCall(request)
+        self.pending.append(call)
+        return call
+    
+    def flush(self) -> List[BatchCall]:
+        calls, self.pending = self.pending, []
+        if calls:
+            results = self.fetcher.execute_batch([call.request for call in calls])
+            for call, result in zip(calls, results):
+                call.result = result
+                call.done = True
+        return calls
+    
+    async def flush_async(self) -> List[BatchCall]:
+        calls, self.pending = self.pending, []
+        if calls:
+            results = await self.fetcher.execute_batch([call.request for call in calls])
+            for call, result in zip(calls, results):
+                call.result = result
+                call.done = True
+        return calls
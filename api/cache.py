@@ -0,0 +1,159 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from . import codec
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "tokped_detector", "responses.sqlite3")
+
+class ResponseCache:
+    DEFAULT_TTLS = {
+        "productrevGetMiniProductInfo": 3600,
+        "productReviewList": 600,
+        "productrevGetProductRatingAndTopics": 1800,
+        "SearchProductV5Query": 1800,
+        "ShopInfoCoreQuery": 6 * 3600,
+        "ShopPageGetRating": 6 * 3600,
+        "GetShopProduct": 3600
+    }
+    
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = 5000,
+                 ttls: Optional[Dict[str, float]] = None, default_ttl: float = 600, touch_batch: int = 64):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.ttls = dict(self.DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.default_ttl = default_ttl
+        self.touch_batch = touch_batch
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._touched: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, operation TEXT NOT NULL, value TEXT NOT NULL, "
+            "expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        self._conn.commit()
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    
+    @staticmethod
+    def make_key(operation_name: str, variables: Dict) -> str:
+        return operation_name + ":" + json.dumps(variables, sort_keys=True, separators=(",", ":"))
+    
+    def ttl_for(self, operation_name: str) -> float:
+        return self.ttls.get(operation_name, self.default_ttl)
+    
+    def get(self, operation_name: str, variables: Dict) -> Optional[Any]:
+        return self.get_many([(operation_name, variables)])[0]
+    
+    def get_many(self, items: List[Tuple[str, Dict]]) -> List[Optional[Any]]:
+        keys = [self.make_key(operation_name, variables) for operation_name, variables in items]
+        now = time.time()
+        values = []
+        with self._lock:
+            for key in keys:
+                row = self._conn.execute("SELECT value, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is None or row[1] <= now:
+                    self.misses += 1
+                    values.append(None)
+                    continue
+                self._touched[key] = now
+                self.hits += 1
+                values.append(row[0])
+            if len(self._touched) >= self.touch_batch:
+                self._flush_touches()
+                self._conn.commit()
+        return [codec.loads(value) if value is not None else None for value in values]
+    
+    def set(self, operation_name: str, variables: Dict, value: Any):
+        self.set_many([(operation_name, variables, value)])
+    
+    def set_many(self, items: List[Tuple[str, Dict, Any]]):
+        rows = []
+        now = time.time()
+        for operation_name, variables, value in items:
+            ttl = self.ttl_for(operation_name)
+            if ttl > 0 and value is not None:
+                rows.append((self.make_key(operation_name, variables), operation_name,
+                             codec.dumps(value).decode('utf-8'), now + ttl, now))
+        if not rows:
+            return
+        
+        with self._lock:
+            self._flush_touches()
+            for row in rows:
+                exists = self._conn.execute("SELECT 1 FROM responses WHERE key = ?", (row[0],)).fetchone()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, operation, value, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    row
+                )
+                if not exists:
+                    self._entries += 1
+            if self._entries > self.max_entries:
+                self._evict(self._entries - self.max_entries, now)
+            self._conn.commit()
+    
+    def _flush_touches(self):
+        if self._touched:
+            self._conn.executemany("UPDATE responses SET accessed_at = ? WHERE key = ?",
+                                   [(accessed_at, key) for key, accessed_at in self._touched.items()])
+            self._touched = {}
+    
+    def flush(self):
+        with self._lock:
+            self._flush_touches()
+            self._conn.commit()
+    
+    def _evict(self, overflow: int, now: float):
+        expired = self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,)).rowcount
+        overflow -= expired
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                (overflow,)
+            )
+        self.evictions += expired + max(overflow, 0)
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    
+    def invalidate(self, operation_name: str, variables: Optional[Dict] = None):
+        with self._lock:
+            if variables is None:
+                self._conn.execute("DELETE FROM responses WHERE operation = ?", (operation_name,))
+            else:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (self.make_key(operation_name, variables),))
+            self._conn.commit()
+            self._entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    
+    def clear(self):
+        with self._lock:
+            self._touched = {}
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._entries = 0
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / lookups * 100) if lookups > 0 else 0,
+            'evictions': self.evictions,
+            'entries': self._entries
+        }
+    
+    def close(self):
+        with self._lock:
+            self._flush_touches()
+            self._conn.commit()
+            self._conn.close()
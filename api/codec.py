@@ -0,0 +1,123 @@
+import json
+from typing import Any, Callable, Dict, List, Optional, TypedDict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+DECODE_ERRORS = (ValueError, msgspec.DecodeError) if msgspec is not None else (ValueError,)
+
+class ReviewUser(TypedDict, total=False):
+    userID: Any
+    label: Any
+
+class Review(TypedDict, total=False):
+    id: Any
+    message: Any
+    productRating: Any
+    reviewCreateTimestamp: Any
+    isAnonymous: Any
+    variantName: Any
+    user: Optional[ReviewUser]
+
+class ReviewList(TypedDict, total=False):
+    productID: Any
+    list: Optional[List[Review]]
+    shop: Any
+    hasNext: Any
+
+class ReviewListData(TypedDict, total=False):
+    productrevGetProductReviewList: Optional[ReviewList]
+
+class ReviewListItem(TypedDict, total=False):
+    data: Optional[ReviewListData]
+    errors: Any
+
+if msgspec is not None:
+    _raw_list = msgspec.json.Decoder(List[msgspec.Raw])
+    _any = msgspec.json.Decoder()
+    _encoder = msgspec.json.Encoder()
+
+REVIEW_FIELDS = ('id', 'message', 'productRating', 'reviewCreateTimestamp', 'isAnonymous', 'variantName')
+USER_FIELDS = ('userID', 'label')
+REVIEW_PAGE_FIELDS = ('productID', 'list', 'shop', 'hasNext')
+
+class ResponseSchema:
+    def __init__(self, project: Callable[[Dict], Dict], item_type: Any = None):
+        self.project = project
+        self.decoder = msgspec.json.Decoder(item_type) if msgspec is not None and item_type is not None else None
+    
+    def decode(self, raw: bytes) -> Any:
+        if self.decoder is not None:
+            try:
+                return self.decoder.decode(raw)
+            except DECODE_ERRORS:
+                pass
+        item = loads(raw)
+        return self.project(item) if isinstance(item, dict) else item
+
+def _pick(source: Dict, fields) -> Dict:
+    return {field: source[field] for field in fields if field in source}
+
+def slim_review(review: Dict) -> Dict:
+    slim = _pick(review, REVIEW_FIELDS)
+    user = review.get('user')
+    if 'user' in review:
+        slim['user'] = _pick(user, USER_FIELDS) if isinstance(user, dict) else user
+    return slim
+
+def slim_review_item(item: Dict) -> Dict:
+    data = item.get('data')
+    page = data.get('productrevGetProductReviewList') if isinstance(data, dict) else None
+    if not isinstance(page, dict):
+        return item
+    
+    slim = _pick(page, REVIEW_PAGE_FIELDS)
+    if isinstance(slim.get('list'), list):
+        slim['list'] = [slim_review(review) if isinstance(review, dict) else review for review in slim['list']]
+    item['data'] = {'productrevGetProductReviewList': slim}
+    return item
+
+REVIEW_PAGE_SCHEMA = ResponseSchema(slim_review_item, ReviewListItem)
+
+def dumps(value: Any) -> bytes:
+    if msgspec is not None:
+        return _encoder.encode(value)
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+
+def loads(raw: Any) -> Any:
+    if msgspec is not None:
+        return _any.decode(raw)
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def decode_batch(schemas: List[Optional[ResponseSchema]], raw: bytes) -> Any:
+    try:
+        return _decode_batch(schemas, raw)
+    except DECODE_ERRORS:
+        return None
+
+def _decode_batch(schemas: List[Optional[ResponseSchema]], raw: bytes) -> Any:
+    if msgspec is not None and any(schemas):
+        try:
+            items = _raw_list.decode(raw)
+        except msgspec.ValidationError:
+            return _any.decode(raw)
+        if len(items) != len(schemas):
+            return [_any.decode(item) for item in items]
+        return [schema.decode(item) if schema is not None else _any.decode(item) for schema, item in zip(schemas, items)]
+    
+    body = loads(raw)
+    if isinstance(body, list) and len(body) == len(schemas):
+        return [schema.project(item) if schema is not None and isinstance(item, dict) else item
+                for schema, item in zip(schemas, body)]
+    return body
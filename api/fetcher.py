@@ -1,196 +1,160 @@
 import requests
-import json
 import time
-import random
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple, Union
 from ..utils import HeaderGenerator
+from ..metrics import current_trace
+from . import queries
+from .queries import GraphQLRequest, GRAPHQL_ENDPOINT
+from .cache import ResponseCache
+from .ratelimit import RequestScheduler
+from .fixtures import FixtureArchive
+from .batch import batch_url, batch_headers, batch_payload, batch_operations, decode_response, split_response, FetchError
 
 class APIFetcher:
-    def __init__(self):
+    def __init__(self, endpoint: str = GRAPHQL_ENDPOINT, cache: Optional[ResponseCache] = None,
+                 max_batch_size: int = 10, fixtures: Optional[FixtureArchive] = None,
+                 scheduler: Optional[RequestScheduler] = None):
         self.session = requests.Session()
         self.header_gen = HeaderGenerator()
+        self.endpoint = endpoint
+        self.cache = cache
+        self.max_batch_size = max_batch_size
+        self.fixtures = fixtures
+        self.scheduler = scheduler or RequestScheduler()
+    
+    def execute(self, request: GraphQLRequest) -> Optional[Dict]:
+        return self.execute_batch([request])[0]
+    
+    def execute_batch(self, calls: List[GraphQLRequest], strict: bool = False) -> List[Optional[Dict]]:
+        results: List[Optional[Dict]] = [None] * len(calls)
+        pending = []
+        with current_trace().span("fetch:" + batch_operations(calls)) as stage:
+            if self.cache:
+                cached = self.cache.get_many([(request.operation_name, request.cache_variables) for request in calls])
+            else:
+                cached = [None] * len(calls)
+            for index, value in enumerate(cached):
+                if value is not None:
+                    results[index] = value
+                else:
+                    pending.append(index)
+            stage.cache_hits = len(calls) - len(pending)
+            
+            for start in range(0, len(pending), self.max_batch_size):
+                indexes = pending[start:start + self.max_batch_size]
+                batch = [calls[index] for index in indexes]
+                fetched = []
+                for index, request, result in zip(indexes, batch, self._post(batch, strict)):
+                    results[index] = result
+                    fetched.append((request.operation_name, request.cache_variables, result))
+                if self.cache:
+                    self.cache.set_many(fetched)
+        
+        return results
+    
+    def _post(self, batch: List[GraphQLRequest], strict: bool = False) -> List[Optional[Dict]]:
+        if self.fixtures is not None and self.fixtures.replaying:
+            return split_response(batch, self.fixtures.replay(batch))
+        
+        trace = current_trace()
+        operation = batch[0].operation_name
+        url, payload = batch_url(self.endpoint, batch), batch_payload(batch)
+        headers = batch_headers(self.header_gen, batch)
+        
+        attempt = 0
+        while True:
+            with trace.span("ratelimit"):
+                self.scheduler.acquire(operation)
+            response, error = None, None
+            with trace.span("http:" + batch_operations(batch), requests=len(batch)) as stage:
+                try:
+                    response = self.session.post(url, data=payload, headers=headers)
+                except requests.RequestException as e:
+                    error = e
+                    stage.error = type(e).__name__
+                else:
+                    stage.status = response.status_code
+                    stage.bytes_received = len(response.content)
+            
+            status = response.status_code if response is not None else None
+            retry_hint = response.headers.get('Retry-After') if response is not None else None
+            self.scheduler.record(operation, status, retry_hint)
+            if status == 200 or not self.scheduler.should_retry(operation, status, attempt):
+                break
+            with trace.span("backoff"):
+                time.sleep(self.scheduler.backoff(operation, attempt, retry_hint))
+            attempt += 1
+        
+        if error is not None:
+            if strict:
+                raise FetchError(operation, reason=type(error).__name__) from error
+            raise error
+        if status != 200:
+            if strict:
+                raise FetchError(operation, status)
+            return [None] * len(batch)
+        body = decode_response(batch, response.content)
+        if self.fixtures is not None:
+            self.fixtures.record(batch, body)
+        return split_response(batch, body)
     
     def fetch_product_info(self, product_url: str) -> Optional[Dict]:
-        url = "https://gql.tokopedia.com/graphql/productrevGetMiniProductInfo"
-        payload = [{
-            "operationName": "productrevGetMiniProductInfo",
-            "variables": {
-                "productURL": product_url,
-                "userLocation": {
-                    "addressID": "",
-                    "districtID": "2274",
-                    "postalCode": "",
-                    "latlon": ""
-                }
-            },
-            "query": "query productrevGetMiniProductInfo($productURL: String!, $userLocation: productrevUserLocation) {\n  productrevGetMiniProductInfo(\n    productID: \"\"\n    productURL: $productURL\n    userLocation: $userLocation\n  ) {\n    product {\n      id\n      name\n      thumbnailURL\n      price\n      status\n      stock\n      priceFmt\n      __typename\n    }\n    campaign {\n      isActive\n      discountPercentage\n      discountedPrice\n      __typename\n    }\n    __typename\n  }\n}"
-        }]
-        
-        headers = self.header_gen.generate(product_url)
-        response = self.session.post(url, data=json.dumps(payload), headers=headers)
-        time.sleep(random.uniform(0.5, 1.5))
-        
-        if response.status_code == 200:
-            return response.json()[0]['data']['productrevGetMiniProductInfo']
-        return None
+        return self.execute(queries.product_info(product_url))
     
     def fetch_reviews(self, product_url: str, product_id: Optional[str] = None, 
                      page: int = 1, limit: int = 20, sort_by: str = "informative_score desc") -> Optional[Dict]:
-        url = "https://gql.tokopedia.com/graphql/productReviewList"
-        payload = [{
-            "operationName": "productReviewList",
-            "variables": {
-                "productURL": product_url,
-                "page": page,
-                "limit": limit,
-                "sortBy": sort_by,
-                "filterBy": "",
-                "opt": ""
-            },
-            "query": "query productReviewList($productURL: String!, $page: Int!, $limit: Int!, $sortBy: String, $filterBy: String, $opt: String) {\n  productrevGetProductReviewList(\n    productID: \"\"\n    productURL: $productURL\n    page: $page\n    limit: $limit\n    sortBy: $sortBy\n    filterBy: $filterBy\n    opt: $opt\n  ) {\n    productID\n    list {\n      id: feedbackID\n      variantName\n      message\n      productRating\n      reviewCreateTime\n      reviewCreateTimestamp\n      isReportable\n      isAnonymous\n      videoAttachments {\n        attachmentID\n        videoUrl\n        __typename\n      }\n      imageAttachments {\n        attachmentID\n        imageThumbnailUrl\n        imageUrl\n        __typename\n      }\n      reviewResponse {\n        message\n        createTime\n        __typename\n      }\n      user {\n        userID\n        fullName\n        image\n        url\n        label\n        __typename\n      }\n      likeDislike {\n        totalLike\n        likeStatus\n        __typename\n      }\n      stats {\n        key\n        formatted\n        count\n        __typename\n      }\n      badRatingReasonFmt\n      __typename\n    }\n    shop {\n      shopID\n      name\n      url\n      image\n      __typename\n    }\n    variantFilter {\n      isUnavailable\n      ticker\n      __typename\n    }\n    hasNext\n    __typename\n  }\n}"
-        }]
-        
-        headers = self.header_gen.generate(product_url)
-        response = self.session.post(url, data=json.dumps(payload), headers=headers)
-        time.sleep(random.uniform(0.5, 1.5))
-        
-        if response.status_code == 200:
-            return response.json()[0]['data']['productrevGetProductReviewList']
-        return None
+        return self.execute(queries.product_reviews(product_url, page, limit, sort_by))
+    
+    def fetch_review_pages(self, product_url: str, pages: List[int], limit: int = 20,
+                           sort_by: str = "informative_score desc") -> List[Optional[Dict]]:
+        return self.execute_batch([queries.product_reviews(product_url, page, limit, sort_by) for page in pages])
+    
+    def fetch_review_sample(self, product_url: str, pages: List[Tuple[int, str, str]],
+                            limit: int = 20) -> List[Optional[Dict]]:
+        return self.execute_batch([
+            queries.product_reviews(product_url, page, limit, sort_by, filter_by) for page, sort_by, filter_by in pages
+        ])
+    
+    def fetch_product_bundle(self, product_url: str, limit: int = 20,
+                             sort_by: str = "informative_score desc") -> Tuple[Optional[Dict], Optional[Dict], Optional[Dict]]:
+        product_info, rating_topics, first_page = self.execute_batch([
+            queries.product_info(product_url),
+            queries.rating_and_topics(product_url),
+            queries.product_reviews(product_url, 1, limit, sort_by)
+        ], strict=True)
+        return product_info, rating_topics, first_page
     
     def fetch_rating_and_topics(self, product_url: str) -> Optional[Dict]:
-        url = "https://gql.tokopedia.com/graphql/productrevGetProductRatingAndTopics"
-        
-        payload = [{
-            "operationName": "productrevGetProductRatingAndTopics",
-            "variables": {
-                "productURL": product_url,
-                "filterBy": "",
-                "pageSource": "filter"
-            },
-            "query": "query productrevGetProductRatingAndTopics($productURL: String!, $filterBy: String, $pageSource: String) {\n  productrevGetProductRatingAndTopics(\n    productURL: $productURL\n    productID: \"\"\n    filterBy: $filterBy\n    pageSource: $pageSource\n  ) {\n    productID\n    rating {\n      positivePercentageFmt\n      ratingScore\n      totalRating\n      totalRatingWithImage\n      totalRatingTextAndImage\n      detail {\n        rate\n        totalReviews\n        formattedTotalReviews\n        percentageFloat\n        __typename\n      }\n      __typename\n    }\n    topics {\n      rating\n      ratingFmt\n      formatted\n      key\n      reviewCount\n      reviewCountFmt\n      show\n      __typename\n    }\n    keywords {\n      text\n      count\n      __typename\n    }\n    availableFilters {\n      withAttachment\n      rating\n      topics\n      helpfulness\n      variant\n      __typename\n    }\n    variantsData {\n      name\n      option {\n        id\n        name\n        image\n        __typename\n      }\n      __typename\n    }\n    pairedVariantsData {\n      optionIDs\n      __typename\n    }\n    layout {\n      backgroundColor\n      reviewSourceIconUrl\n      reviewSourceText\n      __typename\n    }\n    __typename\n  }\n}"
-        }]
-        
-        headers = self.header_gen.generate(product_url)
-        headers['x-theme'] = "default"
-        response = self.session.post(url, data=json.dumps(payload), headers=headers)
-        time.sleep(random.uniform(0.5, 1.5))
-        
-        if response.status_code == 200:
-            return response.json()[0]['data']['productrevGetProductRatingAndTopics']
-        return None
+        return self.execute(queries.rating_and_topics(product_url))
     
     def search_products(self, query: str, page: int = 1, rows: int = 8) -> Optional[Dict]:
-        url = "https://gql.tokopedia.com/graphql/SearchProductV5Query"
-        
-        search_param = f"device=mobile&enable_lite_deduplication=true&enter_method=normal_search&l_name=sre&navsource=home&ob=23&page={page}&q={query}&rows={rows}&source=search&srp_component_id=02.01.00.00&unique_id={random.randint(1000000000000000000, 9999999999999999999)}&use_page=true&user_cityId=176&user_districtId=2274&warehouses="
-        
-        payload = [{
-            "operationName": "SearchProductV5Query",
-            "variables": {
-                "searchProductV5Param": search_param
-            },
-            "query": "query SearchProductV5Query($searchProductV5Param: String!) {\n  searchProductV5(params: $searchProductV5Param) {\n    header {\n      totalData\n      responseCode\n      keywordProcess\n      keywordIntention\n      componentID\n      isQuerySafe\n      additionalParams\n      backendFilters\n      backendFiltersToggle\n      meta {\n        dynamicFields\n        __typename\n      }\n      __typename\n    }\n    data {\n      totalDataText\n      banner {\n        position\n        text\n        url\n        imageURL\n        componentID\n        trackingOption\n        __typename\n      }\n      redirection {\n        url\n        applink\n        __typename\n      }\n      related {\n        relatedKeyword\n        position\n        trackingOption\n        otherRelated {\n          keyword\n          url\n          applink\n          componentID\n          products {\n            oldId: id\n            id: id_str_auto_\n            name\n            url\n            applink\n            mediaURL {\n              image\n              __typename\n            }\n            shop {\n              oldId: id\n              id: id_str_auto_\n              name\n              city\n              tier\n              __typename\n            }\n            badge {\n              id\n              title\n              url\n              __typename\n            }\n            price {\n              text\n              number\n              __typename\n            }\n            freeShipping {\n              url\n              __typename\n            }\n            labelGroups {\n              id\n              position\n              title\n              type\n              url\n              styles {\n                key\n                value\n                __typename\n              }\n              __typename\n            }\n            rating\n            wishlist\n            ads {\n              id\n              productClickURL\n              productViewURL\n              productWishlistURL\n              tag\n              __typename\n            }\n            meta {\n              oldWarehouseID: warehouseID\n              warehouseID: warehouseID_str_auto_\n              componentID\n              oldParentID: parentID\n              parentID: parentID_str_auto_\n              __typename\n            }\n            __typename\n          }\n          __typename\n        }\n        __typename\n      }\n      suggestion {\n        currentKeyword\n        suggestion\n        query\n        text\n        componentID\n        trackingOption\n        __typename\n      }\n      shopWidget {\n        headline {\n          badge {\n            id\n            title\n            url\n            __typename\n          }\n          shop {\n            id\n            ttsSellerID\n            location\n            City\n            name\n            ratingScore\n            imageShop {\n              sURL\n              __typename\n            }\n            products {\n              id\n              id_str_auto_\n              ttsProductID\n              name\n              url\n              rating\n              mediaURL {\n                image\n                image300\n                videoCustom\n                __typename\n              }\n              shop {\n                oldId: id\n                id: id_str_auto_\n                ttsSellerID\n                name\n                city\n                __typename\n              }\n              price {\n                text\n                number\n                range\n                discountPercentage\n                original\n                __typename\n              }\n              labelGroups {\n                id\n                position\n                title\n                type\n                url\n                styles {\n                  key\n                  value\n                  __typename\n                }\n                __typename\n              }\n              meta {\n                oldParentID: parentID\n                parentID: parentID_str_auto_\n                isPortrait\n                oldWarehouseID: warehouseID\n                warehouseID: warehouseID_str_auto_\n                __typename\n              }\n              stock {\n                ttsSKUID\n                __typename\n              }\n              __typename\n            }\n            __typename\n          }\n          __typename\n        }\n        meta {\n          redirect\n          __typename\n        }\n        __typename\n      }\n      ticker {\n        id\n        text\n        query\n        applink\n        componentID\n        trackingOption\n        __typename\n      }\n      violation {\n        headerText\n        descriptionText\n        imageURL\n        ctaURL\n        ctaApplink\n        buttonText\n        buttonType\n        __typename\n      }\n      products {\n        oldId: id\n        id: id_str_auto_\n        ttsProductID\n        name\n        url\n        applink\n        mediaURL {\n          image\n          image300\n          videoCustom\n          __typename\n        }\n        shop {\n          oldId: id\n          id: id_str_auto_\n          ttsSellerID\n          name\n          url\n          city\n          tier\n          __typename\n        }\n        stock {\n          ttsSKUID\n          __typename\n        }\n        badge {\n          id\n          title\n          url\n          __typename\n        }\n        price {\n          text\n          number\n          range\n          original\n          discountPercentage\n          __typename\n        }\n        freeShipping {\n          url\n          __typename\n        }\n        labelGroups {\n          id\n          position\n          title\n          type\n          url\n          styles {\n            key\n            value\n            __typename\n          }\n          __typename\n        }\n        labelGroupsVariant {\n          title\n          type\n          typeVariant\n          hexColor\n          __typename\n        }\n        category {\n          oldId: id\n          id: id_str_auto_\n          name\n          breadcrumb\n          gaKey\n          __typename\n        }\n        rating\n        wishlist\n        ads {\n          id\n          productClickURL\n          productViewURL\n          productWishlistURL\n          tag\n          __typename\n        }\n        meta {\n          oldParentID: parentID\n          parentID: parentID_str_auto_\n          oldWarehouseID: warehouseID\n          warehouseID: warehouseID_str_auto_\n          isImageBlurred\n          isPortrait\n          __typename\n        }\n        __typename\n      }\n      __typename\n    }\n    __typename\n  }\n}"
-        }]
-        
-        headers = self.header_gen.generate()
-        headers.update({
-            'x-dark-mode': "false",
-            'x-device': "mobile",
-            'bd-web-id': str(random.randint(7000000000000000000, 7999999999999999999))
-        })
-        
-        response = self.session.post(url, data=json.dumps(payload), headers=headers)
-        time.sleep(random.uniform(0.5, 1.5))
-        
-        if response.status_code == 200:
-            return response.json()[0]['data']['searchProductV5']
-        return None
+        return self.execute(queries.search_products(query, page, rows))
     
-    def fetch_shop_detail(self, shop_domain: str) -> Optional[Dict]:
-        url = "https://gql.tokopedia.com/graphql/ShopInfoCoreQuery"
-        
-        payload = [{
-            "operationName": "ShopInfoCoreQuery",
-            "variables": {
-                "shopIDs": [0],
-                "domain": shop_domain,
-                "fields": [
-                    "allow_manage", "assets", "core", "create_info", "favorite",
-                    "location", "other-goldos", "other-shiploc", "status",
-                    "shipment", "shop-snippet", "goapotik", "fs_type",
-                    "tts_integration_completed"
-                ]
-            },
-            "query": "query ShopInfoCoreQuery($shopIDs: [Int!]!, $fields: [String!]!, $domain: String) {\n  shopInfoByID(\n    input: {shopIDs: $shopIDs, fields: $fields, domain: $domain, source: \"gql-shoppage-lite\"}\n  ) {\n    result {\n      favoriteData {\n        totalFavorite\n        alreadyFavorited\n        __typename\n      }\n      goldOS {\n        isGold\n        isGoldBadge\n        isOfficial\n        badge\n        __typename\n      }\n      location\n      isAllowManage\n      shippingLoc {\n        districtName\n        cityName\n        __typename\n      }\n      shopAssets {\n        avatar\n        cover\n        __typename\n      }\n      shopCore {\n        description\n        domain\n        shopID\n        name\n        shopScore\n        tagLine\n        url\n        __typename\n      }\n      statusInfo {\n        shopStatus\n        statusMessage\n        statusTitle\n        tickerType\n        __typename\n      }\n      createInfo {\n        shopCreated\n        epochShopCreated\n        openSince\n        __typename\n      }\n      bbInfo {\n        bbName\n        bbDesc\n        bbNameEN\n        bbDescEN\n        __typename\n      }\n      shipmentInfo {\n        isAvailable\n        code\n        image\n        name\n        product {\n          isAvailable\n          productName\n          shipProdID\n          uiHidden\n          __typename\n        }\n        isPickup\n        maxAddFee\n        awbStatus\n        __typename\n      }\n      shopSnippetURL\n      customSEO {\n        title\n        description\n        bottomContent\n        __typename\n      }\n      isQA\n      isGoApotik\n      epharmacyInfo {\n        siaNumber\n        sipaNumber\n        apj\n        __typename\n      }\n      partnerInfo {\n        fsType\n        __typename\n      }\n      ttsIntegrationCompletedData {\n        ttsSellerID\n        __typename\n      }\n      __typename\n    }\n    error {\n      message\n      __typename\n    }\n    __typename\n  }\n}"
-        }]
-        
-        headers = self.header_gen.generate()
-        headers['x-device'] = "tokopedia-lite"
-        
-        response = self.session.post(url, data=json.dumps(payload), headers=headers)
-        time.sleep(random.uniform(0.5, 1.5))
-        
-        if response.status_code == 200:
-            data = response.json()[0]['data']['shopInfoByID']
-            if data and data.get('result') and len(data['result']) > 0:
-                return data['result'][0]
-        return None
+    def fetch_shop_detail(self, shop_domain: Union[str, List[str]]) -> Union[Optional[Dict], List[Optional[Dict]]]:
+        if isinstance(shop_domain, (list, tuple)):
+            return self.execute_batch([queries.shop_detail(domain) for domain in shop_domain])
+        return self.execute(queries.shop_detail(shop_domain))
     
-    def fetch_shop_rating(self, shop_id: str) -> Optional[Dict]:
-        url = "https://gql.tokopedia.com/graphql/ShopPageGetRating"
-        
-        payload = [{
-            "operationName": "ShopPageGetRating",
-            "variables": {
-                "shopId": shop_id
-            },
-            "query": "query ShopPageGetRating($shopId: String!) {\n  productrevGetShopRating(shopID: $shopId) {\n    detail {\n      formattedTotalReviews\n      rate\n      percentage\n      percentageFloat\n      totalReviews\n      __typename\n    }\n    ratingScore\n    totalRating\n    __typename\n  }\n}"
-        }]
-        
-        headers = self.header_gen.generate()
-        response = self.session.post(url, data=json.dumps(payload), headers=headers)
-        time.sleep(random.uniform(0.3, 0.8))
-        
-        if response.status_code == 200:
-            data = response.json()[0]['data']
-            if data and data.get('productrevGetShopRating'):
-                return data['productrevGetShopRating']
-        return None
+    def fetch_shop_rating(self, shop_id: Union[str, List[str]]) -> Union[Optional[Dict], List[Optional[Dict]]]:
+        if isinstance(shop_id, (list, tuple)):
+            return self.execute_batch([queries.shop_rating(sid) for sid in shop_id])
+        return self.execute(queries.shop_rating(shop_id))
     
     def fetch_shop_products(self, shop_id: str, page: int = 1, per_page: int = 10) -> Optional[Dict]:
-        url = "https://gql.tokopedia.com/graphql/GetShopProduct"
-        
-        payload = [{
-            "operationName": "GetShopProduct",
-            "variables": {
-                "shopID": shop_id,
-                "page": page,
-                "perPage": per_page,
-                "fkeyword": "",
-                "fmenu": "all",
-                "sort": 2,
-                "user_districtId": "2274",
-                "user_cityId": "176",
-                "user_lat": "0",
-                "user_long": "0",
-                "rating": None,
-                "pmin": None,
-                "pmax": None,
-                "fcategory": None,
-                "source": "shop"
-            },
-            "query": "query GetShopProduct($shopID: String!, $page: Int, $perPage: Int, $fkeyword: String, $fmenu: String, $sort: Int, $rating: String, $pmin: Int, $pmax: Int, $user_districtId: String, $user_cityId: String, $user_lat: String, $user_long: String, $fcategory: Int, $source: String, $extraParam: String) {\n  GetShopProduct(\n    shopID: $shopID\n    source: $source\n    filter: {page: $page, perPage: $perPage, fkeyword: $fkeyword, fmenu: $fmenu, sort: $sort, rating: $rating, pmin: $pmin, pmax: $pmax, user_districtId: $user_districtId, user_cityId: $user_cityId, user_lat: $user_lat, user_long: $user_long, fcategory: $fcategory, usecase: \"ace_get_shop_product_v2\", extraParam: $extraParam}\n  ) {\n    status\n    errors\n    links {\n      self\n      next\n      prev\n      __typename\n    }\n    suggestion {\n      text\n      query\n      response_code\n      keyword_process\n      __typename\n    }\n    totalData\n    additionalParams\n    data {\n      product_id\n      tts_product_id\n      tts_sku_id\n      parent_id\n      name\n      product_url\n      status\n      stock\n      sold\n      hasVariant\n      show_stockbar\n      price {\n        text_idr\n        __typename\n      }\n      flags {\n        id: product_id\n        isFeatured\n        isPreorder\n        isWishlist\n        isWholesale\n        isFreereturn\n        mustInsurance\n        supportFreereturn\n        withStock\n        isSold\n        __typename\n      }\n      label {\n        icon\n        color_hex\n        color_rgb\n        content\n        __typename\n      }\n      label_groups {\n        position\n        title\n        type\n        url\n        styles {\n          key\n          value\n          __typename\n        }\n        __typename\n      }\n      badge {\n        title\n        image_url\n        __typename\n      }\n      stats {\n        reviewCount\n        rating\n        averageRating\n        __typename\n      }\n      primary_image {\n        thumbnail\n        __typename\n      }\n      cashback {\n        cashback\n        cashback_amount\n        __typename\n      }\n      campaign {\n        hide_gimmick\n        is_active\n        is_upcoming\n        original_price\n        original_price_fmt\n        discounted_percentage\n        discounted_price_fmt\n        stock_sold_percentage\n        __typename\n      }\n      freeOngkir {\n        isActive\n        imgURL\n        __typename\n      }\n      __typename\n    }\n    __typename\n  }\n}"
-        }]
-        
-        headers = self.header_gen.generate()
-        headers['x-device'] = "tokopedia-lite"
-        
-        response = self.session.post(url, data=json.dumps(payload), headers=headers)
-        time.sleep(random.uniform(0.3, 0.8))
-        
-        if response.status_code == 200:
-            data = response.json()[0]['data']
-            if data and data.get('GetShopProduct'):
-                return data['GetShopProduct']
-        return None
+        return self.execute(queries.shop_products(shop_id, page, per_page))
+    
+    def fetch_shop_catalog(self, shop_id: str, per_page: int = 80, max_products: Optional[int] = None) -> List[Dict]:
+        products, page = [], 1
+        while max_products is None or len(products) < max_products:
+            response = self.fetch_shop_products(shop_id, page, per_page)
+            if not response or not response.get('data'):
+                break
+            products.extend(response['data'])
+            if not (response.get('links') or {}).get('next'):
+                break
+            page += 1
+        return products[:max_products]
+    
+    def fetch_first_review_pages(self, product_urls: List[str], limit: int = 20,
+                                 sort_by: str = "informative_score desc") -> List[Optional[Dict]]:
+        return self.execute_batch([queries.product_reviews(url, 1, limit, sort_by) for url in product_urls])
@@ -0,0 +1,92 @@
+import os
+import gzip
+import json
+import threading
+from typing import Any, Dict, List, Optional
+from .queries import GraphQLRequest
+from .cache import ResponseCache
+
+RECORD = "record"
+REPLAY = "replay"
+
+class FixtureArchive:
+    def __init__(self, path: str, mode: str = REPLAY):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"unknown fixture mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+        self._lock = threading.Lock()
+        self._responses: Dict[str, Any] = {}
+        self._handle = None
+        
+        if mode == REPLAY:
+            self._load()
+        else:
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+    
+    @property
+    def replaying(self) -> bool:
+        return self.mode == REPLAY
+    
+    @staticmethod
+    def key(request: GraphQLRequest) -> str:
+        return ResponseCache.make_key(request.operation_name, request.cache_variables)
+    
+    def _load(self):
+        with gzip.open(self.path, 'rt', encoding='utf-8') as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                self._responses[ResponseCache.make_key(entry['operation'], entry['variables'])] = entry['response']
+    
+    def replay(self, batch: List[GraphQLRequest]) -> List[Optional[Any]]:
+        with self._lock:
+            responses = [self._responses.get(self.key(request)) for request in batch]
+            found = sum(1 for response in responses if response is not None)
+            self.hits += found
+            self.misses += len(batch) - found
+        return responses
+    
+    def record(self, batch: List[GraphQLRequest], body: Any):
+        if not isinstance(body, list) or len(body) != len(batch):
+            return
+        
+        lines = []
+        for request, item in zip(batch, body):
+            if isinstance(item, dict):
+                lines.append(json.dumps({
+                    'operation': request.operation_name,
+                    'variables': request.cache_variables,
+                    'response': item
+                }, ensure_ascii=False, separators=(",", ":")))
+        
+        if not lines:
+            return
+        with self._lock:
+            if self._handle is None:
+                self._handle = gzip.open(self.path, 'at', encoding='utf-8')
+            self._handle.write('\n'.join(lines) + '\n')
+            self.recorded += len(lines)
+    
+    def __len__(self) -> int:
+        return len(self._responses)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'mode': self.mode,
+            'entries': len(self._responses),
+            'hits': self.hits,
+            'misses': self.misses,
+            'recorded': self.recorded
+        }
+    
+    def close(self):
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
@@ -0,0 +1,176 @@
+import json
+import time
+import random
+import asyncio
+import threading
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+THROTTLE_STATUSES = frozenset({429, 503})
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+    
+    def reserve(self, tokens: float = 1.0) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= tokens
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+    
+    def set_rate(self, rate: float):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+    
+    def pause(self, seconds: float):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens = min(self.tokens, 0.0) - seconds * self.rate
+    
+    def acquire(self, tokens: float = 1.0):
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+    
+    async def acquire_async(self, tokens: float = 1.0):
+        wait = self.reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+@dataclass
+class EndpointBudget:
+    rate: float = 2.0
+    burst: float = 4.0
+    min_rate: float = 0.2
+    max_rate: float = 8.0
+    increase: float = 0.25
+    decrease: float = 0.5
+    max_retries: int = 4
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+
+DEFAULT_BUDGETS = {
+    "default": EndpointBudget(),
+    "SearchProductV5Query": EndpointBudget(rate=1.0, burst=2.0, max_rate=4.0),
+    "ShopPageGetRating": EndpointBudget(rate=3.0, burst=6.0, max_rate=12.0),
+    "GetShopProduct": EndpointBudget(rate=3.0, burst=6.0, max_rate=12.0)
+}
+
+def load_budgets(path: str) -> Dict[str, EndpointBudget]:
+    with open(path, 'r', encoding='utf-8') as handle:
+        config = json.load(handle)
+    return {
+        operation: replace(DEFAULT_BUDGETS.get(operation, DEFAULT_BUDGETS['default']), **options)
+        for operation, options in config.items()
+    }
+
+def retry_after(value: Optional[str]) -> Optional[float]:
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None
+
+class AdaptiveRate:
+    def __init__(self, budget: EndpointBudget):
+        self.budget = budget
+        self.bucket = TokenBucket(budget.rate, budget.burst)
+        self.requests = 0
+        self.throttled = 0
+        self.retries = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def rate(self) -> float:
+        return self.bucket.rate
+    
+    def on_success(self):
+        with self._lock:
+            self.requests += 1
+            self.bucket.set_rate(min(self.budget.max_rate, self.bucket.rate + self.budget.increase))
+    
+    def on_throttle(self, pause: Optional[float] = None):
+        with self._lock:
+            self.requests += 1
+            self.throttled += 1
+            self.bucket.set_rate(max(self.budget.min_rate, self.bucket.rate * self.budget.decrease))
+            self.bucket.pause(pause or 0.0)
+    
+    def on_failure(self):
+        with self._lock:
+            self.requests += 1
+    
+    def backoff(self, attempt: int, hint: Optional[float] = None) -> float:
+        with self._lock:
+            self.retries += 1
+        delay = min(self.budget.max_delay, self.budget.base_delay * 2 ** attempt)
+        delay = random.uniform(delay / 2, delay)
+        return max(delay, min(hint, self.budget.max_delay)) if hint is not None else delay
+
+class RequestScheduler:
+    def __init__(self, budgets: Optional[Dict[str, EndpointBudget]] = None):
+        self.budgets = dict(DEFAULT_BUDGETS)
+        if budgets:
+            self.budgets.update(budgets)
+        self._rates: Dict[str, AdaptiveRate] = {}
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_file(cls, path: str) -> "RequestScheduler":
+        return cls(load_budgets(path))
+    
+    def budget(self, operation: str) -> EndpointBudget:
+        return self.budgets.get(operation, self.budgets['default'])
+    
+    def controller(self, operation: str) -> AdaptiveRate:
+        with self._lock:
+            controller = self._rates.get(operation)
+            if controller is None:
+                controller = AdaptiveRate(self.budget(operation))
+                self._rates[operation] = controller
+            return controller
+    
+    def acquire(self, operation: str):
+        self.controller(operation).bucket.acquire()
+    
+    async def acquire_async(self, operation: str):
+        await self.controller(operation).bucket.acquire_async()
+    
+    def record(self, operation: str, status: Optional[int], retry_after_header: Optional[str] = None):
+        controller = self.controller(operation)
+        if status == 200:
+            controller.on_success()
+        elif status in THROTTLE_STATUSES:
+            controller.on_throttle(retry_after(retry_after_header))
+        else:
+            controller.on_failure()
+    
+    def should_retry(self, operation: str, status: Optional[int], attempt: int) -> bool:
+        return (status is None or status in RETRYABLE_STATUSES) and attempt < self.budget(operation).max_retries
+    
+    def backoff(self, operation: str, attempt: int, retry_after_header: Optional[str] = None) -> float:
+        return self.controller(operation).backoff(attempt, retry_after(retry_after_header))
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            rates = dict(self._rates)
+        return {
+            operation: {
+                'rate': controller.rate,
+                'requests': controller.requests,
+                'throttled': controller.throttled,
+                'retries': controller.retries
+            }
+            for operation, controller in rates.items()
+        }
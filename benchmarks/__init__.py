@@ -0,0 +1,13 @@
+from .corpus import CorpusSpec, CorpusGenerator, generate_reviews
+from .runner import BenchmarkRunner, BenchmarkResult, save_report, load_report, compare_reports
+
+__all__ = [
+    "CorpusSpec",
+    "CorpusGenerator",
+    "generate_reviews",
+    "BenchmarkRunner",
+    "BenchmarkResult",
+    "save_report",
+    "load_report",
+    "compare_reports"
+]
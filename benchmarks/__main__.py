@@ -0,0 +1,84 @@
+import sys
+import argparse
+from rich.console import Console
+from rich.table import Table
+from .runner import BenchmarkRunner, DEFAULT_SIZES, save_report, load_report, compare_reports
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the review analyzers on synthetic corpora")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="corpus sizes to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case with a cold token cache, the fastest one is reported")
+    parser.add_argument("--only", nargs="+", metavar="CASE", help="run only the named cases (e.g. patterns pipeline)")
+    parser.add_argument("--exact-limit", type=int, default=1000, help="largest corpus timed with the exact O(n^2) similarity engine")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak memory run")
+    parser.add_argument("--duplicate-rate", type=float, default=0.2, help="fraction of reviews copied from a shared template")
+    parser.add_argument("--anonymous-ratio", type=float, default=0.1, help="fraction of anonymous reviews")
+    parser.add_argument("--burst-rate", type=float, default=0.05, help="chance that a reviewer posts a burst of follow-up reviews")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the corpus generator")
+    parser.add_argument("--output", metavar="FILE", help="write results as JSON to FILE")
+    parser.add_argument("--compare", metavar="FILE", help="compare against a previous JSON report")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="slowdown ratio above which a case counts as a regression")
+    return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    console = Console()
+    runner = BenchmarkRunner(
+        sizes=args.sizes,
+        repeat=args.repeat,
+        measure_memory=not args.no_memory,
+        exact_limit=args.exact_limit,
+        only=args.only,
+        spec_options={
+            'duplicate_rate': args.duplicate_rate,
+            'anonymous_ratio': args.anonymous_ratio,
+            'burst_rate': args.burst_rate,
+            'seed': args.seed
+        }
+    )
+    
+    table = Table(title="Analyzer Benchmarks", show_header=True, header_style="bold magenta")
+    table.add_column("Case", style="cyan")
+    table.add_column("Size", justify="right")
+    table.add_column("Time", justify="right")
+    table.add_column("Warm", justify="right")
+    table.add_column("Items/s", justify="right")
+    table.add_column("Peak Memory", justify="right")
+    
+    def on_result(result):
+        peak = f"{result.peak_kib / 1024:.1f} MiB" if result.peak_kib is not None else "-"
+        warm = f"{result.warm_seconds * 1000:.2f} ms" if result.warm_seconds is not None else "-"
+        console.print(f"[dim]{result.name} @ {result.size:,}: {result.seconds * 1000:.1f} ms[/dim]")
+        table.add_row(result.name, f"{result.size:,}", f"{result.seconds * 1000:.2f} ms", warm, f"{result.throughput:,.0f}", peak)
+    
+    results = runner.run(on_result)
+    console.print(table)
+    report = runner.report(results)
+    
+    if args.output:
+        save_report(report, args.output)
+        console.print(f"[green]Saved {len(results)} results to {args.output}[/green]")
+    
+    if args.compare:
+        rows = compare_reports(load_report(args.compare), report, args.tolerance)
+        comparison = Table(title="Comparison", show_header=True, header_style="bold magenta")
+        comparison.add_column("Case", style="cyan")
+        comparison.add_column("Size", justify="right")
+        comparison.add_column("Before", justify="right")
+        comparison.add_column("After", justify="right")
+        comparison.add_column("Change", justify="right")
+        for row in rows:
+            color = "red" if row['regression'] else "green"
+            comparison.add_row(row['name'], f"{row['size']:,}", f"{row['before'] * 1000:.2f} ms",
+                               f"{row['after'] * 1000:.2f} ms", f"[{color}]{row['ratio']:.2f}x[/{color}]")
+        console.print(comparison)
+        
+        regressions = [row for row in rows if row['regression']]
+        if regressions:
+            console.print(f"[red]{len(regressions)} case(s) slower than the baseline by more than {args.tolerance:.0%}[/red]")
+            return 1
+    
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
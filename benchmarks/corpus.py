@@ -0,0 +1,166 @@
+import random
+from itertools import accumulate
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Tuple
+
+WORDS = (
+    "bagus mantap barang sesuai pesanan cepat sampai pengiriman original puas sekali recommended "
+    "seller ramah oke terima kasih banget murah kualitas terbaik sempurna packing rapi aman "
+    "respon admin fast mulus warna ukuran pas mantul awet nyaman wangi lembut kokoh jos "
+    "kurang lama agak kecewa rusak sedikit lecet tapi overall lumayan harga worth it"
+).split()
+
+SYLLABLES = "ba ka ra ma na sa ta la pa da ga ja wa ya ha be ke re me ne se te le pe de bi ki ri mi ni si ti li pi di bo ko ro mo no so to lo po do bu ku ru mu nu su tu lu pu du".split()
+
+PRAISE = ["sangat bagus", "luar biasa", "sempurna sekali", "terbaik", "recommended banget", "mantap jiwa"]
+
+VARIANTS = ["", "Merah", "Biru", "Hitam", "Putih", "Hitam XL", "Merah M", "Biru L"]
+
+LABELS = ["", "", "Verified Buyer", "Verified Buyer", "Top Reviewer"]
+
+START_TIMESTAMP = 1700000000
+
+@dataclass
+class CorpusSpec:
+    size: int
+    duplicate_rate: float = 0.2
+    anonymous_ratio: float = 0.1
+    burst_rate: float = 0.05
+    praise_rate: float = 0.1
+    five_star_ratio: float = 0.7
+    vocabulary_size: int = 3000
+    days: int = 90
+    seed: int = 0
+    
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+class CorpusGenerator:
+    def __init__(self, spec: CorpusSpec):
+        self.spec = spec
+        self.rnd = random.Random(spec.seed)
+        self.vocabulary = WORDS + self._vocabulary(spec.vocabulary_size)
+        self.weights = list(accumulate(1 / (rank + 1) for rank in range(len(self.vocabulary))))
+        self.templates = [self._sentence() for _ in range(max(10, spec.size // 100))]
+        self.users = [str(10 ** 8 + index) for index in range(max(1, spec.size))]
+        self.next_user = 0
+    
+    def _vocabulary(self, size: int) -> List[str]:
+        words = set()
+        while len(words) < size:
+            words.add(''.join(self.rnd.choices(SYLLABLES, k=self.rnd.randint(2, 4))))
+        return sorted(words)
+    
+    def _sentence(self) -> str:
+        return ' '.join(self.rnd.choices(self.vocabulary, cum_weights=self.weights, k=self.rnd.randint(3, 18)))
+    
+    def _message(self) -> str:
+        if self.rnd.random() < self.spec.duplicate_rate:
+            words = self.rnd.choice(self.templates).split()
+            if self.rnd.random() < 0.5:
+                words[self.rnd.randrange(len(words))] = self.rnd.choice(self.vocabulary)
+            message = ' '.join(words)
+        else:
+            message = self._sentence()
+        
+        if self.rnd.random() < self.spec.praise_rate:
+            message = f"{message} {self.rnd.choice(PRAISE)} {self.rnd.choice(PRAISE)}"
+        return message
+    
+    def _rating(self) -> int:
+        if self.rnd.random() < self.spec.five_star_ratio:
+            return 5
+        return self.rnd.choice([1, 2, 3, 4, 4])
+    
+    def _user(self) -> str:
+        user_id = self.users[self.next_user % len(self.users)]
+        self.next_user += 1
+        return user_id
+    
+    def _review(self, index: int, timestamp: int, user_id: str) -> Dict:
+        anonymous = self.rnd.random() < self.spec.anonymous_ratio
+        return {
+            'id': str(900000000 + index),
+            'message': self._message(),
+            'productRating': self._rating(),
+            'reviewCreateTime': "",
+            'reviewCreateTimestamp': str(timestamp),
+            'isReportable': True,
+            'isAnonymous': anonymous,
+            'imageAttachments': [],
+            'videoAttachments': [],
+            'reviewResponse': {'message': "", 'createTime': ""},
+            'user': {
+                'userID': user_id,
+                'fullName': "A***" if anonymous else f"User {user_id[-4:]}",
+                'image': "",
+                'url': "",
+                'label': self.rnd.choice(LABELS)
+            },
+            'likeDislike': {'totalLike': self.rnd.randint(0, 5), 'likeStatus': 0},
+            'stats': [],
+            'badRatingReasonFmt': "",
+            'variantName': self.rnd.choice(VARIANTS)
+        }
+    
+    def reviews(self) -> List[Dict]:
+        spec = self.spec
+        span = max(1, spec.days) * 86400
+        reviews = []
+        while len(reviews) < spec.size:
+            index = len(reviews)
+            timestamp = START_TIMESTAMP + self.rnd.randrange(span)
+            user_id = self._user()
+            reviews.append(self._review(index, timestamp, user_id))
+            
+            if self.rnd.random() < spec.burst_rate:
+                for offset in range(self.rnd.randint(1, 3)):
+                    if len(reviews) >= spec.size:
+                        break
+                    timestamp += self.rnd.randint(5, 240)
+                    reviews.append(self._review(len(reviews), timestamp, user_id))
+        
+        reviews.sort(key=lambda review: int(review['reviewCreateTimestamp']), reverse=True)
+        return reviews
+    
+    def pages(self, limit: int = 50) -> List[Dict]:
+        reviews = self.reviews()
+        pages = []
+        for start in range(0, len(reviews), limit):
+            pages.append({
+                'productID': "1000000001",
+                'list': reviews[start:start + limit],
+                'shop': {'shopID': "5000", 'name': "Toko 0", 'url': "", 'image': ""},
+                'variantFilter': {'isUnavailable': False, 'ticker': ""},
+                'hasNext': start + limit < len(reviews)
+            })
+        return pages
+    
+    def rating_topics(self, reviews: List[Dict]) -> Dict:
+        counts = {rate: 0 for rate in range(1, 6)}
+        for review in reviews:
+            counts[review['productRating']] += 1
+        total = len(reviews) or 1
+        detail = [{
+            'rate': rate,
+            'totalReviews': counts[rate],
+            'formattedTotalReviews': str(counts[rate]),
+            'percentageFloat': counts[rate] / total * 100
+        } for rate in range(5, 0, -1)]
+        return {'rating': {'positivePercentageFmt': "", 'ratingScore': "", 'totalRating': len(reviews), 'totalRatingWithImage': 0, 'detail': detail}, 'topics': []}
+    
+    def shops(self, count: int) -> List[Tuple[Dict, Dict]]:
+        shops = []
+        for index in range(count):
+            shop_info = {
+                'shopCore': {'name': f"Toko {index}", 'shopID': str(5000 + index), 'domain': f"toko{index}", 'shopScore': self.rnd.randint(60, 100)},
+                'goldOS': {'isOfficial': self.rnd.random() < 0.1, 'isGold': self.rnd.random() < 0.4, 'badge': ""},
+                'createInfo': {'openSince': "", 'epochShopCreated': START_TIMESTAMP - self.rnd.randint(0, 6 * 365) * 86400},
+                'favoriteData': {'totalFavorite': self.rnd.randint(0, 30000)}
+            }
+            shop_rating = {'ratingScore': f"{self.rnd.uniform(3.5, 5.0):.1f}", 'totalRating': self.rnd.randint(0, 20000)}
+            shops.append((shop_info, shop_rating))
+        return shops
+
+def generate_reviews(size: int, **options) -> List[Dict]:
+    return CorpusGenerator(CorpusSpec(size, **options)).reviews()
@@ -0,0 +1,166 @@
+import gc
+import sys
+import json
+import time
+import platform
+import tracemalloc
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List, Optional
+from ..analysis import (PatternAnalyzer, BuyerAnalyzer, RatingAnalyzer, TimeAnalyzer, VariantAnalyzer,
+                        TrustAnalyzer, FakeScorer, ReviewPipeline, ReviewTable, ExactSimilarityEngine)
+from ..analysis.text import TOKEN_CACHE
+from .corpus import CorpusSpec, CorpusGenerator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    size: int
+    seconds: float
+    throughput: float
+    peak_kib: Optional[float] = None
+    warm_seconds: Optional[float] = None
+    
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+@dataclass
+class BenchmarkCase:
+    name: str
+    run: Callable[[], Any]
+    items: int
+    cached: bool = False
+
+class BenchmarkRunner:
+    def __init__(self, sizes: Optional[List[int]] = None, repeat: int = 3, measure_memory: bool = True,
+                 exact_limit: int = 1000, only: Optional[List[str]] = None, spec_options: Optional[Dict] = None):
+        self.sizes = sizes or list(DEFAULT_SIZES)
+        self.repeat = max(1, repeat)
+        self.measure_memory = measure_memory
+        self.exact_limit = exact_limit
+        self.only = set(only) if only else None
+        self.spec_options = spec_options or {}
+    
+    def cases(self, size: int) -> List[BenchmarkCase]:
+        generator = CorpusGenerator(CorpusSpec(size, **self.spec_options))
+        reviews = generator.reviews()
+        rating_topics = generator.rating_topics(reviews)
+        shops = generator.shops(min(size, 10000))
+        table = ReviewTable.from_reviews(reviews)
+        analysis = ReviewPipeline.run_table(table)
+        
+        def score():
+            for _ in range(size):
+                FakeScorer.calculate(analysis['patterns'], analysis['buyers'], analysis['ratings'],
+                                     analysis['time_data'], rating_topics, analysis['variants'])
+        
+        def trust():
+            for shop_info, shop_rating in shops:
+                TrustAnalyzer.analyze(shop_info, shop_rating)
+        
+        cases = [
+            BenchmarkCase('patterns', lambda: PatternAnalyzer.analyze(reviews), size, cached=True),
+            BenchmarkCase('buyers', lambda: BuyerAnalyzer.analyze(reviews), size),
+            BenchmarkCase('ratings', lambda: RatingAnalyzer.analyze(reviews), size),
+            BenchmarkCase('time', lambda: TimeAnalyzer.analyze(reviews), size),
+            BenchmarkCase('variants', lambda: VariantAnalyzer.analyze(reviews), size),
+            BenchmarkCase('trust', trust, len(shops)),
+            BenchmarkCase('scorer', score, size),
+            BenchmarkCase('table_build', lambda: ReviewTable.from_reviews(reviews), size),
+            BenchmarkCase('pipeline', lambda: ReviewPipeline.run(reviews), size, cached=True),
+            BenchmarkCase('pipeline_table', lambda: ReviewPipeline.run_table(table), size, cached=True)
+        ]
+        if size <= self.exact_limit:
+            cases.append(BenchmarkCase('patterns_exact', lambda: PatternAnalyzer.analyze(reviews, ExactSimilarityEngine()), size,
+                                       cached=True))
+        
+        if self.only is not None:
+            cases = [case for case in cases if case.name in self.only]
+        return cases
+    
+    @staticmethod
+    def _time(case: BenchmarkCase) -> float:
+        gc.collect()
+        start = time.perf_counter()
+        case.run()
+        return time.perf_counter() - start
+    
+    def measure(self, case: BenchmarkCase, size: int) -> BenchmarkResult:
+        best = None
+        warm = None
+        for _ in range(self.repeat):
+            TOKEN_CACHE.clear()
+            elapsed = self._time(case)
+            best = elapsed if best is None else min(best, elapsed)
+            if case.cached:
+                elapsed = self._time(case)
+                warm = elapsed if warm is None else min(warm, elapsed)
+        
+        peak_kib = None
+        if self.measure_memory:
+            TOKEN_CACHE.clear()
+            gc.collect()
+            tracemalloc.start()
+            try:
+                case.run()
+                peak_kib = tracemalloc.get_traced_memory()[1] / 1024
+            finally:
+                tracemalloc.stop()
+        
+        throughput = case.items / best if best > 0 else float('inf')
+        return BenchmarkResult(case.name, size, best, throughput, peak_kib, warm)
+    
+    def run(self, on_result: Optional[Callable[[BenchmarkResult], None]] = None) -> List[BenchmarkResult]:
+        results = []
+        for size in self.sizes:
+            for case in self.cases(size):
+                result = self.measure(case, size)
+                results.append(result)
+                if on_result:
+                    on_result(result)
+        return results
+    
+    def report(self, results: List[BenchmarkResult]) -> Dict:
+        return {
+            'meta': {
+                'created_at': time.time(),
+                'python': sys.version.split()[0],
+                'platform': platform.platform(),
+                'numpy': np.__version__ if np is not None else None,
+                'repeat': self.repeat,
+                'spec': CorpusSpec(0, **self.spec_options).to_dict()
+            },
+            'results': [result.to_dict() for result in results]
+        }
+
+def save_report(report: Dict, path: str):
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(report, handle, indent=2)
+
+def load_report(path: str) -> Dict:
+    with open(path, 'r', encoding='utf-8') as handle:
+        return json.load(handle)
+
+def compare_reports(baseline: Dict, current: Dict, tolerance: float = 0.25) -> List[Dict]:
+    previous = {(row['name'], row['size']): row for row in baseline.get('results', [])}
+    rows = []
+    for row in current.get('results', []):
+        before = previous.get((row['name'], row['size']))
+        if not before or before['seconds'] <= 0:
+            continue
+        ratio = row['seconds'] / before['seconds']
+        rows.append({
+            'name': row['name'],
+            'size': row['size'],
+            'before': before['seconds'],
+            'after': row['seconds'],
+            'ratio': ratio,
+            'regression': ratio > 1 + tolerance
+        })
+    return rows
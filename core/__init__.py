@@ -1,3 +1,12 @@
 from .detector import TokopediaFakeDetector
+from .result import AnalysisResult
+from .batch import BatchAnalyzer
+from .sampling import SamplingPlanner, SamplePlan, PageRequest
+from .sellers import SellerRanker, ShopCache
+from .trust_index import TrustIndex, TrustRecord
+from .result_store import ResultStore
+from .shop_sweep import ShopSweep, ShopReport
 
-__all__ = ["TokopediaFakeDetector"]
+__all__ = ["TokopediaFakeDetector", "AnalysisResult", "BatchAnalyzer", "SamplingPlanner", "SamplePlan", "PageRequest",
+           "SellerRanker", "ShopCache", "TrustIndex", "TrustRecord", "ResultStore",
+           "ShopSweep", "ShopReport"]
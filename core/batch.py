@@ -0,0 +1,66 @@
+import asyncio
+from typing import Callable, Dict, List, Optional
+
+from ..api import AsyncAPIFetcher
+from .result import AnalysisResult
+
+class BatchAnalyzer:
+    def __init__(self, detector, workers: int = 4, max_pages: int = 5, find_sellers: bool = False):
+        self.detector = detector
+        self.workers = workers
+        self.max_pages = max_pages
+        self.find_sellers = find_sellers
+    
+    def analyze(self, urls: List[str], on_result: Optional[Callable[[AnalysisResult], None]] = None) -> List[AnalysisResult]:
+        return asyncio.run(self.analyze_async(urls, on_result))
+    
+    async def analyze_async(self, urls: List[str],
+                            on_result: Optional[Callable[[AnalysisResult], None]] = None) -> List[AnalysisResult]:
+        semaphore = asyncio.Semaphore(self.workers)
+        
+        async with AsyncAPIFetcher(self.detector.endpoint, concurrency=self.workers,
+                                   scheduler=self.detector.scheduler, cache=self.detector.cache,
+                                   fixtures=self.detector.fixtures) as api:
+            async def worker(url: str) -> AnalysisResult:
+                async with semaphore:
+                    try:
+                        result = await self.detector.analyze_async(url, api, self.max_pages, self.find_sellers)
+                    except Exception as e:
+                        result = AnalysisResult(url, status='error', error=str(e))
+                if on_result:
+                    on_result(result)
+                return result
+            
+            results = await asyncio.gather(*(worker(url) for url in urls))
+        
+        await asyncio.to_thread(self.detector.refresh_rings, results)
+        return results
+    
+    @staticmethod
+    def sort_by_score(results: List[AnalysisResult]) -> List[AnalysisResult]:
+        return sorted(results, key=lambda result: result.fake_score if result.fake_score is not None else -1, reverse=True)
+    
+    @staticmethod
+    def summarize(results: List[AnalysisResult]) -> List[Dict]:
+        return [{
+            'product_url': result.product_url,
+            'product_name': result.product_name,
+            'status': result.status,
+            'fake_score': result.fake_score,
+            'confidence': result.confidence,
+            'review_count': result.review_count,
+            'error': result.error
+        } for result in BatchAnalyzer.sort_by_score(results)]
+    
+    @staticmethod
+    def load_urls(path: str) -> List[str]:
+        urls = []
+        with open(path, encoding='utf-8') as handle:
+            for number, line in enumerate(handle, 1):
+                url = line.strip()
+                if not url or url.startswith('#'):
+                    continue
+                if not url.startswith("https://www.tokopedia.com/"):
+                    raise ValueError(f"{path}:{number}: expected a https://www.tokopedia.com/ product URL")
+                urls.append(url)
+        return urls
@@ -1,21 +1,49 @@
-import time
-import random
-from typing import List, Dict, Optional
+import asyncio
+from typing import Callable, List, Dict, Optional, Tuple
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
-from ..api import APIFetcher
+from ..api import APIFetcher, AsyncAPIFetcher, ResponseCache, FixtureArchive, RequestScheduler, FetchError, GRAPHQL_ENDPOINT
 from ..analysis import (
     PatternAnalyzer, BuyerAnalyzer, RatingAnalyzer,
-    TimeAnalyzer, VariantAnalyzer, TrustAnalyzer, FakeScorer
+    TimeAnalyzer, VariantAnalyzer, TrustAnalyzer, FakeScorer,
+    StreamingAnalysis, ReviewerGraph
 )
+from ..utils import parse_timestamp
+from ..metrics import Trace, MetricsRegistry, NULL_TRACE, current_trace, use_trace
 from ..ui import DisplayManager
+from .result import AnalysisResult
+from .sampling import SamplingPlanner, SamplePlan, PageRequest, estimate_confidence, INFORMATIVE, RECENT
+from .sellers import SellerRanker, ShopCache
+from .trust_index import TrustIndex
+from .result_store import ResultStore
+
+StageCallback = Callable[[str], None]
 
 class TokopediaFakeDetector:
-    def __init__(self):
-        self.console = Console()
-        self.api = APIFetcher()
-        self.display = DisplayManager(self.console)
+    def __init__(self, endpoint: str = GRAPHQL_ENDPOINT, concurrency: int = 4,
+                 cache: Optional[ResponseCache] = None, console: Optional[Console] = None,
+                 trace: bool = False, metrics: Optional[MetricsRegistry] = None,
+                 planner: Optional[SamplingPlanner] = None, shop_cache: Optional[ShopCache] = None,
+                 trust_index: Optional[TrustIndex] = None, fixtures: Optional[FixtureArchive] = None,
+                 scheduler: Optional[RequestScheduler] = None, result_store: Optional[ResultStore] = None,
+                 reviewer_graph: Optional[ReviewerGraph] = None):
+        self.endpoint = endpoint
+        self.concurrency = concurrency
+        self.cache = cache
+        self.trace = trace
+        self.metrics = metrics
+        self.planner = planner or SamplingPlanner()
+        self.fixtures = fixtures
+        self.scheduler = scheduler or RequestScheduler()
+        self.api = APIFetcher(endpoint, cache=cache, fixtures=fixtures, scheduler=self.scheduler)
+        self.trust_index = trust_index
+        self.result_store = result_store
+        self.reviewer_graph = reviewer_graph
+        self.sellers = SellerRanker(shop_cache, index=trust_index,
+                                    refresh_api=APIFetcher(endpoint, fixtures=fixtures, scheduler=self.scheduler) if trust_index is not None else None)
+        self._console = console
+        self._display = None
         self.pattern_analyzer = PatternAnalyzer()
         self.buyer_analyzer = BuyerAnalyzer()
         self.rating_analyzer = RatingAnalyzer()
@@ -26,85 +54,334 @@ class TokopediaFakeDetector:
         self.fake_indicators = {}
         self.trusted_sellers = []
     
-    def run(self, product_url: str):
-        with Progress(
+    @property
+    def console(self) -> Console:
+        if self._console is None:
+            self._console = Console()
+        return self._console
+    
+    @property
+    def display(self) -> DisplayManager:
+        if self._display is None:
+            self._display = DisplayManager(self.console)
+        return self._display
+    
+    def _new_trace(self):
+        if not self.trace and self.metrics is None:
+            return NULL_TRACE
+        return Trace(hooks=[self.metrics] if self.metrics is not None else None)
+    
+    def analyze(self, product_url: str, max_pages: int = 5, find_sellers: bool = True,
+                on_stage: Optional[StageCallback] = None, incremental: bool = True, save: bool = True) -> AnalysisResult:
+        trace = self._new_trace()
+        with use_trace(trace):
+            with trace.span("total"):
+                result = self._analyze(product_url, max_pages, find_sellers, on_stage or (lambda description: None),
+                                       incremental, save)
+        result.trace = trace.to_dict()
+        return result
+    
+    def _analyze(self, product_url: str, max_pages: int, find_sellers: bool,
+                 on_stage: StageCallback, incremental: bool = True, save: bool = True) -> AnalysisResult:
+        result = AnalysisResult(product_url)
+        known, since = self._known_reviews(product_url) if incremental else ([], 0.0)
+        
+        on_stage("Fetching product, rating and review data...")
+        try:
+            product_info, rating_topics, first_page = self.api.fetch_product_bundle(
+                product_url, sort_by=RECENT if known else INFORMATIVE
+            )
+        except FetchError as e:
+            return self._fetch_failed(result, e)
+        if not self._has_product(result, product_info, rating_topics):
+            return result
+        
+        stream = self._new_stream(rating_topics, known)
+        plan = self.planner.plan(rating_topics, max_pages)
+        if known:
+            plan = self._recent_plan(plan)
+            page = 1
+            while self._consume_recent(stream, first_page, since) and page < max_pages:
+                page += 1
+                plan.pages.append(PageRequest(page, RECENT))
+                on_stage("Fetching new reviews...")
+                first_page = self.api.fetch_reviews(product_url, page=page, sort_by=RECENT)
+        elif self._consume_page(stream, first_page) and plan.pages:
+            on_stage("Fetching remaining review pages...")
+            fetched = 0
+            for wave in self._waves(plan):
+                fetched += len(wave)
+                if not self._consume_sample(stream, self.api.fetch_review_sample(product_url, wave, plan.limit), plan):
+                    break
+            del plan.pages[fetched:]
+        
+        on_stage("Calculating fake score...")
+        scored = self._score(result, stream, plan)
+        self._save(result, stream, known, save)
+        if not scored:
+            return result
+        
+        if find_sellers and result.fake_score > 30:
+            on_stage("Searching for trusted sellers...")
+            with current_trace().span("sellers"):
+                result.trusted_sellers = self.find_trusted_sellers(result.product_name, self._current_shop(product_url))
+        
+        return result
+    
+    async def analyze_async(self, product_url: str, api: Optional[AsyncAPIFetcher] = None, max_pages: int = 5,
+                            find_sellers: bool = True, on_stage: Optional[StageCallback] = None,
+                            incremental: bool = True, save: bool = True) -> AnalysisResult:
+        if api is None:
+            async with self._async_api() as api:
+                return await self.analyze_async(product_url, api, max_pages, find_sellers, on_stage, incremental, save)
+        
+        trace = self._new_trace()
+        with use_trace(trace):
+            with trace.span("total"):
+                result = await self._analyze_async(product_url, api, max_pages, find_sellers,
+                                                   on_stage or (lambda description: None), incremental, save)
+        result.trace = trace.to_dict()
+        return result
+    
+    async def _analyze_async(self, product_url: str, api: AsyncAPIFetcher, max_pages: int,
+                             find_sellers: bool, on_stage: StageCallback, incremental: bool = True,
+                             save: bool = True) -> AnalysisResult:
+        result = AnalysisResult(product_url)
+        known, since = await asyncio.to_thread(self._known_reviews, product_url) if incremental else ([], 0.0)
+        
+        on_stage("Fetching product, rating and review data...")
+        try:
+            product_info, rating_topics, first_page = await api.fetch_product_bundle(
+                product_url, sort_by=RECENT if known else INFORMATIVE
+            )
+        except FetchError as e:
+            return self._fetch_failed(result, e)
+        if not self._has_product(result, product_info, rating_topics):
+            return result
+        
+        stream = self._new_stream(rating_topics, known)
+        plan = self.planner.plan(rating_topics, max_pages)
+        if known:
+            plan = self._recent_plan(plan)
+            page = 1
+            while self._consume_recent(stream, first_page, since) and page < max_pages:
+                page += 1
+                plan.pages.append(PageRequest(page, RECENT))
+                on_stage("Fetching new reviews...")
+                first_page = await api.fetch_reviews(product_url, page=page, sort_by=RECENT)
+        elif self._consume_page(stream, first_page) and plan.pages:
+            on_stage("Fetching remaining review pages...")
+            fetched = 0
+            for wave in self._waves(plan):
+                fetched += len(wave)
+                if not self._consume_sample(stream, await api.fetch_review_sample(product_url, wave, plan.limit), plan):
+                    break
+            del plan.pages[fetched:]
+        
+        on_stage("Calculating fake score...")
+        scored = self._score(result, stream, plan)
+        await asyncio.to_thread(self._save, result, stream, known, save)
+        if not scored:
+            return result
+        
+        if find_sellers and result.fake_score > 30:
+            on_stage("Searching for trusted sellers...")
+            with current_trace().span("sellers"):
+                result.trusted_sellers = await self.find_trusted_sellers_async(
+                    result.product_name, self._current_shop(product_url), api
+                )
+        
+        return result
+    
+    @staticmethod
+    def _fetch_failed(result: AnalysisResult, error: FetchError) -> AnalysisResult:
+        result.status = 'rate_limited' if error.throttled else 'fetch_failed'
+        result.error = str(error)
+        return result
+    
+    @staticmethod
+    def _has_product(result: AnalysisResult, product_info: Optional[Dict], rating_topics: Optional[Dict]) -> bool:
+        result.product_info = product_info
+        result.rating_topics = rating_topics
+        if not product_info or not product_info.get('product'):
+            result.status = 'not_found'
+            return False
+        return True
+    
+    def _score(self, result: AnalysisResult, stream: StreamingAnalysis, plan: SamplePlan) -> bool:
+        result.review_count = stream.review_count
+        result.sample = dict(plan.to_dict(), reviews=stream.review_count)
+        if not stream.review_count:
+            result.status = 'no_reviews'
+            return False
+        
+        analysis = stream.final()
+        result.review_patterns = analysis['patterns']
+        result.suspicious_buyers = analysis['buyers']
+        result.rating_anomalies = analysis['ratings']
+        result.time_patterns = analysis['time_data']
+        result.variants = analysis['variants']
+        if self.reviewer_graph is not None:
+            with current_trace().span("graph", reviews=result.review_count):
+                self.reviewer_graph.add_reviews(result.product_url, self._current_shop(result.product_url) or '', stream.all_reviews())
+                result.rings = self.reviewer_graph.ring_signal(result.product_url)
+        with current_trace().span("score", reviews=result.review_count):
+            result.fake_score, result.score_rules = self.scorer.evaluate(result.review_patterns, result.suspicious_buyers,
+                                                                         result.rating_anomalies, result.time_patterns,
+                                                                         result.rating_topics, result.variants, result.rings)
+        result.confidence = estimate_confidence(analysis, stream.review_count, plan.population)
+        return True
+    
+    @staticmethod
+    def _current_shop(product_url: str) -> Optional[str]:
+        return product_url.split('/')[3] if len(product_url.split('/')) > 3 else None
+    
+    @staticmethod
+    def _consume_page(stream: StreamingAnalysis, review_data: Optional[Dict]) -> bool:
+        if not review_data or not review_data.get('list'):
+            return False
+        analysis = stream.feed_page(review_data['list'])
+        return bool(review_data.get('hasNext')) and not stream.is_saturated(analysis)
+    
+    @staticmethod
+    def _consume_recent(stream: StreamingAnalysis, review_data: Optional[Dict], since: float) -> bool:
+        if not review_data or not review_data.get('list'):
+            return False
+        reviews = review_data['list']
+        before = stream.review_count
+        stream.feed_page(reviews)
+        if stream.review_count - before < len(reviews):
+            return False
+        return bool(review_data.get('hasNext')) and all(
+            parse_timestamp(review.get('reviewCreateTimestamp', 0)) > since for review in reviews
+        )
+    
+    def _known_reviews(self, product_url: str) -> Tuple[List[Dict], float]:
+        if self.result_store is None:
+            return [], 0.0
+        with current_trace().span("store:load") as stage:
+            reviews = self.result_store.reviews(product_url)
+            stage.reviews = len(reviews)
+        return reviews, (self.result_store.latest_review(product_url) or 0) if reviews else 0.0
+    
+    @staticmethod
+    def _recent_plan(plan: SamplePlan) -> SamplePlan:
+        return SamplePlan(plan.population, plan.target, limit=plan.limit)
+    
+    def _new_stream(self, rating_topics: Optional[Dict], known: List[Dict]) -> StreamingAnalysis:
+        stream = StreamingAnalysis(rating_topics, keep_reviews=self.result_store is not None or self.reviewer_graph is not None)
+        if known:
+            stream.restore(known)
+        return stream
+    
+    def _save(self, result: AnalysisResult, stream: StreamingAnalysis, known: List[Dict], save: bool = True):
+        if self.result_store is None or not save:
+            return
+        result.sample['stored'] = len(known)
+        result.sample['new'] = len(stream.reviews)
+        with current_trace().span("store:save", reviews=len(stream.reviews)):
+            self.result_store.save(result, stream.reviews)
+    
+    @staticmethod
+    def _waves(plan: SamplePlan) -> List[List[PageRequest]]:
+        return [wave for wave in (plan.pages[:1], plan.pages[1:]) if wave]
+    
+    def _consume_sample(self, stream: StreamingAnalysis, pages: List[Optional[Dict]], plan: SamplePlan) -> bool:
+        for review_data in pages:
+            if not self._consume_page(stream, review_data) and (plan.census or stream.is_saturated()):
+                return False
+        return True
+    
+    def _progress(self) -> Progress:
+        return Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
             console=self.console,
             transient=True,
             refresh_per_second=10,
-        ) as progress:
-            
+        )
+    
+    def render(self, result: AnalysisResult):
+        self.display.display_analysis(result)
+        if result.trace:
+            self.display.display_trace(result.trace)
+    
+    def run(self, product_url: str) -> AnalysisResult:
+        with self._progress() as progress:
+            task = progress.add_task("[cyan]Fetching product information...", total=None)
+            result = self.analyze(product_url, on_stage=lambda description: progress.update(task, description=f"[cyan]{description}"))
+        
+        self.render(result)
+        if result.ok:
+            self.fake_indicators = result.indicators()
+        return result
+    
+    async def run_async(self, product_url: str, max_pages: int = 5) -> AnalysisResult:
+        with self._progress() as progress:
+            task = progress.add_task("[cyan]Fetching product information...", total=None)
+            result = await self.analyze_async(
+                product_url, max_pages=max_pages,
+                on_stage=lambda description: progress.update(task, description=f"[cyan]{description}")
+            )
+        
+        self.render(result)
+        if result.ok:
+            self.fake_indicators = result.indicators()
+        return result
+    
+    def quick_analyze(self, product_url: str) -> AnalysisResult:
+        with self._progress() as progress:
             task = progress.add_task("[cyan]Fetching product information...", total=None)
-            product_info = self.api.fetch_product_info(product_url)
-            
-            if not product_info or not product_info.get('product'):
-                progress.stop()
-                self.console.print("[red]Failed to fetch product information[/red]")
-                return
-            
-            progress.update(task, description="[cyan]Fetching comprehensive rating data...")
-            rating_topics = self.api.fetch_rating_and_topics(product_url)
-            
-            all_reviews = []
-            variant_data = None
-            for page in range(1, 6):
-                progress.update(task, description=f"[cyan]Fetching reviews (page {page})...")
-                review_data = self.api.fetch_reviews(product_url, page=page, limit=20)
+            result = self.analyze(product_url, max_pages=2, find_sellers=False, save=False,
+                                  on_stage=lambda description: progress.update(task, description=f"[cyan]{description}"))
+        
+        self.render(result)
+        return result
+    
+    def index_shop(self, shop_id: str, max_products: int = 50) -> int:
+        if self.reviewer_graph is None:
+            return 0
+        urls = self._catalog_urls(self.api.fetch_shop_catalog(shop_id, max_products=max_products))
+        return self._index_pages(urls, self.api.fetch_first_review_pages(urls, sort_by=RECENT) if urls else [])
+    
+    async def index_shop_async(self, shop_id: str, max_products: int = 50,
+                               api: Optional[AsyncAPIFetcher] = None) -> int:
+        if api is None:
+            async with self._async_api() as api:
+                return await self.index_shop_async(shop_id, max_products, api)
+        if self.reviewer_graph is None:
+            return 0
+        urls = self._catalog_urls(await api.fetch_shop_catalog(shop_id, max_products=max_products))
+        return self._index_pages(urls, await api.fetch_first_review_pages(urls, sort_by=RECENT) if urls else [])
+    
+    def refresh_rings(self, results: List[AnalysisResult]):
+        if self.reviewer_graph is None:
+            return
+        scored = [result for result in results if result.ok]
+        if not scored:
+            return
+        for result in scored:
+            result.rings = self.reviewer_graph.ring_signal(result.product_url)
+        batch = self.scorer.score_batch(self.scorer.feature_matrix(result.indicators() for result in scored))
+        for index, result in enumerate(scored):
+            result.fake_score = float(batch.scores[index])
+            result.score_rules = batch.fired_rules(index)
+            if self.result_store is not None:
+                self.result_store.rescore(result)
+    
+    @staticmethod
+    def _catalog_urls(products: List[Dict]) -> List[str]:
+        return [product['product_url'] for product in products
+                if product.get('product_url') and (product.get('stats') or {}).get('reviewCount', 1)]
+    
+    def _index_pages(self, urls: List[str], pages: List[Optional[Dict]]) -> int:
+        added = 0
+        with current_trace().span("graph") as stage:
+            for url, review_data in zip(urls, pages):
                 if review_data and review_data.get('list'):
-                    all_reviews.extend(review_data['list'])
-                    if not variant_data and review_data.get('variantFilter'):
-                        variant_data = review_data['variantFilter']
-                    if not review_data.get('hasNext'):
-                        break
-                else:
-                    break
-            
-            if not all_reviews:
-                progress.stop()
-                self.console.print("[yellow]No reviews found for this product[/yellow]")
-                return
-            
-            progress.update(task, description="[cyan]Analyzing review patterns...")
-            patterns = self.pattern_analyzer.analyze(all_reviews)
-            
-            progress.update(task, description="[cyan]Analyzing buyer behavior...")
-            buyers = self.buyer_analyzer.analyze(all_reviews)
-            
-            progress.update(task, description="[cyan]Analyzing rating distribution...")
-            ratings = self.rating_analyzer.analyze(all_reviews)
-            
-            progress.update(task, description="[cyan]Analyzing time patterns...")
-            time_data = self.time_analyzer.analyze(all_reviews)
-            
-            progress.update(task, description="[cyan]Analyzing variant patterns...")
-            variants = self.variant_analyzer.analyze(all_reviews)
-            
-            progress.update(task, description="[cyan]Calculating fake score...")
-            fake_score = self.scorer.calculate(patterns, buyers, ratings, time_data, rating_topics, variants)
-            
-            trusted_sellers = []
-            if fake_score > 30:
-                progress.update(task, description="[cyan]Searching for trusted sellers...")
-                product_name = product_info['product'].get('name', '')
-                shop_url = product_url.split('/')[3] if len(product_url.split('/')) > 3 else None
-                trusted_sellers = self.find_trusted_sellers(product_name, shop_url)
-        
-        self.display.display_results(product_info, fake_score, patterns, buyers, ratings, time_data, rating_topics, variants)
-        
-        if trusted_sellers:
-            self.display.display_trusted_sellers(trusted_sellers)
-        
-        self.fake_indicators = {
-            'review_patterns': patterns,
-            'suspicious_buyers': buyers,
-            'rating_anomalies': ratings,
-            'time_patterns': time_data,
-            'rating_topics': rating_topics,
-            'variants': variants,
-            'fake_score': fake_score,
-            'trusted_sellers': trusted_sellers if fake_score > 30 else []
-        }
+                    added += self.reviewer_graph.add_reviews(url, self._current_shop(url) or '', review_data['list'])
+            stage.reviews = added
+        return added
     
     def find_trusted_sellers(self, product_name: str, current_shop: Optional[str] = None) -> List[Dict]:
         query = ' '.join(product_name.split()[:5])
@@ -114,86 +391,23 @@ class TokopediaFakeDetector:
         if not search_results or not search_results.get('data'):
             return []
         
-        products = search_results['data'].get('products', [])
-        shop_scores = []
-        
-        for product in products[:10]:
-            if not product.get('shop'):
-                continue
-            
-            shop = product['shop']
-            shop_domain = shop.get('url', '').split('/')[-1]
-            
-            if shop_domain and shop_domain != current_shop:
-                shop_detail = self.api.fetch_shop_detail(shop_domain)
-                
-                if shop_detail:
-                    shop_id = str(shop_detail.get('shopCore', {}).get('shopID', ''))
-                    shop_rating = None
-                    
-                    if shop_id:
-                        shop_rating = self.api.fetch_shop_rating(shop_id)
-                    
-                    trust_analysis = self.trust_analyzer.analyze(shop_detail, shop_rating)
-                    
-                    shop_scores.append({
-                        'shop_name': shop.get('name', ''),
-                        'shop_domain': shop_domain,
-                        'shop_tier': shop.get('tier', 0),
-                        'product_name': product.get('name', ''),
-                        'product_url': product.get('url', ''),
-                        'product_price': product.get('price', {}).get('text', ''),
-                        'product_rating': product.get('rating', 0),
-                        'trust_analysis': trust_analysis
-                    })
-                
-                time.sleep(random.uniform(0.3, 0.8))
-        
-        shop_scores.sort(key=lambda x: x['trust_analysis']['trust_score'], reverse=True)
-        
-        return shop_scores[:5]
-    
-    def quick_analyze(self, product_url: str):
-        with Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            console=self.console,
-            transient=True,
-            refresh_per_second=10,
-        ) as progress:
-            task = progress.add_task("[cyan]Fetching product information...", total=None)
-            product_info = self.api.fetch_product_info(product_url)
-            
-            if not product_info or not product_info.get('product'):
-                progress.stop()
-                self.console.print("[red]Failed to fetch product information[/red]")
-                return
-            
-            progress.update(task, description="[cyan]Analyzing reviews...")
-            rating_topics = self.api.fetch_rating_and_topics(product_url)
-            
-            all_reviews = []
-            for page in range(1, 3):
-                progress.update(task, description=f"[cyan]Fetching reviews (page {page})...")
-                review_data = self.api.fetch_reviews(product_url, page=page, limit=20)
-                if review_data and review_data.get('list'):
-                    all_reviews.extend(review_data['list'])
-                    if not review_data.get('hasNext'):
-                        break
-                else:
-                    break
-            
-            if not all_reviews:
-                progress.stop()
-                self.console.print("[yellow]No reviews found[/yellow]")
-                return
-            
-            progress.update(task, description="[cyan]Analyzing patterns...")
-            patterns = self.pattern_analyzer.analyze(all_reviews)
-            buyers = self.buyer_analyzer.analyze(all_reviews)
-            ratings = self.rating_analyzer.analyze(all_reviews)
-            time_data = self.time_analyzer.analyze(all_reviews)
-            variants = self.variant_analyzer.analyze(all_reviews)
-            fake_score = self.scorer.calculate(patterns, buyers, ratings, time_data, rating_topics, variants)
-        
-        self.display.display_results(product_info, fake_score, patterns, buyers, ratings, time_data, rating_topics, variants)
+        return self.sellers.rank(self.api, self.sellers.candidates(search_results, current_shop))
+    
+    async def find_trusted_sellers_async(self, product_name: str, current_shop: Optional[str] = None,
+                                         api: Optional[AsyncAPIFetcher] = None) -> List[Dict]:
+        if api is None:
+            async with self._async_api() as api:
+                return await self.find_trusted_sellers_async(product_name, current_shop, api)
+        
+        query = ' '.join(product_name.split()[:5])
+        
+        search_results = await api.search_products(query, page=1, rows=20)
+        
+        if not search_results or not search_results.get('data'):
+            return []
+        
+        return await self.sellers.rank_async(api, self.sellers.candidates(search_results, current_shop))
+    
+    def _async_api(self) -> AsyncAPIFetcher:
+        return AsyncAPIFetcher(self.endpoint, concurrency=self.concurrency, cache=self.cache,
+                               fixtures=self.fixtures, scheduler=self.scheduler)
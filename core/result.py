@@ -0,0 +1,55 @@
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional
+
+FAILED_STATUSES = ('error', 'fetch_failed', 'rate_limited')
+
+@dataclass
+class AnalysisResult:
+    product_url: str
+    status: str = 'ok'
+    product_info: Optional[Dict] = None
+    rating_topics: Optional[Dict] = None
+    review_patterns: Dict = field(default_factory=dict)
+    suspicious_buyers: Dict = field(default_factory=dict)
+    rating_anomalies: Dict = field(default_factory=dict)
+    time_patterns: Dict = field(default_factory=dict)
+    variants: Dict = field(default_factory=dict)
+    fake_score: Optional[float] = None
+    review_count: int = 0
+    trusted_sellers: List[Dict] = field(default_factory=list)
+    error: Optional[str] = None
+    confidence: Optional[float] = None
+    sample: Dict = field(default_factory=dict)
+    rings: Dict = field(default_factory=dict)
+    score_rules: List[str] = field(default_factory=list)
+    trace: List[Dict] = field(default_factory=list)
+    
+    @property
+    def ok(self) -> bool:
+        return self.status == 'ok'
+    
+    @property
+    def failed(self) -> bool:
+        return self.status in FAILED_STATUSES
+    
+    @property
+    def product_name(self) -> str:
+        product = (self.product_info or {}).get('product') or {}
+        return product.get('name', '')
+    
+    def indicators(self) -> Dict[str, Any]:
+        return {
+            'review_patterns': self.review_patterns,
+            'suspicious_buyers': self.suspicious_buyers,
+            'rating_anomalies': self.rating_anomalies,
+            'time_patterns': self.time_patterns,
+            'rating_topics': self.rating_topics,
+            'variants': self.variants,
+            'rings': self.rings,
+            'fake_score': self.fake_score,
+            'score_rules': self.score_rules,
+            'trusted_sellers': self.trusted_sellers
+        }
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
@@ -0,0 +1,130 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+from ..utils import parse_timestamp, review_key
+from .result import AnalysisResult
+
+DEFAULT_RESULT_STORE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "tokped_detector", "results.sqlite3")
+
+class ResultStore:
+    def __init__(self, path: str = DEFAULT_RESULT_STORE_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS products ("
+            "url TEXT PRIMARY KEY, result TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS reviews ("
+            "url TEXT NOT NULL, review_id TEXT NOT NULL, created_at INTEGER NOT NULL, review TEXT NOT NULL, "
+            "PRIMARY KEY (url, review_id))"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS scores ("
+            "url TEXT NOT NULL, analyzed_at REAL NOT NULL, fake_score REAL, review_count INTEGER NOT NULL, "
+            "confidence REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS scores_url ON scores (url, analyzed_at)")
+        self._conn.commit()
+    
+    @staticmethod
+    def key(product_url: str) -> str:
+        return product_url.split('?')[0].rstrip('/')
+    
+    def reviews(self, product_url: str) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT review FROM reviews WHERE url = ? ORDER BY rowid", (self.key(product_url),)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+    
+    def result(self, product_url: str) -> Optional[AnalysisResult]:
+        with self._lock:
+            row = self._conn.execute("SELECT result FROM products WHERE url = ?", (self.key(product_url),)).fetchone()
+        return AnalysisResult(**json.loads(row[0])) if row else None
+    
+    def updated_at(self, product_url: str) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute("SELECT updated_at FROM products WHERE url = ?", (self.key(product_url),)).fetchone()
+        return row[0] if row else None
+    
+    def latest_review(self, product_url: str) -> Optional[int]:
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(created_at) FROM reviews WHERE url = ?", (self.key(product_url),)).fetchone()
+        return row[0] if row else None
+    
+    def save(self, result: AnalysisResult, reviews: List[Dict]):
+        url = self.key(result.product_url)
+        now = time.time()
+        payload = dict(result.to_dict(), trace=[])
+        rows = [(url, review_key(review), parse_timestamp(review.get('reviewCreateTimestamp', 0)),
+                 json.dumps(review, ensure_ascii=False, separators=(",", ":")))
+                for review in reviews]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO reviews (url, review_id, created_at, review) VALUES (?, ?, ?, ?)", rows
+            )
+            if result.ok:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO products (url, result, updated_at) VALUES (?, ?, ?)",
+                    (url, json.dumps(payload, ensure_ascii=False, separators=(",", ":")), now)
+                )
+                self._conn.execute(
+                    "INSERT INTO scores (url, analyzed_at, fake_score, review_count, confidence) VALUES (?, ?, ?, ?, ?)",
+                    (url, now, result.fake_score, result.review_count, result.confidence)
+                )
+            self._conn.commit()
+    
+    def rescore(self, result: AnalysisResult):
+        url = self.key(result.product_url)
+        payload = dict(result.to_dict(), trace=[])
+        with self._lock:
+            updated = self._conn.execute(
+                "UPDATE products SET result = ? WHERE url = ?",
+                (json.dumps(payload, ensure_ascii=False, separators=(",", ":")), url)
+            ).rowcount
+            if updated:
+                self._conn.execute(
+                    "UPDATE scores SET fake_score = ? WHERE rowid = (SELECT MAX(rowid) FROM scores WHERE url = ?)",
+                    (result.fake_score, url)
+                )
+            self._conn.commit()
+    
+    def history(self, product_url: str) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT analyzed_at, fake_score, review_count, confidence FROM scores WHERE url = ? ORDER BY analyzed_at",
+                (self.key(product_url),)
+            ).fetchall()
+        return [{'analyzed_at': row[0], 'fake_score': row[1], 'review_count': row[2], 'confidence': row[3]}
+                for row in rows]
+    
+    def urls(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT url FROM products ORDER BY updated_at")]
+    
+    def forget(self, product_url: str):
+        url = self.key(product_url)
+        with self._lock:
+            for table in ("products", "reviews", "scores"):
+                self._conn.execute(f"DELETE FROM {table} WHERE url = ?", (url,))
+            self._conn.commit()
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            products = self._conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+            reviews = self._conn.execute("SELECT COUNT(*) FROM reviews").fetchone()[0]
+        return {'products': products, 'reviews': reviews}
+    
+    def close(self):
+        with self._lock:
+            self._conn.close()
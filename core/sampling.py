@@ -0,0 +1,129 @@
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+INFORMATIVE = "informative_score desc"
+RECENT = "create_time desc"
+
+class PageRequest(NamedTuple):
+    page: int
+    sort_by: str = INFORMATIVE
+    filter_by: str = ""
+
+@dataclass
+class SamplePlan:
+    population: int
+    target: int
+    pages: List[PageRequest] = field(default_factory=list)
+    census: bool = False
+    limit: int = 20
+    
+    @property
+    def requests(self) -> int:
+        return len(self.pages) + 1
+    
+    def to_dict(self) -> Dict:
+        return {
+            'population': self.population,
+            'target': self.target,
+            'census': self.census,
+            'requests': self.requests,
+            'pages': [page._asdict() for page in self.pages]
+        }
+
+class SamplingPlanner:
+    def __init__(self, margin: float = 0.1, z: float = 1.96, limit: int = 20):
+        self.margin = margin
+        self.z = z
+        self.limit = limit
+    
+    @staticmethod
+    def population(rating_topics: Optional[Dict]) -> int:
+        return ((rating_topics or {}).get('rating') or {}).get('totalRating', 0) or 0
+    
+    @staticmethod
+    def strata(rating_topics: Optional[Dict]) -> Dict[int, int]:
+        detail = ((rating_topics or {}).get('rating') or {}).get('detail') or []
+        return {d['rate']: d.get('totalReviews', 0) for d in detail if d.get('rate') and d.get('totalReviews', 0) > 0}
+    
+    def sample_size(self, population: int) -> int:
+        base = (self.z ** 2) * 0.25 / (self.margin ** 2)
+        if population <= 0:
+            return math.ceil(base)
+        return min(population, math.ceil(base / (1 + (base - 1) / population)))
+    
+    def plan(self, rating_topics: Optional[Dict], max_pages: int = 5) -> SamplePlan:
+        population = self.population(rating_topics)
+        target = self.sample_size(population)
+        budget = max(1, min(max_pages, math.ceil(target / self.limit)))
+        
+        if not population:
+            return SamplePlan(population, target, [PageRequest(page) for page in range(2, max_pages + 1)], limit=self.limit)
+        
+        total_pages = math.ceil(population / self.limit)
+        if total_pages <= budget:
+            return SamplePlan(population, target, [PageRequest(page) for page in range(2, total_pages + 1)],
+                              census=True, limit=self.limit)
+        
+        pages = []
+        for rate, (count, allocated) in self._allocate(self.strata(rating_topics), budget - 1).items():
+            pages.extend(PageRequest(page, RECENT, f"rating={rate}") for page in self._stride(count, allocated))
+        return SamplePlan(population, target, pages, limit=self.limit)
+    
+    @staticmethod
+    def _allocate(strata: Dict[int, int], pages: int) -> Dict[int, Tuple[int, int]]:
+        total = sum(strata.values())
+        if pages <= 0 or total <= 0:
+            return {}
+        
+        shares = {rate: count * pages / total for rate, count in strata.items()}
+        allocation = {rate: int(share) for rate, share in shares.items()}
+        remaining = pages - sum(allocation.values())
+        for rate in sorted(shares, key=lambda rate: (allocation[rate] - shares[rate], -rate))[:remaining]:
+            allocation[rate] += 1
+        return {rate: (strata[rate], allocated) for rate, allocated in sorted(allocation.items(), reverse=True) if allocated}
+    
+    def _stride(self, count: int, allocated: int) -> List[int]:
+        stratum_pages = max(1, math.ceil(count / self.limit))
+        allocated = min(allocated, stratum_pages)
+        return sorted({1 + (index * stratum_pages) // allocated for index in range(allocated)})
+
+def _normal_cdf(value: float) -> float:
+    return 0.5 * (1 + math.erf(value / math.sqrt(2)))
+
+def _decision_confidence(proportion: float, thresholds: List[float], sample: int, population: int) -> float:
+    if sample <= 0:
+        return 0.0
+    if population and sample >= population:
+        return 1.0
+    
+    adjusted = (proportion * sample + 2) / (sample + 4)
+    correction = (population - sample) / (population - 1) if population > 1 else 1.0
+    error = math.sqrt(adjusted * (1 - adjusted) / (sample + 4) * correction)
+    if error <= 0:
+        return 1.0
+    distance = min(abs(proportion - threshold) for threshold in thresholds)
+    return _normal_cdf(distance / error)
+
+def estimate_confidence(analysis: Dict[str, Dict], sample: int, population: int) -> float:
+    buyers = analysis['buyers']
+    ratings = analysis['ratings']
+    time_data = analysis['time_data']
+    variants = analysis['variants']
+    
+    distribution = ratings.get('distribution') or {}
+    rated = sum(distribution.values())
+    variant_counts = (variants.get('variant_distribution') or {}).values()
+    
+    signals = [
+        (buyers['anonymous_percentage'] / 100, [0.3, 0.5], sample),
+        (buyers.get('verified_buyers', 0) / 100, [0.2], sample),
+        (time_data['night_reviews'] / 100, [0.3], sample),
+        (max(variant_counts, default=0) / sample if sample else 0, [0.8], sample),
+        (distribution.get(5, 0) / rated if rated else 0, [0.9], rated)
+    ]
+    
+    confidence = 1.0
+    for proportion, thresholds, size in signals:
+        confidence *= _decision_confidence(proportion, thresholds, size, population)
+    return confidence
@@ -0,0 +1,209 @@
+import time
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..analysis import TrustAnalyzer
+from ..metrics import current_trace
+from .trust_index import TrustIndex, TrustRecord
+
+class ShopCache:
+    def __init__(self, max_entries: int = 1024, ttl: float = 6 * 3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, kind: str, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get((kind, key))
+            if entry is None or entry[0] <= time.monotonic():
+                self.misses += 1
+                return None
+            self._entries.move_to_end((kind, key))
+            self.hits += 1
+            return entry[1]
+    
+    def set(self, kind: str, key: str, value: Any):
+        if value is None:
+            return
+        with self._lock:
+            self._entries[(kind, key)] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end((kind, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class SellerRanking:
+    def __init__(self, products: List[Dict], cache: ShopCache, top: int = 5, index: Optional[TrustIndex] = None):
+        self.products = products
+        self.cache = cache
+        self.top = top
+        self.index = index
+        self.details: Dict[str, Optional[Dict]] = {}
+        self.shop_ids: Dict[str, str] = {}
+        self.bounds: Dict[str, int] = {}
+        self.scores: Dict[str, Dict] = {}
+        self.stale: List[str] = []
+        self.unsaved: List[TrustRecord] = []
+        for product in products:
+            domain = SellerRanker.shop_domain(product)
+            record = index.get(domain) if index is not None else None
+            if record is not None:
+                self._add_record(record)
+                continue
+            detail = cache.get('detail', domain)
+            if detail is not None:
+                self._add_detail(domain, detail)
+    
+    def _add_record(self, record: TrustRecord):
+        self.details[record.domain] = record.detail
+        self.shop_ids[record.domain] = record.shop_id
+        self.scores[record.domain] = record.trust
+        if self.index.is_stale(record):
+            self.stale.append(record.domain)
+    
+    def missing_details(self) -> List[str]:
+        return [SellerRanker.shop_domain(product) for product in self.products
+                if SellerRanker.shop_domain(product) not in self.details]
+    
+    def add_details(self, domains: List[str], details: List[Optional[Dict]]):
+        for domain, detail in zip(domains, details):
+            self.cache.set('detail', domain, detail)
+            self._add_detail(domain, detail)
+    
+    def _add_detail(self, domain: str, detail: Optional[Dict]):
+        self.details[domain] = detail
+        if not detail:
+            return
+        shop_id = str(detail.get('shopCore', {}).get('shopID', ''))
+        self.shop_ids[domain] = shop_id
+        if not shop_id:
+            self._score(domain, None, persist=True)
+            return
+        rating = self.cache.get('rating', shop_id)
+        if rating is not None:
+            self._score(domain, rating)
+        else:
+            self.bounds[domain] = TrustAnalyzer.upper_bound(detail)
+    
+    def _score(self, domain: str, shop_rating: Optional[Dict], persist: bool = False):
+        with current_trace().span("analyze:trust"):
+            self.scores[domain] = TrustAnalyzer.analyze(self.details[domain], shop_rating)
+        self.bounds.pop(domain, None)
+        if persist and self.index is not None:
+            self.unsaved.append(self.index.make_record(domain, self.details[domain], shop_rating, self.scores[domain]))
+    
+    def save(self):
+        if self.unsaved and self.index is not None:
+            self.index.put_records(self.unsaved)
+        self.unsaved = []
+    
+    def next_wave(self) -> List[str]:
+        if not self.bounds:
+            return []
+        
+        best_pending = max(self.bounds.values())
+        settled = sum(1 for trust in self.scores.values() if trust['trust_score'] >= best_pending)
+        if settled >= self.top:
+            return []
+        
+        pending = sorted(self.bounds, key=lambda domain: self.bounds[domain], reverse=True)
+        return [self.shop_ids[domain] for domain in pending[:self.top - settled]]
+    
+    def add_ratings(self, shop_ids: List[str], ratings: List[Optional[Dict]]):
+        by_id = dict(zip(shop_ids, ratings))
+        for domain in list(self.bounds):
+            shop_id = self.shop_ids[domain]
+            if shop_id in by_id:
+                self.cache.set('rating', shop_id, by_id[shop_id])
+                self._score(domain, by_id[shop_id], persist=by_id[shop_id] is not None)
+    
+    def result(self) -> List[Dict]:
+        entries = []
+        for product in self.products:
+            domain = SellerRanker.shop_domain(product)
+            if domain in self.scores:
+                entries.append(SellerRanker.seller_entry(product, domain, self.scores[domain]))
+        entries.sort(key=lambda x: x['trust_analysis']['trust_score'], reverse=True)
+        return entries[:self.top]
+
+class SellerRanker:
+    def __init__(self, cache: Optional[ShopCache] = None, top: int = 5, max_candidates: int = 10,
+                 index: Optional[TrustIndex] = None, refresh_api=None):
+        self.cache = cache or ShopCache()
+        self.top = top
+        self.max_candidates = max_candidates
+        self.index = index
+        self.refresh_api = refresh_api
+    
+    @staticmethod
+    def shop_domain(product: Dict) -> str:
+        return product['shop'].get('url', '').split('/')[-1]
+    
+    @staticmethod
+    def seller_entry(product: Dict, shop_domain: str, trust_analysis: Dict) -> Dict:
+        shop = product['shop']
+        return {
+            'shop_name': shop.get('name', ''),
+            'shop_domain': shop_domain,
+            'shop_tier': shop.get('tier', 0),
+            'product_name': product.get('name', ''),
+            'product_url': product.get('url', ''),
+            'product_price': product.get('price', {}).get('text', ''),
+            'product_rating': product.get('rating', 0),
+            'trust_analysis': trust_analysis
+        }
+    
+    def candidates(self, search_results: Dict, current_shop: Optional[str]) -> List[Dict]:
+        products = []
+        seen = set()
+        for product in search_results['data'].get('products', []):
+            if not product.get('shop'):
+                continue
+            domain = self.shop_domain(product)
+            if not domain or domain == current_shop or domain in seen:
+                continue
+            seen.add(domain)
+            products.append(product)
+            if len(products) >= self.max_candidates:
+                break
+        return products
+    
+    def _schedule_refresh(self, ranking: SellerRanking):
+        if ranking.stale and self.index is not None and self.refresh_api is not None:
+            self.index.schedule_refresh(self.refresh_api, ranking.stale)
+    
+    def rank(self, api, products: List[Dict]) -> List[Dict]:
+        ranking = SellerRanking(products, self.cache, self.top, self.index)
+        missing = ranking.missing_details()
+        if missing:
+            ranking.add_details(missing, api.fetch_shop_detail(missing))
+        
+        wave = ranking.next_wave()
+        while wave:
+            ranking.add_ratings(wave, api.fetch_shop_rating(wave))
+            wave = ranking.next_wave()
+        ranking.save()
+        self._schedule_refresh(ranking)
+        return ranking.result()
+    
+    async def rank_async(self, api, products: List[Dict]) -> List[Dict]:
+        ranking = SellerRanking(products, self.cache, self.top, self.index)
+        missing = ranking.missing_details()
+        if missing:
+            ranking.add_details(missing, await api.fetch_shop_detail(missing))
+        
+        wave = ranking.next_wave()
+        while wave:
+            ranking.add_ratings(wave, await api.fetch_shop_rating(wave))
+            wave = ranking.next_wave()
+        await asyncio.to_thread(ranking.save)
+        self._schedule_refresh(ranking)
+        return ranking.result()
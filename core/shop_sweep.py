@@ -0,0 +1,145 @@
+import asyncio
+from dataclasses import dataclass, field, asdict
+from typing import Callable, Dict, List, Optional, Set
+
+from ..api import AsyncAPIFetcher
+from ..analysis import TrustAnalyzer
+from .result import AnalysisResult
+from .batch import BatchAnalyzer
+
+@dataclass
+class ShopReport:
+    shop_domain: str
+    shop_id: Optional[str] = None
+    status: str = 'ok'
+    shop_detail: Optional[Dict] = None
+    trust: Dict = field(default_factory=dict)
+    catalog_size: int = 0
+    products: List[Dict] = field(default_factory=list)
+    summary: Dict = field(default_factory=dict)
+    
+    @property
+    def ok(self) -> bool:
+        return self.status == 'ok'
+    
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+class ShopSweep:
+    def __init__(self, detector, workers: int = 4, quick_pages: int = 1, deep_pages: int = 5,
+                 deep_threshold: float = 40.0, deep_confidence: float = 0.5, max_products: Optional[int] = None):
+        self.detector = detector
+        self.workers = workers
+        self.quick_pages = quick_pages
+        self.deep_pages = deep_pages
+        self.deep_threshold = deep_threshold
+        self.deep_confidence = deep_confidence
+        self.max_products = max_products
+    
+    def run(self, shop_domain: str, on_result: Optional[Callable[[AnalysisResult], None]] = None) -> ShopReport:
+        return asyncio.run(self.run_async(shop_domain, on_result))
+    
+    async def run_async(self, shop_domain: str,
+                        on_result: Optional[Callable[[AnalysisResult], None]] = None) -> ShopReport:
+        report = ShopReport(shop_domain)
+        
+        async with AsyncAPIFetcher(self.detector.endpoint, concurrency=self.workers,
+                                   scheduler=self.detector.scheduler, cache=self.detector.cache,
+                                   fixtures=self.detector.fixtures) as api:
+            detail = await api.fetch_shop_detail(shop_domain)
+            shop_id = str((detail or {}).get('shopCore', {}).get('shopID', ''))
+            if not shop_id:
+                report.status = 'not_found'
+                return report
+            
+            report.shop_id = shop_id
+            report.shop_detail = detail
+            report.trust = await asyncio.to_thread(self._trust, shop_domain, detail, await api.fetch_shop_rating(shop_id))
+            
+            catalog = await api.fetch_shop_catalog(shop_id, max_products=self.max_products)
+            report.catalog_size = len(catalog)
+            catalog = sorted((product for product in catalog if product.get('product_url') and self._review_count(product)),
+                             key=self._review_count)
+            
+            quick = await self._analyze_all(api, [product['product_url'] for product in catalog],
+                                            self.quick_pages, False, on_result)
+            deep_urls = [result.product_url for result, product in zip(quick, catalog)
+                         if self._needs_deep(result, self._review_count(product))]
+            deep = await self._analyze_all(api, deep_urls, self.deep_pages, True, on_result)
+        
+        results = {result.product_url: result for result in quick}
+        results.update((result.product_url, result) for result in deep if result.ok)
+        results = list(results.values())
+        await asyncio.to_thread(self._save_quick, results, {result.product_url for result in deep if result.ok})
+        await asyncio.to_thread(self.detector.refresh_rings, results)
+        
+        deep_urls = set(deep_urls)
+        report.products = [dict(row, depth="deep" if row['product_url'] in deep_urls else "quick")
+                           for row in BatchAnalyzer.summarize(results)]
+        report.summary = self.summarize(results, len(deep_urls))
+        return report
+    
+    def _trust(self, shop_domain: str, detail: Dict, rating: Optional[Dict]) -> Dict:
+        if self.detector.trust_index is not None:
+            return self.detector.trust_index.put(shop_domain, detail, rating).trust
+        return TrustAnalyzer.analyze(detail, rating)
+    
+    @staticmethod
+    def _review_count(product: Dict) -> int:
+        return (product.get('stats') or {}).get('reviewCount', 0) or 0
+    
+    def _needs_deep(self, result: AnalysisResult, review_count: int) -> bool:
+        if not result.ok or result.review_count >= review_count:
+            return False
+        return result.fake_score >= self.deep_threshold or (result.confidence is not None and result.confidence < self.deep_confidence)
+    
+    def _save_quick(self, results: List[AnalysisResult], deep_urls: Set[str]):
+        store = self.detector.result_store
+        if store is None:
+            return
+        for result in results:
+            if result.ok and result.product_url not in deep_urls:
+                store.save(result, [])
+    
+    async def _analyze_all(self, api: AsyncAPIFetcher, urls: List[str], max_pages: int, save: bool,
+                           on_result: Optional[Callable[[AnalysisResult], None]]) -> List[AnalysisResult]:
+        semaphore = asyncio.Semaphore(self.workers)
+        
+        async def worker(url: str) -> AnalysisResult:
+            async with semaphore:
+                try:
+                    result = await self.detector.analyze_async(url, api, max_pages, False, incremental=False, save=save)
+                except Exception as e:
+                    result = AnalysisResult(url, status='error', error=str(e))
+            if on_result:
+                on_result(result)
+            return result
+        
+        return await asyncio.gather(*(worker(url) for url in urls))
+    
+    @staticmethod
+    def summarize(results: List[AnalysisResult], deep: int = 0) -> Dict:
+        scored = [result for result in results if result.ok]
+        reviews = sum(result.review_count for result in scored)
+        summary = {
+            'analyzed': len(scored),
+            'failed': len(results) - len(scored),
+            'deep': deep,
+            'reviews': reviews,
+            'mean_score': 0,
+            'weighted_score': 0,
+            'max_score': 0,
+            'high_risk': 0,
+            'medium_risk': 0,
+            'ring_products': 0
+        }
+        
+        if scored:
+            summary['mean_score'] = sum(result.fake_score for result in scored) / len(scored)
+            summary['weighted_score'] = (sum(result.fake_score * result.review_count for result in scored) / reviews) if reviews > 0 else 0
+            summary['max_score'] = max(result.fake_score for result in scored)
+            summary['high_risk'] = sum(1 for result in scored if result.fake_score > 70)
+            summary['medium_risk'] = sum(1 for result in scored if 40 < result.fake_score <= 70)
+            summary['ring_products'] = sum(1 for result in scored if result.rings.get('ring_reviewers', 0) > 0)
+        
+        return summary
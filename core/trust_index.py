@@ -0,0 +1,266 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Iterable, List, Optional
+
+from ..analysis import TrustAnalyzer
+
+DEFAULT_TRUST_INDEX_PATH = os.path.join(os.path.expanduser("~"), ".cache", "tokped_detector", "trust_index.sqlite3")
+
+@dataclass
+class TrustRecord:
+    domain: str
+    shop_id: str
+    trust: Dict
+    detail: Dict = field(default_factory=dict)
+    rating: Optional[Dict] = None
+    updated_at: float = 0.0
+    
+    @property
+    def trust_score(self) -> int:
+        return self.trust.get('trust_score', 0)
+    
+    def age(self, now: Optional[float] = None) -> float:
+        return (now if now is not None else time.time()) - self.updated_at
+    
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+class TrustIndex:
+    def __init__(self, path: str = DEFAULT_TRUST_INDEX_PATH, max_age: float = 24 * 3600, refresh_batch_size: int = 10,
+                 max_refresh_attempts: int = 3):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.max_age = max_age
+        self.refresh_batch_size = refresh_batch_size
+        self.max_refresh_attempts = max_refresh_attempts
+        self.hits = 0
+        self.misses = 0
+        self.refreshed = 0
+        self.refresh_errors = 0
+        self.refresh_dropped = 0
+        self.last_refresh_error: Optional[str] = None
+        self._refresh_attempts: Dict[str, int] = {}
+        self._records: Dict[str, TrustRecord] = {}
+        self._domains_by_id: Dict[str, str] = {}
+        self._lock = threading.RLock()
+        self._refresh_queue: List[str] = []
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS shops ("
+            "domain TEXT PRIMARY KEY, shop_id TEXT NOT NULL, trust_score INTEGER NOT NULL, "
+            "record TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS shops_shop_id ON shops (shop_id)")
+        self._conn.commit()
+        for (value,) in self._conn.execute("SELECT record FROM shops"):
+            self._remember(TrustRecord(**json.loads(value)))
+    
+    def __len__(self) -> int:
+        return len(self._records)
+    
+    def _remember(self, record: TrustRecord):
+        self._records[record.domain] = record
+        if record.shop_id:
+            self._domains_by_id[record.shop_id] = record.domain
+    
+    def is_stale(self, record: TrustRecord, now: Optional[float] = None) -> bool:
+        return record.age(now) > self.max_age
+    
+    def get(self, domain: str) -> Optional[TrustRecord]:
+        with self._lock:
+            record = self._records.get(domain)
+            if record is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return record
+    
+    def get_by_id(self, shop_id: str) -> Optional[TrustRecord]:
+        with self._lock:
+            domain = self._domains_by_id.get(str(shop_id))
+        return self.get(domain) if domain is not None else None
+    
+    @staticmethod
+    def make_record(domain: str, detail: Dict, rating: Optional[Dict] = None,
+                    trust: Optional[Dict] = None, updated_at: Optional[float] = None) -> TrustRecord:
+        return TrustRecord(
+            domain=domain,
+            shop_id=str(detail.get('shopCore', {}).get('shopID', '')),
+            trust=trust if trust is not None else TrustAnalyzer.analyze(detail, rating),
+            detail=detail,
+            rating=rating,
+            updated_at=updated_at if updated_at is not None else time.time()
+        )
+    
+    def put(self, domain: str, detail: Dict, rating: Optional[Dict] = None,
+            trust: Optional[Dict] = None, updated_at: Optional[float] = None) -> TrustRecord:
+        record = self.make_record(domain, detail, rating, trust, updated_at)
+        self.put_records([record])
+        return record
+    
+    def put_records(self, records: Iterable[TrustRecord]):
+        records = list(records)
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO shops (domain, shop_id, trust_score, record, updated_at) VALUES (?, ?, ?, ?, ?)",
+                [(record.domain, record.shop_id, record.trust_score,
+                  json.dumps(record.to_dict(), separators=(",", ":")), record.updated_at) for record in records]
+            )
+            self._conn.commit()
+            for record in records:
+                previous = self._records.get(record.domain)
+                if previous is not None and previous.shop_id and previous.shop_id != record.shop_id:
+                    self._domains_by_id.pop(previous.shop_id, None)
+                self._remember(record)
+    
+    def remove(self, domain: str):
+        with self._lock:
+            record = self._records.pop(domain, None)
+            if record is not None and record.shop_id:
+                self._domains_by_id.pop(record.shop_id, None)
+            self._conn.execute("DELETE FROM shops WHERE domain = ?", (domain,))
+            self._conn.commit()
+    
+    def stale_domains(self, limit: Optional[int] = None) -> List[str]:
+        now = time.time()
+        with self._lock:
+            stale = sorted((record for record in self._records.values() if self.is_stale(record, now)),
+                           key=lambda record: record.updated_at)
+        return [record.domain for record in stale[:limit]]
+    
+    def top(self, limit: int = 10) -> List[TrustRecord]:
+        with self._lock:
+            return sorted(self._records.values(), key=lambda record: record.trust_score, reverse=True)[:limit]
+    
+    def refresh(self, api, domains: Optional[List[str]] = None) -> int:
+        domains = domains if domains is not None else self.stale_domains()
+        refreshed = 0
+        for start in range(0, len(domains), self.refresh_batch_size):
+            chunk = domains[start:start + self.refresh_batch_size]
+            details = api.fetch_shop_detail(chunk)
+            refreshed += self._store_refresh(chunk, details, api.fetch_shop_rating(self._shop_ids(details)))
+        return refreshed
+    
+    async def refresh_async(self, api, domains: Optional[List[str]] = None) -> int:
+        domains = domains if domains is not None else self.stale_domains()
+        refreshed = 0
+        for start in range(0, len(domains), self.refresh_batch_size):
+            chunk = domains[start:start + self.refresh_batch_size]
+            details = await api.fetch_shop_detail(chunk)
+            refreshed += self._store_refresh(chunk, details, await api.fetch_shop_rating(self._shop_ids(details)))
+        return refreshed
+    
+    @staticmethod
+    def _shop_ids(details: List[Optional[Dict]]) -> List[str]:
+        return [str(detail.get('shopCore', {}).get('shopID', '')) for detail in details
+                if detail and detail.get('shopCore', {}).get('shopID')]
+    
+    def _store_refresh(self, domains: List[str], details: List[Optional[Dict]], ratings: List[Optional[Dict]]) -> int:
+        ratings = iter(ratings)
+        records = []
+        for domain, detail in zip(domains, details):
+            if not detail:
+                continue
+            shop_id = str(detail.get('shopCore', {}).get('shopID', ''))
+            rating = next(ratings, None) if shop_id else None
+            if shop_id and rating is None:
+                continue
+            records.append(TrustRecord(domain, shop_id, TrustAnalyzer.analyze(detail, rating), detail, rating, time.time()))
+        self.put_records(records)
+        self.refreshed += len(records)
+        return len(records)
+    
+    def schedule_refresh(self, api, domains: List[str]):
+        with self._lock:
+            queued = set(self._refresh_queue)
+            self._refresh_queue.extend(domain for domain in domains if domain not in queued)
+            if not self._refresh_queue or (self._refresh_thread is not None and self._refresh_thread.is_alive()):
+                return
+            self._refresh_thread = threading.Thread(target=self._refresh_worker, args=(api,), daemon=True)
+            self._refresh_thread.start()
+    
+    def _refresh_worker(self, api):
+        while True:
+            with self._lock:
+                chunk = self._refresh_queue[:self.refresh_batch_size]
+                del self._refresh_queue[:self.refresh_batch_size]
+                if not chunk:
+                    self._refresh_thread = None
+                    return
+            try:
+                self.refresh(api, chunk)
+            except Exception as e:
+                self._refresh_failed(chunk, e)
+            else:
+                with self._lock:
+                    for domain in chunk:
+                        self._refresh_attempts.pop(domain, None)
+    
+    def _refresh_failed(self, chunk: List[str], error: Exception):
+        with self._lock:
+            self.refresh_errors += 1
+            self.last_refresh_error = f"{type(error).__name__}: {error}"
+            queued = set(self._refresh_queue)
+            for domain in chunk:
+                attempts = self._refresh_attempts.get(domain, 0) + 1
+                if attempts >= self.max_refresh_attempts:
+                    self._refresh_attempts.pop(domain, None)
+                    self.refresh_dropped += 1
+                elif domain not in queued:
+                    self._refresh_attempts[domain] = attempts
+                    self._refresh_queue.append(domain)
+    
+    def wait_for_refresh(self, timeout: Optional[float] = None):
+        thread = self._refresh_thread
+        if thread is not None:
+            thread.join(timeout)
+    
+    def export(self, path: str) -> int:
+        with self._lock:
+            records = [record.to_dict() for record in self._records.values()]
+        with open(path, 'w', encoding='utf-8') as handle:
+            for record in records:
+                handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return len(records)
+    
+    def import_file(self, path: str, keep_newer: bool = True) -> int:
+        records = []
+        with open(path, encoding='utf-8') as handle:
+            for line in handle:
+                line = line.strip()
+                if line:
+                    records.append(TrustRecord(**json.loads(line)))
+        if keep_newer:
+            with self._lock:
+                records = [record for record in records
+                           if record.domain not in self._records or self._records[record.domain].updated_at < record.updated_at]
+        self.put_records(records)
+        return len(records)
+    
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._records),
+            'stale': len(self.stale_domains()),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / lookups * 100) if lookups > 0 else 0,
+            'refreshed': self.refreshed,
+            'refresh_errors': self.refresh_errors,
+            'refresh_dropped': self.refresh_dropped,
+            'refresh_queued': len(self._refresh_queue),
+            'last_refresh_error': self.last_refresh_error
+        }
+    
+    def close(self):
+        self.wait_for_refresh()
+        with self._lock:
+            self._conn.close()
@@ -1,22 +1,160 @@
 import time
 import sys
 import os
+import json
+import asyncio
+import argparse
 
 if __name__ == "__main__" and __package__ is None:
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
     import tokped_detector
-    from tokped_detector.core import TokopediaFakeDetector
+    from tokped_detector.core import TokopediaFakeDetector, BatchAnalyzer, TrustIndex, ResultStore, ShopSweep
+    from tokped_detector.api import ResponseCache, FixtureArchive, RequestScheduler
+    from tokped_detector.analysis import ReviewerGraph
+    from tokped_detector.metrics import MetricsRegistry
+    from tokped_detector.service import run_service
     from tokped_detector.ui import MenuManager
 else:
-    from .core import TokopediaFakeDetector
+    from .core import TokopediaFakeDetector, BatchAnalyzer, TrustIndex, ResultStore, ShopSweep
+    from .api import ResponseCache, FixtureArchive, RequestScheduler
+    from .analysis import ReviewerGraph
+    from .metrics import MetricsRegistry
+    from .service import run_service
     from .ui import MenuManager
 
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, MofNCompleteColumn
 
-def main():
+def run_batch(console: Console, detector: TokopediaFakeDetector, urls: list, workers: int = 4, output: str = None):
+    batch = BatchAnalyzer(detector, workers=workers)
+    
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        console=console,
+        transient=True
+    ) as progress:
+        task = progress.add_task("[cyan]Analyzing products...", total=len(urls))
+        results = batch.analyze(urls, on_result=lambda result: progress.advance(task))
+    
+    rows = BatchAnalyzer.summarize(results)
+    detector.display.display_batch_summary(rows)
+    
+    if output:
+        with open(output, 'w', encoding='utf-8') as handle:
+            json.dump([result.to_dict() for result in BatchAnalyzer.sort_by_score(results)], handle, ensure_ascii=False, indent=2)
+        console.print(f"[green]Saved {len(results)} results to {output}[/green]")
+    
+    return rows
+
+def run_shop(console: Console, detector: TokopediaFakeDetector, shop_domain: str, workers: int = 4,
+             output: str = None, max_products: int = None):
+    sweep = ShopSweep(detector, workers=workers, max_products=max_products)
+    
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        MofNCompleteColumn(),
+        console=console,
+        transient=True
+    ) as progress:
+        task = progress.add_task(f"[cyan]Sweeping {shop_domain}...", total=None)
+        report = sweep.run(shop_domain, on_result=lambda result: progress.advance(task))
+    
+    detector.display.display_shop_report(report)
+    
+    if output:
+        with open(output, 'w', encoding='utf-8') as handle:
+            json.dump(report.to_dict(), handle, ensure_ascii=False, indent=2)
+        console.print(f"[green]Saved shop report to {output}[/green]")
+    
+    return report
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Tokopedia Fake Review Detector")
+    parser.add_argument("--batch", metavar="FILE", help="analyze the product URLs listed in FILE (one per line) and exit")
+    parser.add_argument("--workers", type=int, default=4, help="number of products analyzed concurrently in batch mode")
+    parser.add_argument("--shop", metavar="DOMAIN", help="analyze every product of the shop with this domain and exit")
+    parser.add_argument("--max-products", type=int, help="limit the number of catalog products swept in shop mode")
+    parser.add_argument("--output", metavar="FILE", help="write batch or shop results as JSON to FILE")
+    parser.add_argument("--trace", action="store_true", help="record per-stage timings and show them after each analysis")
+    parser.add_argument("--metrics", metavar="FILE", help="write Prometheus-style stage metrics to FILE on exit")
+    parser.add_argument("--trust-export", metavar="FILE", help="export the local shop trust index as JSON lines and exit")
+    parser.add_argument("--trust-import", metavar="FILE", help="import shop trust records from a JSON lines file and exit")
+    parser.add_argument("--no-store", action="store_true", help="do not reuse or save reviews from earlier analyses")
+    parser.add_argument("--rings", action="store_true", help="track reviewers across analyzed products and score review rings")
+    parser.add_argument("--budgets", metavar="FILE", help="JSON file with per-operation request rate budgets")
+    parser.add_argument("--record", metavar="FILE", help="save every GraphQL response to a gzip fixture archive")
+    parser.add_argument("--replay", metavar="FILE", help="answer every GraphQL request from a fixture archive, without network")
+    parser.add_argument("--serve", action="store_true", help="run a headless JSON HTTP service instead of the menu")
+    parser.add_argument("--host", default="127.0.0.1", help="address the HTTP service listens on")
+    parser.add_argument("--port", type=int, default=8080, help="port the HTTP service listens on")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     console = Console()
-    detector = TokopediaFakeDetector()
+    trust_index = TrustIndex()
+    try:
+        run_cli(args, console, trust_index)
+    finally:
+        trust_index.close()
+
+def run_cli(args, console: Console, trust_index: TrustIndex):
+    if args.trust_export or args.trust_import:
+        if args.trust_import:
+            console.print(f"[green]Imported {trust_index.import_file(args.trust_import)} shop records[/green]")
+        if args.trust_export:
+            console.print(f"[green]Exported {trust_index.export(args.trust_export)} shop records to {args.trust_export}[/green]")
+        return
+    
+    metrics = MetricsRegistry() if args.metrics else None
+    fixtures = None
+    if args.replay:
+        fixtures = FixtureArchive(args.replay, "replay")
+    elif args.record:
+        fixtures = FixtureArchive(args.record, "record")
+    scheduler = RequestScheduler.from_file(args.budgets) if args.budgets else None
+    detector = TokopediaFakeDetector(cache=None if fixtures else ResponseCache(), trace=args.trace, metrics=metrics,
+                                     trust_index=None if fixtures else trust_index, fixtures=fixtures,
+                                     scheduler=scheduler,
+                                     result_store=None if fixtures or args.no_store else ResultStore(),
+                                     reviewer_graph=ReviewerGraph() if args.rings else None)
+    
+    try:
+        if args.serve:
+            run_service(detector, args.host, args.port, workers=args.workers)
+            return
+        
+        if args.shop:
+            run_shop(console, detector, args.shop, args.workers, args.output, args.max_products)
+            return
+        
+        if args.batch:
+            try:
+                urls = BatchAnalyzer.load_urls(args.batch)
+            except ValueError as e:
+                console.print(f"[red]{e}[/red]")
+                return
+            if not urls:
+                console.print("[yellow]No valid URLs provided[/yellow]")
+                return
+            run_batch(console, detector, urls, args.workers, args.output)
+            return
+        
+        run_menu(console, detector)
+    finally:
+        if fixtures is not None:
+            fixtures.close()
+            if args.record:
+                console.print(f"[green]Recorded {fixtures.recorded} responses to {args.record}[/green]")
+        if metrics is not None:
+            metrics.write(args.metrics)
+            console.print(f"[green]Saved metrics to {args.metrics}[/green]")
+
+def run_menu(console: Console, detector: TokopediaFakeDetector):
     menu = MenuManager(console)
     
     while True:
@@ -31,7 +169,7 @@ def main():
             url = menu.get_product_url()
             if url:
                 try:
-                    detector.run(url)
+                    asyncio.run(detector.run_async(url))
                     menu.wait_for_continue()
                 except Exception as e:
                     console.print(f"[red]Error: {str(e)}[/red]")
@@ -49,7 +187,7 @@ def main():
                         transient=True
                     ) as progress:
                         task = progress.add_task("[cyan]Searching for trusted sellers...", total=None)
-                        trusted = detector.find_trusted_sellers(query, None)
+                        trusted = asyncio.run(detector.find_trusted_sellers_async(query, None))
                     
                     if trusted:
                         detector.display.display_trusted_sellers(trusted)
@@ -77,14 +215,10 @@ def main():
             
             if urls:
                 console.print(f"\n[green]Analyzing {len(urls)} products...[/green]")
-                for i, url in enumerate(urls, 1):
-                    console.print(f"\n[bold cyan]Product {i}/{len(urls)}[/bold cyan]")
-                    try:
-                        detector.run(url)
-                    except Exception as e:
-                        console.print(f"[red]Error: {str(e)}[/red]")
-                    if i < len(urls):
-                        console.print("\n[dim]---[/dim]\n")
+                try:
+                    run_batch(console, detector, urls)
+                except Exception as e:
+                    console.print(f"[red]Error: {str(e)}[/red]")
                 menu.wait_for_continue()
             else:
                 console.print("[yellow]No valid URLs provided[/yellow]")
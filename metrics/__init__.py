@@ -0,0 +1,13 @@
+from .trace import Stage, Trace, NullTrace, NULL_TRACE, current_trace, use_trace, summarize_stages
+from .prometheus import MetricsRegistry
+
+__all__ = [
+    "Stage",
+    "Trace",
+    "NullTrace",
+    "NULL_TRACE",
+    "current_trace",
+    "use_trace",
+    "summarize_stages",
+    "MetricsRegistry"
+]
@@ -0,0 +1,99 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+from .trace import Stage
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+class MetricsRegistry:
+    def __init__(self, namespace: str = "tokped", buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.namespace = namespace
+        self.buckets = tuple(sorted(buckets))
+        self.counters: Dict[str, Dict[LabelKey, float]] = {}
+        self.histograms: Dict[str, Dict[LabelKey, List[float]]] = {}
+        self.help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+    
+    def _name(self, name: str) -> str:
+        return f"{self.namespace}_{name}" if self.namespace else name
+    
+    def inc(self, name: str, value: float = 1.0, help: str = "", **labels):
+        key = tuple(sorted(labels.items()))
+        metric = self._name(name)
+        with self._lock:
+            series = self.counters.setdefault(metric, {})
+            series[key] = series.get(key, 0.0) + value
+            if help:
+                self.help.setdefault(metric, help)
+    
+    def observe(self, name: str, value: float, help: str = "", **labels):
+        key = tuple(sorted(labels.items()))
+        metric = self._name(name)
+        with self._lock:
+            series = self.histograms.setdefault(metric, {})
+            counts = series.get(key)
+            if counts is None:
+                counts = series[key] = [0.0] * (len(self.buckets) + 2)
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            counts[-2] += 1
+            counts[-1] += value
+            if help:
+                self.help.setdefault(metric, help)
+    
+    def record_stage(self, stage: Stage):
+        self.observe("stage_duration_seconds", stage.seconds, "Wall time spent in each detection stage", stage=stage.name)
+        if stage.requests:
+            self.inc("http_requests_total", stage.requests, "GraphQL operations sent over HTTP",
+                     stage=stage.name, status=str(stage.status) if stage.status is not None else "none")
+        if stage.bytes_received:
+            self.inc("http_received_bytes_total", stage.bytes_received, "Response bytes received", stage=stage.name)
+        if stage.cache_hits:
+            self.inc("cache_hits_total", stage.cache_hits, "GraphQL operations served from the response cache", stage=stage.name)
+        if stage.reviews:
+            self.inc("reviews_analyzed_total", stage.reviews, "Reviews processed by analysis stages", stage=stage.name)
+        if stage.error:
+            self.inc("stage_errors_total", 1, "Stages that raised an exception", stage=stage.name, error=stage.error)
+    
+    def __call__(self, stage: Stage):
+        self.record_stage(stage)
+    
+    @staticmethod
+    def _labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(key) + ([extra] if extra else [])
+        if not pairs:
+            return ""
+        escaped = (value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n") for _, value in pairs)
+        return "{" + ",".join(f"{name}=\"{value}\"" for (name, _), value in zip(pairs, escaped)) + "}"
+    
+    @staticmethod
+    def _number(value: float) -> str:
+        return str(int(value)) if float(value).is_integer() else repr(value)
+    
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for metric in sorted(self.counters):
+                if metric in self.help:
+                    lines.append(f"# HELP {metric} {self.help[metric]}")
+                lines.append(f"# TYPE {metric} counter")
+                for key, value in sorted(self.counters[metric].items()):
+                    lines.append(f"{metric}{self._labels(key)} {self._number(value)}")
+            
+            for metric in sorted(self.histograms):
+                if metric in self.help:
+                    lines.append(f"# HELP {metric} {self.help[metric]}")
+                lines.append(f"# TYPE {metric} histogram")
+                for key, counts in sorted(self.histograms[metric].items()):
+                    for bound, count in zip(self.buckets, counts):
+                        lines.append(f"{metric}_bucket{self._labels(key, ('le', repr(float(bound))))} {self._number(count)}")
+                    lines.append(f"{metric}_bucket{self._labels(key, ('le', '+Inf'))} {self._number(counts[-2])}")
+                    lines.append(f"{metric}_sum{self._labels(key)} {repr(counts[-1])}")
+                    lines.append(f"{metric}_count{self._labels(key)} {self._number(counts[-2])}")
+        return "\n".join(lines) + "\n"
+    
+    def write(self, path: str):
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write(self.render())
@@ -0,0 +1,119 @@
+import time
+from contextvars import ContextVar
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+@dataclass
+class Stage:
+    name: str
+    started_at: float = 0.0
+    seconds: float = 0.0
+    requests: int = 0
+    bytes_received: int = 0
+    status: Optional[int] = None
+    cache_hits: int = 0
+    reviews: int = 0
+    error: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+StageHook = Callable[[Stage], None]
+
+def summarize_stages(stages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    totals: Dict[str, Dict[str, Any]] = {}
+    for stage in stages:
+        total = totals.get(stage['name'])
+        if total is None:
+            total = totals[stage['name']] = {'stage': stage['name'], 'calls': 0, 'seconds': 0.0, 'requests': 0,
+                                              'bytes_received': 0, 'cache_hits': 0, 'reviews': 0, 'errors': 0}
+        total['calls'] += 1
+        total['seconds'] += stage['seconds']
+        total['requests'] += stage['requests']
+        total['bytes_received'] += stage['bytes_received']
+        total['cache_hits'] += stage['cache_hits']
+        total['reviews'] = max(total['reviews'], stage['reviews'])
+        if stage['error'] or (stage['status'] is not None and stage['status'] != 200):
+            total['errors'] += 1
+    return sorted(totals.values(), key=lambda total: total['seconds'], reverse=True)
+
+class Trace:
+    enabled = True
+    
+    def __init__(self, hooks: Optional[List[StageHook]] = None):
+        self.origin = time.perf_counter()
+        self.stages: List[Stage] = []
+        self.hooks: List[StageHook] = list(hooks or [])
+    
+    def add_hook(self, hook: StageHook):
+        self.hooks.append(hook)
+    
+    @contextmanager
+    def span(self, name: str, **fields) -> Iterator[Stage]:
+        stage = Stage(name, **fields)
+        start = time.perf_counter()
+        stage.started_at = start - self.origin
+        try:
+            yield stage
+        except BaseException as e:
+            stage.error = stage.error or type(e).__name__
+            raise
+        finally:
+            stage.seconds = time.perf_counter() - start
+            self.record(stage)
+    
+    def record(self, stage: Stage):
+        self.stages.append(stage)
+        for hook in self.hooks:
+            hook(stage)
+    
+    def summary(self) -> List[Dict[str, Any]]:
+        return summarize_stages(self.to_dict())
+    
+    def to_dict(self) -> List[Dict[str, Any]]:
+        return [stage.to_dict() for stage in self.stages]
+
+class _NullSpan:
+    def __init__(self):
+        self.stage = Stage('')
+    
+    def __enter__(self) -> Stage:
+        return self.stage
+    
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+class NullTrace:
+    enabled = False
+    
+    def __init__(self):
+        self.stages: List[Stage] = []
+        self._span = _NullSpan()
+    
+    def span(self, name: str, **fields) -> _NullSpan:
+        return self._span
+    
+    def record(self, stage: Stage):
+        pass
+    
+    def summary(self) -> List[Dict[str, Any]]:
+        return []
+    
+    def to_dict(self) -> List[Dict[str, Any]]:
+        return []
+
+NULL_TRACE = NullTrace()
+
+_current_trace: ContextVar = ContextVar('tokped_trace', default=NULL_TRACE)
+
+def current_trace():
+    return _current_trace.get()
+
+@contextmanager
+def use_trace(trace) -> Iterator:
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
@@ -0,0 +1,3 @@
+from .app import DetectorService, Coalescer, RecentResults, create_app, run_service
+
+__all__ = ["DetectorService", "Coalescer", "RecentResults", "create_app", "run_service"]
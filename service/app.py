@@ -0,0 +1,211 @@
+import time
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+from aiohttp import web
+
+from ..api import AsyncAPIFetcher
+from ..core import TokopediaFakeDetector, AnalysisResult
+
+PRODUCT_URL_PREFIX = "https://www.tokopedia.com/"
+FAILURE_STATUSES = {'error': 500, 'fetch_failed': 502, 'rate_limited': 503}
+
+class RecentResults:
+    def __init__(self, ttl: float = 120.0, max_entries: int = 512):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+    
+    def set(self, key: Hashable, value: Any):
+        if self.ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class Coalescer:
+    def __init__(self):
+        self.in_flight: Dict[Hashable, asyncio.Task] = {}
+        self.coalesced = 0
+    
+    async def run(self, key: Hashable, factory: Callable[[], Awaitable[Any]]) -> Any:
+        task = self.in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self.in_flight[key] = task
+            task.add_done_callback(lambda done: self.in_flight.pop(key, None) if self.in_flight.get(key) is done else None)
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+class DetectorService:
+    def __init__(self, detector: TokopediaFakeDetector, workers: int = 8, result_ttl: float = 120.0,
+                 max_batch: int = 50):
+        self.detector = detector
+        self.workers = workers
+        self.results = RecentResults(result_ttl)
+        self.sellers = RecentResults(result_ttl)
+        self.coalescer = Coalescer()
+        self.max_batch = max_batch
+        self.api: Optional[AsyncAPIFetcher] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+    
+    async def start(self, app: web.Application):
+        self.api = AsyncAPIFetcher(self.detector.endpoint, concurrency=self.workers,
+                                   scheduler=self.detector.scheduler, cache=self.detector.cache,
+                                   fixtures=self.detector.fixtures)
+        self._semaphore = asyncio.Semaphore(self.workers)
+    
+    async def stop(self, app: web.Application):
+        if self.api is not None:
+            await self.api.close()
+            self.api = None
+    
+    async def analyze(self, url: str, max_pages: int = 5, find_sellers: bool = True,
+                      refresh: bool = False) -> Tuple[AnalysisResult, bool]:
+        key = (url, max_pages, find_sellers)
+        if not refresh:
+            cached = self.results.get(key)
+            if cached is not None:
+                return cached, True
+        
+        async def compute() -> AnalysisResult:
+            async with self._semaphore:
+                try:
+                    result = await self.detector.analyze_async(url, self.api, max_pages, find_sellers)
+                except Exception as e:
+                    return AnalysisResult(url, status='error', error=str(e))
+            if not result.failed:
+                self.results.set(key, result)
+            return result
+        
+        return await self.coalescer.run(('analyze',) + key, compute), False
+    
+    async def find_sellers(self, query: str, exclude: Optional[str] = None) -> Tuple[List[Dict], bool]:
+        key = (query, exclude)
+        cached = self.sellers.get(key)
+        if cached is not None:
+            return cached, True
+        
+        async def compute() -> List[Dict]:
+            async with self._semaphore:
+                sellers = await self.detector.find_trusted_sellers_async(query, exclude, self.api)
+            self.sellers.set(key, sellers)
+            return sellers
+        
+        return await self.coalescer.run(('sellers',) + key, compute), False
+    
+    @staticmethod
+    def _error(status: int, message: str) -> web.Response:
+        return web.json_response({'error': message}, status=status)
+    
+    @staticmethod
+    async def _body(request: web.Request) -> Dict:
+        try:
+            body = await request.json()
+        except Exception:
+            raise web.HTTPBadRequest(text='{"error": "request body must be JSON"}', content_type="application/json")
+        if not isinstance(body, dict):
+            raise web.HTTPBadRequest(text='{"error": "request body must be a JSON object"}', content_type="application/json")
+        return body
+    
+    @staticmethod
+    def _options(body: Dict) -> Tuple[int, bool]:
+        try:
+            max_pages = max(1, min(int(body.get('max_pages', 5)), 50))
+        except (TypeError, ValueError):
+            max_pages = 5
+        return max_pages, bool(body.get('find_sellers', True))
+    
+    @staticmethod
+    def _payload(result: AnalysisResult, cached: bool) -> Dict:
+        payload = result.to_dict()
+        payload['cached'] = cached
+        return payload
+    
+    async def handle_analyze(self, request: web.Request) -> web.Response:
+        body = await self._body(request)
+        url = body.get('url')
+        if not isinstance(url, str) or not url.startswith(PRODUCT_URL_PREFIX):
+            return self._error(400, f"url must start with {PRODUCT_URL_PREFIX}")
+        
+        max_pages, find_sellers = self._options(body)
+        result, cached = await self.analyze(url.strip(), max_pages, find_sellers, bool(body.get('refresh')))
+        return web.json_response(self._payload(result, cached), status=FAILURE_STATUSES.get(result.status, 200))
+    
+    async def handle_batch(self, request: web.Request) -> web.Response:
+        body = await self._body(request)
+        urls = body.get('urls')
+        if not isinstance(urls, list) or not urls:
+            return self._error(400, "urls must be a non-empty list")
+        if len(urls) > self.max_batch:
+            return self._error(400, f"at most {self.max_batch} urls per batch")
+        
+        urls = [url.strip() for url in urls if isinstance(url, str) and url.strip().startswith(PRODUCT_URL_PREFIX)]
+        if not urls:
+            return self._error(400, "no valid product urls")
+        
+        max_pages, find_sellers = self._options(body)
+        answers = await asyncio.gather(*(self.analyze(url, max_pages, find_sellers, bool(body.get('refresh'))) for url in urls))
+        return web.json_response({'results': [self._payload(result, cached) for result, cached in answers]})
+    
+    async def handle_sellers(self, request: web.Request) -> web.Response:
+        query = request.query.get('q', '').strip()
+        if not query:
+            return self._error(400, "missing query parameter q")
+        
+        try:
+            sellers, cached = await self.find_sellers(query, request.query.get('exclude') or None)
+        except Exception as e:
+            return self._error(502, f"seller search failed: {e}")
+        return web.json_response({'query': query, 'sellers': sellers, 'cached': cached})
+    
+    async def handle_health(self, request: web.Request) -> web.Response:
+        return web.json_response({
+            'status': 'ok',
+            'in_flight': len(self.coalescer.in_flight),
+            'coalesced': self.coalescer.coalesced,
+            'cached_results': len(self.results),
+            'result_hits': self.results.hits,
+            'result_misses': self.results.misses,
+            'scheduler': self.detector.scheduler.stats(),
+            'trust_index': self.detector.trust_index.stats() if self.detector.trust_index is not None else None
+        })
+    
+    async def handle_metrics(self, request: web.Request) -> web.Response:
+        if self.detector.metrics is None:
+            return self._error(404, "metrics are disabled")
+        return web.Response(text=self.detector.metrics.render(), content_type="text/plain")
+    
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.on_startup.append(self.start)
+        app.on_cleanup.append(self.stop)
+        app.router.add_post("/analyze", self.handle_analyze)
+        app.router.add_post("/analyze/batch", self.handle_batch)
+        app.router.add_get("/sellers", self.handle_sellers)
+        app.router.add_get("/health", self.handle_health)
+        app.router.add_get("/metrics", self.handle_metrics)
+        return app
+
+def create_app(detector: Optional[TokopediaFakeDetector] = None, **options) -> web.Application:
+    return DetectorService(detector or TokopediaFakeDetector(), **options).app()
+
+def run_service(detector: TokopediaFakeDetector, host: str = "127.0.0.1", port: int = 8080, **options):
+    web.run_app(create_app(detector, **options), host=host, port=port)
@@ -0,0 +1,94 @@
+import asyncio
+import threading
+import pytest
+from aiohttp import web
+from ..benchmarks import generate_reviews
+
+class GraphQLServer:
+    def __init__(self, reviews, delay: float = 0.0):
+        self.reviews = reviews
+        self.delay = delay
+        self.requests = 0
+        self.operations = []
+        self.inflight = 0
+        self.max_inflight = 0
+        self.failures = []
+        self.retry_after = None
+        self.broken_pages = set()
+        self.url = None
+        self._loop = asyncio.new_event_loop()
+        self._runner = None
+    
+    def respond(self, operation, variables):
+        if operation == 'productrevGetMiniProductInfo':
+            return {'data': {operation: {'product': {'id': '1', 'name': 'Sepatu Lari', 'status': 'ACTIVE', 'stock': 3}}}}
+        if operation == 'productrevGetProductRatingAndTopics':
+            detail = [{'rate': rate, 'totalReviews': sum(1 for review in self.reviews if review.get('productRating') == rate)}
+                      for rate in range(5, 0, -1)]
+            for item in detail:
+                item['percentageFloat'] = item['totalReviews'] * 100 / len(self.reviews)
+            return {'data': {operation: {'rating': {'totalRating': len(self.reviews), 'detail': detail}}}}
+        if operation == 'productReviewList':
+            page, limit = variables['page'], variables['limit']
+            if page in self.broken_pages:
+                return {'data': None, 'errors': [{'message': f"page {page} unavailable"}]}
+            reviews = self.reviews
+            if (variables.get('filterBy') or '').startswith('rating='):
+                rates = {int(rate) for rate in variables['filterBy'][7:].split(',')}
+                reviews = [review for review in reviews if review.get('productRating') in rates]
+            chunk = reviews[(page - 1) * limit:page * limit]
+            return {'data': {'productrevGetProductReviewList': {'list': chunk, 'hasNext': page * limit < len(reviews)}}}
+        if operation == 'ShopInfoCoreQuery':
+            domain = variables['domain']
+            return {'data': {'shopInfoByID': {'result': [{'shopCore': {'shopID': len(domain), 'domain': domain}}]}}}
+        if operation == 'GetShopProduct':
+            page, per_page, total = variables['page'], variables['perPage'], 23
+            data = [{'product_id': str(index), 'name': f"Item {index}"} for index in range((page - 1) * per_page, min(total, page * per_page))]
+            return {'data': {operation: {'data': data, 'links': {'next': 'next' if page * per_page < total else ''}}}}
+        return {'data': {}}
+    
+    async def handle(self, request):
+        self.requests += 1
+        self.inflight += 1
+        self.max_inflight = max(self.max_inflight, self.inflight)
+        try:
+            if self.failures:
+                status = self.failures.pop(0)
+                headers = {'Retry-After': self.retry_after} if self.retry_after is not None else None
+                return web.Response(status=status, headers=headers)
+            body = await request.json()
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            self.operations.extend(item['operationName'] for item in body)
+            return web.json_response([self.respond(item['operationName'], item['variables']) for item in body])
+        finally:
+            self.inflight -= 1
+    
+    def start(self):
+        app = web.Application()
+        app.router.add_route('POST', '/graphql/{operation}', self.handle)
+        self._runner = web.AppRunner(app)
+        started = threading.Event()
+        
+        def run():
+            asyncio.set_event_loop(self._loop)
+            self._loop.run_until_complete(self._runner.setup())
+            site = web.TCPSite(self._runner, '127.0.0.1', 0)
+            self._loop.run_until_complete(site.start())
+            self.url = f"http://127.0.0.1:{self._runner.addresses[0][1]}/graphql"
+            started.set()
+            self._loop.run_forever()
+        
+        threading.Thread(target=run, daemon=True).start()
+        started.wait(5)
+        return self
+    
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result(5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+
+@pytest.fixture
+def graphql_server():
+    server = GraphQLServer(generate_reviews(120)).start()
+    yield server
+    server.stop()
@@ -0,0 +1,43 @@
+import asyncio
+from ..api import APIFetcher, AsyncAPIFetcher, RequestScheduler, EndpointBudget
+
+PRODUCT_URL = "https://www.tokopedia.com/toko/sepatu-lari"
+
+def scheduler() -> RequestScheduler:
+    return RequestScheduler({'default': EndpointBudget(rate=1000.0, burst=1000.0, max_rate=1000.0)})
+
+def test_concurrent_page_fetches_respect_semaphore(graphql_server):
+    graphql_server.delay = 0.05
+    
+    async def run():
+        async with AsyncAPIFetcher(graphql_server.url, concurrency=2, max_batch_size=1, scheduler=scheduler()) as api:
+            return await api.fetch_review_pages(PRODUCT_URL, [1, 2, 3, 4, 5, 6])
+    
+    pages = asyncio.run(run())
+    assert graphql_server.requests == 6
+    assert graphql_server.max_inflight == 2
+    assert [review['id'] for page in pages for review in page['list']] == [review['id'] for review in graphql_server.reviews]
+
+def test_async_results_match_sync_fetcher(graphql_server):
+    graphql_server.delay = 0.02
+    domains = ['toko', 'tokobagus', 'mantap']
+    
+    async def run():
+        async with AsyncAPIFetcher(graphql_server.url, concurrency=3, max_batch_size=2, scheduler=scheduler()) as api:
+            return await asyncio.gather(
+                api.fetch_product_bundle(PRODUCT_URL),
+                api.fetch_review_sample(PRODUCT_URL, [(2, "informative_score desc", ""), (3, "create_time desc", "")]),
+                api.fetch_shop_detail(domains),
+                api.fetch_shop_catalog('42', per_page=10)
+            )
+    
+    bundle, sample, shops, catalog = asyncio.run(run())
+    assert graphql_server.max_inflight > 1
+    
+    api = APIFetcher(graphql_server.url, max_batch_size=2, scheduler=scheduler())
+    assert list(bundle) == list(api.fetch_product_bundle(PRODUCT_URL))
+    assert sample == api.fetch_review_sample(PRODUCT_URL, [(2, "informative_score desc", ""), (3, "create_time desc", "")])
+    assert shops == api.fetch_shop_detail(domains)
+    assert [shop['shopCore']['domain'] for shop in shops] == domains
+    assert catalog == api.fetch_shop_catalog('42', per_page=10)
+    assert len(catalog) == 23
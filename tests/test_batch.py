@@ -0,0 +1,13 @@
+import pytest
+from ..core.batch import BatchAnalyzer
+
+def test_load_urls_skips_comments_and_blank_lines(tmp_path):
+    path = tmp_path / "urls.txt"
+    path.write_text("https://www.tokopedia.com/toko/a\n\n# catatan\n  https://www.tokopedia.com/toko/b  \n", encoding="utf-8")
+    assert BatchAnalyzer.load_urls(str(path)) == ["https://www.tokopedia.com/toko/a", "https://www.tokopedia.com/toko/b"]
+
+def test_load_urls_reports_bad_line(tmp_path):
+    path = tmp_path / "urls.txt"
+    path.write_text("https://www.tokopedia.com/toko/a\nhttps://shopee.co.id/x\n", encoding="utf-8")
+    with pytest.raises(ValueError, match=r"urls\.txt:2:"):
+        BatchAnalyzer.load_urls(str(path))
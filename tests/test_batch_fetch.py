@@ -0,0 +1,55 @@
+import asyncio
+from ..api import APIFetcher, AsyncAPIFetcher, ResponseCache, RequestScheduler, EndpointBudget, queries
+from ..api.batch import split_response
+
+PRODUCT_URL = "https://www.tokopedia.com/toko/sepatu-lari"
+
+def scheduler() -> RequestScheduler:
+    return RequestScheduler({'default': EndpointBudget(rate=1000.0, burst=1000.0)})
+
+def first_ids(pages):
+    return [page['list'][0]['id'] if page else None for page in pages]
+
+def expected_ids(server, pages):
+    return [server.reviews[(page - 1) * 20]['id'] if page not in server.broken_pages else None for page in pages]
+
+def test_split_response_isolates_failed_entries():
+    calls = [queries.product_info(PRODUCT_URL), queries.product_reviews(PRODUCT_URL, 1), queries.shop_rating('7')]
+    body = [
+        {'data': {'productrevGetMiniProductInfo': {'product': {'id': '1'}}}},
+        {'data': None, 'errors': [{'message': "internal error"}]},
+        {'data': {'productrevGetShopRating': {'ratingScore': '4.8'}}}
+    ]
+    assert split_response(calls, body) == [{'product': {'id': '1'}}, None, {'ratingScore': '4.8'}]
+    assert split_response(calls, body[:2]) == [None, None, None]
+    assert split_response(calls, {'errors': [{'message': "bad request"}]}) == [None, None, None]
+    assert split_response(calls, [body[0], "oops", body[2]]) == [{'product': {'id': '1'}}, None, {'ratingScore': '4.8'}]
+
+def test_execute_batch_chunks_and_keeps_order(graphql_server, tmp_path):
+    graphql_server.broken_pages = {3}
+    pages = [1, 2, 3, 4, 5, 6]
+    cache = ResponseCache(str(tmp_path / "responses.sqlite3"))
+    api = APIFetcher(graphql_server.url, cache=cache, max_batch_size=4, scheduler=scheduler())
+    
+    assert first_ids(api.fetch_review_pages(PRODUCT_URL, pages)) == expected_ids(graphql_server, pages)
+    assert graphql_server.requests == 2
+    
+    graphql_server.broken_pages = set()
+    assert first_ids(api.fetch_review_pages(PRODUCT_URL, pages)) == expected_ids(graphql_server, pages)
+    assert graphql_server.requests == 3
+    assert graphql_server.operations.count('productReviewList') == 7
+    cache.close()
+
+def test_async_execute_batch_isolates_failed_entries(graphql_server):
+    graphql_server.broken_pages = {2, 5}
+    pages = [5, 1, 2, 4, 3]
+    
+    async def run():
+        async with AsyncAPIFetcher(graphql_server.url, max_batch_size=2, scheduler=scheduler()) as api:
+            return await api.execute_batch([queries.product_info(PRODUCT_URL)] +
+                                           [queries.product_reviews(PRODUCT_URL, page) for page in pages])
+    
+    results = asyncio.run(run())
+    assert results[0]['product']['id'] == '1'
+    assert first_ids(results[1:]) == expected_ids(graphql_server, pages)
+    assert graphql_server.requests == 3
@@ -0,0 +1,113 @@
+import sqlite3
+import pytest
+from ..api import ResponseCache
+from ..api import cache as cache_module
+
+class Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+    
+    def time(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, 'time', clock)
+    return clock
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "responses.sqlite3")
+
+def accessed_at(path, operation, variables):
+    with sqlite3.connect(path) as conn:
+        row = conn.execute("SELECT accessed_at FROM responses WHERE key = ?",
+                           (ResponseCache.make_key(operation, variables),)).fetchone()
+    return row[0] if row else None
+
+def test_per_operation_ttl(clock, path):
+    cache = ResponseCache(path, ttls={'Short': 10, 'Long': 100, 'Never': 0})
+    cache.set_many([('Short', {'id': 1}, {'v': 1}), ('Long', {'id': 1}, {'v': 2}), ('Never', {'id': 1}, {'v': 3})])
+    assert cache.stats()['entries'] == 2
+    assert cache.get('Short', {'id': 1}) == {'v': 1}
+    
+    clock.now += 50
+    assert cache.get('Short', {'id': 1}) is None
+    assert cache.get('Long', {'id': 1}) == {'v': 2}
+    assert cache.get('Never', {'id': 1}) is None
+    assert cache.ttl_for('Unknown') == cache.default_ttl
+    cache.close()
+
+def test_get_many_and_set_many_keep_order(clock, path):
+    cache = ResponseCache(path)
+    cache.set_many([('Op', {'page': 1}, {'p': 1}), ('Op', {'page': 2}, None), ('Op', {'page': 3}, {'p': 3})])
+    keys = [('Op', {'page': page}) for page in (3, 2, 1, 4)]
+    assert cache.get_many(keys) == [{'p': 3}, None, {'p': 1}, None]
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert cache.stats()['entries'] == 2
+    cache.close()
+
+def test_lru_eviction_uses_deferred_touches(clock, path):
+    cache = ResponseCache(path, max_entries=3, touch_batch=100)
+    for page in (1, 2, 3):
+        clock.now += 1
+        cache.set('Op', {'page': page}, {'p': page})
+    clock.now += 1
+    assert cache.get('Op', {'page': 1}) == {'p': 1}
+    
+    clock.now += 1
+    cache.set('Op', {'page': 4}, {'p': 4})
+    assert cache.evictions == 1
+    assert cache.get_many([('Op', {'page': page}) for page in (1, 2, 3, 4)]) == [{'p': 1}, None, {'p': 3}, {'p': 4}]
+    assert cache.stats()['entries'] == 3
+    cache.close()
+
+def test_expired_entries_are_evicted_first(clock, path):
+    cache = ResponseCache(path, max_entries=2, ttls={'Short': 5, 'Long': 100})
+    cache.set('Short', {'id': 1}, {'v': 'short'})
+    clock.now += 1
+    cache.set('Long', {'id': 1}, {'v': 'old'})
+    clock.now += 10
+    cache.set('Long', {'id': 2}, {'v': 'new'})
+    assert cache.evictions == 1
+    assert cache.get_many([('Long', {'id': 1}), ('Long', {'id': 2})]) == [{'v': 'old'}, {'v': 'new'}]
+    cache.close()
+
+def test_access_times_are_written_in_batches(clock, path):
+    cache = ResponseCache(path, touch_batch=2)
+    cache.set_many([('Op', {'page': 1}, {'p': 1}), ('Op', {'page': 2}, {'p': 2})])
+    created = clock.now
+    
+    clock.now += 5
+    cache.get('Op', {'page': 1})
+    assert accessed_at(path, 'Op', {'page': 1}) == created
+    
+    cache.get('Op', {'page': 2})
+    assert accessed_at(path, 'Op', {'page': 1}) == created + 5
+    assert accessed_at(path, 'Op', {'page': 2}) == created + 5
+    
+    clock.now += 5
+    cache.get('Op', {'page': 1})
+    cache.flush()
+    assert accessed_at(path, 'Op', {'page': 1}) == created + 10
+    
+    clock.now += 5
+    cache.get('Op', {'page': 2})
+    cache.close()
+    assert accessed_at(path, 'Op', {'page': 2}) == created + 15
+
+def test_clear_and_invalidate(clock, path):
+    cache = ResponseCache(path)
+    cache.set_many([('A', {'id': 1}, {'v': 1}), ('A', {'id': 2}, {'v': 2}), ('B', {'id': 1}, {'v': 3})])
+    cache.invalidate('A', {'id': 1})
+    assert cache.stats()['entries'] == 2
+    cache.invalidate('A')
+    assert cache.get_many([('A', {'id': 2}), ('B', {'id': 1})]) == [None, {'v': 3}]
+    cache.clear()
+    assert cache.stats()['entries'] == 0
+    cache.close()
+    
+    reopened = ResponseCache(path)
+    assert reopened.stats()['entries'] == 0
+    reopened.close()
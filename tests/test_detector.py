@@ -0,0 +1,37 @@
+from ..analysis import StreamingAnalysis
+from ..api import RequestScheduler, EndpointBudget
+from ..core import TokopediaFakeDetector, ResultStore
+
+PRODUCT_URL = "https://www.tokopedia.com/toko/sepatu-lari"
+
+def detector(url: str, **options) -> TokopediaFakeDetector:
+    return TokopediaFakeDetector(url, scheduler=RequestScheduler({'default': EndpointBudget(rate=1000.0, burst=1000.0)}), **options)
+
+def review_pages(server) -> int:
+    return server.operations.count('productReviewList')
+
+def test_sample_is_fetched_in_waves(graphql_server):
+    result = detector(graphql_server.url).analyze(PRODUCT_URL, find_sellers=False)
+    assert result.ok
+    assert len(result.sample['pages']) >= 2
+    assert graphql_server.requests == 3
+    assert review_pages(graphql_server) == result.sample['requests']
+
+def test_saturation_skips_later_waves(graphql_server, monkeypatch):
+    monkeypatch.setattr(StreamingAnalysis, 'is_saturated', lambda self, analysis=None: self.pages >= 2)
+    result = detector(graphql_server.url).analyze(PRODUCT_URL, find_sellers=False)
+    assert result.ok
+    assert result.sample['requests'] == 2
+    assert len(result.sample['pages']) == 1
+    assert review_pages(graphql_server) == 2
+
+def test_quick_analysis_is_not_stored(graphql_server, tmp_path):
+    store = ResultStore(str(tmp_path / "results.db"))
+    try:
+        fake = detector(graphql_server.url, result_store=store)
+        assert fake.quick_analyze(PRODUCT_URL).ok
+        assert store.result(PRODUCT_URL) is None
+        fake.analyze(PRODUCT_URL, find_sellers=False)
+        assert store.result(PRODUCT_URL) is not None
+    finally:
+        store.close()
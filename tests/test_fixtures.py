@@ -0,0 +1,41 @@
+import asyncio
+from ..api import FixtureArchive, RequestScheduler, EndpointBudget
+from ..core import TokopediaFakeDetector
+
+PRODUCT_URL = "https://www.tokopedia.com/toko/sepatu-lari"
+OFFLINE_ENDPOINT = "http://127.0.0.1:9/graphql"
+
+def detector(url: str, fixtures: FixtureArchive) -> TokopediaFakeDetector:
+    return TokopediaFakeDetector(url, fixtures=fixtures, scheduler=RequestScheduler({'default': EndpointBudget(rate=1000.0, burst=1000.0)}))
+
+def comparable(result):
+    payload = result.to_dict()
+    payload.pop('trace')
+    return payload
+
+def test_record_then_replay_round_trip(graphql_server, tmp_path):
+    path = str(tmp_path / "fixtures.jsonl.gz")
+    recorder = FixtureArchive(path, "record")
+    recorded = detector(graphql_server.url, recorder).analyze(PRODUCT_URL, find_sellers=False)
+    recorder.close()
+    assert recorded.ok
+    assert recorder.recorded == len(graphql_server.operations)
+    requests = graphql_server.requests
+    
+    replay = FixtureArchive(path, "replay")
+    assert len(replay) == recorder.recorded
+    replayed = detector(OFFLINE_ENDPOINT, replay).analyze(PRODUCT_URL, find_sellers=False)
+    assert comparable(replayed) == comparable(recorded)
+    assert replay.stats()['misses'] == 0
+    
+    async_replayed = asyncio.run(detector(OFFLINE_ENDPOINT, replay).analyze_async(PRODUCT_URL, find_sellers=False))
+    assert comparable(async_replayed) == comparable(recorded)
+    assert graphql_server.requests == requests
+
+def test_replay_miss_returns_none(tmp_path):
+    path = str(tmp_path / "fixtures.jsonl.gz")
+    open(path, 'wb').close()
+    replay = FixtureArchive(path, "replay")
+    result = detector(OFFLINE_ENDPOINT, replay).analyze(PRODUCT_URL, find_sellers=False)
+    assert result.status == 'not_found'
+    assert replay.stats()['misses'] == 3
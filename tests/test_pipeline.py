@@ -0,0 +1,27 @@
+import pytest
+from ..analysis import StreamingAnalysis, ReviewPipeline, ReviewTable, PatternAnalyzer, PrefixFilterSimilarityEngine
+from ..analysis.patterns import PatternAccumulator
+from ..analysis.text import TokenCache
+from ..benchmarks import generate_reviews
+
+@pytest.fixture(scope="module")
+def reviews():
+    return generate_reviews(600)
+
+def test_streaming_snapshot_matches_batch(reviews):
+    streaming = StreamingAnalysis(engine=PrefixFilterSimilarityEngine())
+    for start in range(0, len(reviews), 50):
+        streaming.feed_page(reviews[start:start + 50])
+    
+    expected = ReviewPipeline.run(reviews)
+    assert streaming.snapshot() == expected
+    assert streaming.final() == expected
+    assert ReviewPipeline.run_table(ReviewTable.from_reviews(reviews)) == expected
+
+def test_pattern_results_survive_cache_resets(reviews):
+    expected = PatternAnalyzer.analyze(reviews)
+    accumulator = PatternAccumulator(cache=TokenCache(max_words=50))
+    for review in reviews:
+        accumulator.update(review, 0, None)
+    assert accumulator.cache.stats()['resets'] > 0
+    assert accumulator.finalize() == expected
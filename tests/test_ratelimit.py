@@ -0,0 +1,114 @@
+import asyncio
+import random
+import pytest
+from ..api import APIFetcher, AsyncAPIFetcher, RequestScheduler, EndpointBudget, TokenBucket, FetchError
+from ..api.ratelimit import AdaptiveRate, retry_after
+from ..core import TokopediaFakeDetector
+
+PRODUCT_URL = "https://www.tokopedia.com/toko/sepatu-lari"
+OPERATION = 'productrevGetMiniProductInfo'
+
+def fast_scheduler(max_retries: int = 3) -> RequestScheduler:
+    budget = EndpointBudget(rate=100.0, burst=100.0, min_rate=50.0, max_rate=200.0,
+                            max_retries=max_retries, base_delay=0.01, max_delay=0.05)
+    return RequestScheduler({'default': budget})
+
+def test_aimd_rate_adjustment():
+    controller = AdaptiveRate(EndpointBudget(rate=2.0, min_rate=0.2, max_rate=8.0, increase=0.25, decrease=0.5))
+    controller.on_success()
+    assert controller.rate == pytest.approx(2.25)
+    controller.on_throttle()
+    assert controller.rate == pytest.approx(1.125)
+    for _ in range(10):
+        controller.on_throttle()
+    assert controller.rate == pytest.approx(0.2)
+    for _ in range(100):
+        controller.on_success()
+    assert controller.rate == pytest.approx(8.0)
+    assert (controller.requests, controller.throttled) == (112, 11)
+
+def test_backoff_is_jittered_and_bounded():
+    random.seed(3)
+    controller = AdaptiveRate(EndpointBudget(base_delay=0.5, max_delay=30.0))
+    for attempt in range(10):
+        ceiling = min(30.0, 0.5 * 2 ** attempt)
+        for _ in range(50):
+            assert ceiling / 2 <= controller.backoff(attempt) <= ceiling
+    assert controller.retries == 500
+
+def test_backoff_honours_retry_after():
+    controller = AdaptiveRate(EndpointBudget(base_delay=0.5, max_delay=30.0))
+    assert controller.backoff(0, 7.0) == 7.0
+    assert controller.backoff(0, 120.0) == 30.0
+    assert retry_after("2.5") == 2.5
+    assert retry_after("-1") == 0.0
+    assert retry_after("Wed, 21 Oct 2015 07:28:00 GMT") is None
+    assert retry_after(None) is None
+
+def test_throttle_pauses_bucket_for_retry_after():
+    scheduler = RequestScheduler({'default': EndpointBudget(rate=10.0, burst=1.0, min_rate=10.0)})
+    scheduler.record(OPERATION, 429, "2")
+    assert scheduler.controller(OPERATION).bucket.reserve() >= 2.0
+    assert scheduler.stats()[OPERATION]['throttled'] == 1
+
+def test_token_bucket_spacing():
+    bucket = TokenBucket(rate=10.0, capacity=2.0)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+
+def test_should_retry():
+    scheduler = fast_scheduler(max_retries=2)
+    assert scheduler.should_retry(OPERATION, 429, 0)
+    assert scheduler.should_retry(OPERATION, None, 1)
+    assert not scheduler.should_retry(OPERATION, 429, 2)
+    assert not scheduler.should_retry(OPERATION, 404, 0)
+
+def test_sync_fetcher_retries_through_429s(graphql_server):
+    graphql_server.failures = [429, 429]
+    graphql_server.retry_after = "0"
+    scheduler = fast_scheduler()
+    product = APIFetcher(graphql_server.url, scheduler=scheduler).fetch_product_info(PRODUCT_URL)
+    assert product['product']['name'] == "Sepatu Lari"
+    assert graphql_server.requests == 3
+    stats = scheduler.stats()[OPERATION]
+    assert (stats['requests'], stats['throttled'], stats['retries']) == (3, 2, 2)
+
+def test_sync_fetcher_gives_up_after_max_retries(graphql_server):
+    graphql_server.failures = [429] * 10
+    fetcher = APIFetcher(graphql_server.url, scheduler=fast_scheduler(max_retries=2))
+    assert fetcher.fetch_product_info(PRODUCT_URL) is None
+    assert graphql_server.requests == 3
+    
+    with pytest.raises(FetchError) as error:
+        fetcher.fetch_product_bundle(PRODUCT_URL)
+    assert error.value.status == 429
+    assert error.value.throttled
+    assert graphql_server.requests == 6
+
+def test_async_fetcher_retries_and_gives_up(graphql_server):
+    graphql_server.failures = [503, 429]
+    scheduler = fast_scheduler(max_retries=2)
+    
+    async def run():
+        async with AsyncAPIFetcher(graphql_server.url, scheduler=scheduler) as api:
+            product = await api.fetch_product_info(PRODUCT_URL)
+            graphql_server.failures = [429] * 3
+            with pytest.raises(FetchError):
+                await api.fetch_product_bundle(PRODUCT_URL)
+            return product
+    
+    assert asyncio.run(run())['product']['id'] == '1'
+    assert graphql_server.requests == 6
+    assert scheduler.stats()[OPERATION]['throttled'] == 5
+
+def test_detector_reports_rate_limited(graphql_server):
+    graphql_server.failures = [429] * 10
+    detector = TokopediaFakeDetector(graphql_server.url, scheduler=fast_scheduler(max_retries=2))
+    result = detector.analyze(PRODUCT_URL, find_sellers=False)
+    assert result.status == 'rate_limited'
+    assert "HTTP 429" in result.error
+    
+    graphql_server.failures = [500] * 3
+    assert detector.analyze(PRODUCT_URL, find_sellers=False).status == 'fetch_failed'
+    assert detector.analyze(PRODUCT_URL, find_sellers=False).ok
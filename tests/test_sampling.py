@@ -0,0 +1,90 @@
+import math
+import pytest
+from ..core.sampling import SamplingPlanner, PageRequest, estimate_confidence, INFORMATIVE, RECENT
+
+def rating_topics(total, strata=None):
+    detail = [{'rate': rate, 'totalReviews': count} for rate, count in (strata or {}).items()]
+    return {'rating': {'totalRating': total, 'detail': detail}}
+
+def analysis(anonymous=0, verified=100, night=0, variants=None, distribution=None):
+    return {
+        'buyers': {'anonymous_percentage': anonymous, 'verified_buyers': verified},
+        'ratings': {'distribution': distribution or {}},
+        'time_data': {'night_reviews': night},
+        'variants': {'variant_distribution': variants or {}}
+    }
+
+def test_sample_size_uses_finite_population_correction():
+    planner = SamplingPlanner()
+    base = 1.96 ** 2 * 0.25 / 0.1 ** 2
+    for population in (50, 1000, 10 ** 6):
+        assert planner.sample_size(population) == min(population, math.ceil(base / (1 + (base - 1) / population)))
+    assert planner.sample_size(0) == math.ceil(base)
+    assert planner.sample_size(1) == 1
+    assert planner.sample_size(15) == 14
+    assert planner.sample_size(50) < planner.sample_size(1000) < planner.sample_size(10 ** 6) <= math.ceil(base)
+
+def test_plan_without_rating_data_reads_sequential_pages():
+    plan = SamplingPlanner().plan(None, max_pages=3)
+    assert plan.population == 0
+    assert plan.pages == [PageRequest(2, INFORMATIVE), PageRequest(3, INFORMATIVE)]
+    assert not plan.census
+
+def test_population_smaller_than_a_page_is_a_census():
+    plan = SamplingPlanner().plan(rating_topics(15, {5: 15}), max_pages=5)
+    assert plan.census
+    assert plan.pages == []
+    assert plan.requests == 1
+
+def test_small_population_is_read_completely():
+    plan = SamplingPlanner().plan(rating_topics(40, {5: 35, 1: 5}), max_pages=5)
+    assert plan.census
+    assert plan.pages == [PageRequest(2, INFORMATIVE)]
+
+def test_large_population_is_stratified_by_rating():
+    plan = SamplingPlanner().plan(rating_topics(1000, {5: 650, 4: 250, 1: 100, 2: 0}), max_pages=5)
+    assert not plan.census
+    assert plan.target == 88
+    assert plan.pages == [
+        PageRequest(1, RECENT, "rating=5"),
+        PageRequest(12, RECENT, "rating=5"),
+        PageRequest(23, RECENT, "rating=5"),
+        PageRequest(1, RECENT, "rating=4")
+    ]
+    assert plan.requests == 5
+
+def test_allocation_is_proportional_and_exhaustive():
+    allocation = SamplingPlanner._allocate({5: 650, 4: 250, 1: 100}, 9)
+    assert sum(allocated for _, allocated in allocation.values()) == 9
+    assert allocation == {5: (650, 6), 4: (250, 2), 1: (100, 1)}
+    assert SamplingPlanner._allocate({5: 10}, 0) == {}
+    assert SamplingPlanner._allocate({}, 4) == {}
+
+def test_stride_never_exceeds_stratum_pages():
+    planner = SamplingPlanner()
+    assert planner._stride(30, 5) == [1, 2]
+    assert planner._stride(0, 3) == [1]
+
+def test_zero_totals_plan_no_extra_pages():
+    plan = SamplingPlanner().plan(rating_topics(1000, {5: 0, 4: 0}), max_pages=5)
+    assert plan.pages == []
+    assert not plan.census
+
+def test_confidence_edge_cases():
+    assert estimate_confidence(analysis(), 0, 1000) == 0.0
+    assert estimate_confidence(analysis(), 100, 1000) == 0.0
+    assert estimate_confidence(analysis(anonymous=40, distribution={5: 90, 1: 10}), 100, 100) == 1.0
+    assert estimate_confidence(analysis(anonymous=40, distribution={5: 90, 1: 10}), 100, 0) < 1.0
+
+def test_confidence_grows_with_sample_and_correction():
+    signals = analysis(anonymous=40, verified=10, night=10, variants={'a': 30, 'b': 30}, distribution={5: 40, 4: 20})
+    small = estimate_confidence(signals, 60, 10000)
+    corrected = estimate_confidence(signals, 60, 80)
+    large = estimate_confidence(signals, 600, 10000)
+    assert 0 < small < large < 1
+    assert small < corrected < 1
+
+def test_confidence_is_low_near_thresholds():
+    near = estimate_confidence(analysis(anonymous=31, distribution={5: 50, 4: 50}), 100, 10000)
+    far = estimate_confidence(analysis(anonymous=5, distribution={5: 50, 4: 50}), 100, 10000)
+    assert near < 0.7 < far
@@ -0,0 +1,147 @@
+import random
+import pytest
+from ..analysis import FakeScorer
+from ..analysis import scorer as scorer_module
+from ..analysis.scorer import RuleTable, ScoreRule
+from ..analysis.table import np
+
+def reference_guaranteed(patterns, buyers, ratings, time_data, rating_topics=None):
+    score = 0
+    if patterns['generic_reviews'] > 10:
+        score += 15
+    elif patterns['generic_reviews'] > 5:
+        score += 8
+    if len(patterns['suspiciously_similar']) > 5:
+        score += 20
+    elif len(patterns['suspiciously_similar']) > 2:
+        score += 10
+    if patterns['keyword_stuffing'] > 5:
+        score += 10
+    if patterns['excessive_praise'] > 8:
+        score += 10
+    if len(buyers['burst_reviewers']) > 3:
+        score += 15
+    if len(ratings['sudden_influx']) > 2:
+        score += 10
+    if len(time_data['suspicious_hours']) > 2:
+        score += 10
+    if rating_topics and rating_topics.get('rating'):
+        rating_data = rating_topics['rating']
+        if rating_data.get('detail'):
+            five_star = next((d for d in rating_data['detail'] if d.get('rate') == 5), None)
+            one_star = next((d for d in rating_data['detail'] if d.get('rate') == 1), None)
+            if five_star and five_star.get('percentageFloat', 0) > 95:
+                score += 15
+            if one_star and one_star.get('totalReviews', 0) == 0 and rating_data.get('totalRating', 0) > 100:
+                score += 10
+    return score
+
+def reference_score(patterns, buyers, ratings, time_data, rating_topics=None, variants=None, rings=None):
+    score = reference_guaranteed(patterns, buyers, ratings, time_data, rating_topics)
+    if buyers['anonymous_percentage'] > 50:
+        score += 15
+    elif buyers['anonymous_percentage'] > 30:
+        score += 8
+    if ratings['all_same_rating']:
+        score += 20
+    elif ratings['suspicious_pattern']:
+        score += 15
+    if time_data['night_reviews'] > 30:
+        score += 10
+    if variants and variants.get('single_variant_dominance'):
+        score += 15
+    if buyers.get('verified_buyers', 0) < 20:
+        score += 10
+    if rings:
+        if rings.get('ring_percentage', 0) > 30:
+            score += 15
+        elif rings.get('ring_percentage', 0) > 15:
+            score += 8
+    return min(score, FakeScorer.MAX_SCORE)
+
+def random_indicators(rnd: random.Random):
+    buyers = {'burst_reviewers': [0] * rnd.randint(0, 5),
+              'anonymous_percentage': rnd.choice([0, 30, 30.5, 50, 51, rnd.uniform(0, 100)])}
+    if rnd.random() < 0.8:
+        buyers['verified_buyers'] = rnd.choice([19, 20, rnd.randint(0, 40)])
+    return {
+        'review_patterns': {'generic_reviews': rnd.randint(0, 15), 'suspiciously_similar': [0] * rnd.randint(0, 8),
+                            'keyword_stuffing': rnd.randint(0, 8), 'excessive_praise': rnd.randint(0, 12)},
+        'suspicious_buyers': buyers,
+        'rating_anomalies': {'sudden_influx': [0] * rnd.randint(0, 4), 'all_same_rating': rnd.random() < 0.2,
+                             'suspicious_pattern': rnd.random() < 0.3},
+        'time_patterns': {'suspicious_hours': [0] * rnd.randint(0, 4), 'night_reviews': rnd.choice([30, rnd.randint(0, 40)])},
+        'rating_topics': rnd.choice([None, {}, {'rating': {
+            'detail': [{'rate': 5, 'percentageFloat': rnd.choice([95, rnd.uniform(80, 100)])},
+                       {'rate': 1, 'totalReviews': rnd.randint(0, 1)}],
+            'totalRating': rnd.choice([100, rnd.randint(0, 300)])}}]),
+        'variants': rnd.choice([None, {}, {'single_variant_dominance': rnd.random() < 0.5}]),
+        'rings': rnd.choice([None, {}, {'ring_percentage': rnd.choice([15, 30, rnd.uniform(0, 60)])}])
+    }
+
+def arguments(indicators):
+    return (indicators['review_patterns'], indicators['suspicious_buyers'], indicators['rating_anomalies'],
+            indicators['time_patterns'], indicators['rating_topics'], indicators['variants'], indicators['rings'])
+
+@pytest.fixture(scope="module")
+def corpus():
+    rnd = random.Random(1)
+    items = [random_indicators(rnd) for _ in range(3000)]
+    return items, [reference_score(*arguments(item)) for item in items]
+
+def test_calculate_matches_reference(corpus):
+    items, expected = corpus
+    assert [FakeScorer.calculate(*arguments(item)) for item in items] == expected
+    for item in items:
+        assert FakeScorer.guaranteed_score(*arguments(item)[:5]) == min(reference_guaranteed(*arguments(item)[:5]), 100)
+
+@pytest.mark.skipif(np is None, reason="numpy is not installed")
+def test_score_batch_matches_reference(corpus):
+    items, expected = corpus
+    batch = FakeScorer.score_batch(FakeScorer.feature_matrix(items))
+    assert batch.scores.tolist() == expected
+    for index in range(0, len(items), 37):
+        assert batch.fired_rules(index) == FakeScorer.evaluate(*arguments(items[index]))[1]
+
+def test_score_batch_without_numpy(corpus, monkeypatch):
+    items, expected = corpus
+    monkeypatch.setattr(scorer_module, "np", None)
+    rows = [FakeScorer.indicator_vector(item) for item in items]
+    batch = FakeScorer.score_batch(rows, RuleTable())
+    assert batch.scores == expected
+    for index in range(0, len(items), 37):
+        assert batch.fired_rules(index) == FakeScorer.evaluate(*arguments(items[index]))[1]
+
+@pytest.mark.skipif(np is None, reason="numpy is not installed")
+def test_evaluate_matrix_fires_first_rule_per_group():
+    rules = (
+        ScoreRule('a_high', 'generic_reviews', 10, 15, group='a'),
+        ScoreRule('a', 'generic_reviews', 5, 8, group='a'),
+        ScoreRule('a_low', 'generic_reviews', 1, 2, group='a'),
+        ScoreRule('b', 'keyword_stuffing', 5, 10),
+        ScoreRule('c_high', 'verified_buyers', 5, 9, above=False, group='c', guaranteed=False),
+        ScoreRule('c', 'verified_buyers', 20, 4, above=False, group='c', guaranteed=False)
+    )
+    table = RuleTable(rules)
+    width = len(table.features)
+    column = table.features.index
+    matrix = []
+    for generic, stuffing, verified in [(0, 0, 50), (2, 6, 20), (6, 0, 19), (10, 5, 5), (11, 6, 4), (11, 0, 30)]:
+        row = [0.0] * width
+        row[column('generic_reviews')] = generic
+        row[column('keyword_stuffing')] = stuffing
+        row[column('verified_buyers')] = verified
+        matrix.append(row)
+    
+    scores, guaranteed, fired = table.evaluate_matrix(matrix)
+    for index, row in enumerate(matrix):
+        score, expected_guaranteed, names = table.evaluate(row)
+        assert scores[index] == score
+        assert guaranteed[index] == expected_guaranteed
+        assert [name for name, hit in zip(table.names, fired[index]) if hit] == names
+    assert [name for name, hit in zip(table.names, fired[4]) if hit] == ['a_high', 'b', 'c_high']
+    assert scores.tolist() == [0, 12, 12, 12, 34, 15]
+
+def test_unknown_feature_is_rejected():
+    with pytest.raises(ValueError):
+        RuleTable([ScoreRule('x', 'no_such_feature', 1, 1)])
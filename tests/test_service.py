@@ -0,0 +1,42 @@
+import asyncio
+from aiohttp.test_utils import TestClient, TestServer
+from ..api import RequestScheduler, EndpointBudget
+from ..core import TokopediaFakeDetector
+from ..service import create_app
+
+PRODUCT_URL = "https://www.tokopedia.com/toko/sepatu-lari"
+
+def detector(url: str) -> TokopediaFakeDetector:
+    budget = EndpointBudget(rate=1000.0, burst=1000.0, min_rate=500.0, max_retries=1, base_delay=0.01, max_delay=0.02)
+    return TokopediaFakeDetector(url, scheduler=RequestScheduler({'default': budget}))
+
+def request(app, method: str, path: str, repeat: int = 1, **options):
+    async def run():
+        answers = []
+        async with TestClient(TestServer(app)) as client:
+            for _ in range(repeat):
+                response = await client.request(method, path, **options)
+                answers.append((response.status, await response.json()))
+        return answers
+    return asyncio.run(run())
+
+def test_seller_search_errors_are_json(graphql_server):
+    fake = detector(graphql_server.url)
+    
+    async def broken(query, exclude=None, api=None):
+        raise RuntimeError("search backend down")
+    
+    fake.find_trusted_sellers_async = broken
+    [(status, body)] = request(create_app(fake), 'GET', '/sellers', params={'q': 'sepatu'})
+    assert status == 502
+    assert "search backend down" in body['error']
+
+def test_analyze_reports_fetch_failures(graphql_server):
+    graphql_server.failures = [429] * 2 + [500] * 2
+    options = {'json': {'url': PRODUCT_URL, 'find_sellers': False}}
+    [(status, body)] = request(create_app(detector(graphql_server.url)), 'POST', '/analyze', **options)
+    assert (status, body['status']) == (503, 'rate_limited')
+    
+    (status, body), (retry_status, retry_body) = request(create_app(detector(graphql_server.url)), 'POST', '/analyze', 2, **options)
+    assert (status, body['status']) == (502, 'fetch_failed')
+    assert (retry_status, retry_body['status'], retry_body['cached']) == (200, 'ok', False)
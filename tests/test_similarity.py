@@ -0,0 +1,36 @@
+import pytest
+from ..analysis import SimilarityEngine, ExactSimilarityEngine, PrefixFilterSimilarityEngine
+from ..analysis.text import TokenCache
+from ..benchmarks import generate_reviews
+
+EXTRA_MESSAGES = ["", "👍👍", "👍👍", "!!!", "...", "Barang bagus, pengiriman cepat!", "barang bagus pengiriman cepat",
+                  "bagus", "bagus bagus", "Mantap jiwa 🔥🔥", "mantap jiwa"]
+
+@pytest.fixture(scope="module")
+def messages():
+    return [review.get('message') or '' for review in generate_reviews(400)] + EXTRA_MESSAGES
+
+def rounded(pairs):
+    return sorted((i, j, round(similarity, 9)) for i, j, similarity in pairs)
+
+@pytest.mark.parametrize("threshold", [0.3, 0.5, 0.8, 1.0])
+def test_prefix_filter_matches_exact(messages, threshold):
+    cache = TokenCache()
+    expected = rounded(ExactSimilarityEngine(cache).find_pairs(messages, threshold))
+    assert rounded(PrefixFilterSimilarityEngine(cache).find_pairs(messages, threshold)) == expected
+    if threshold < 1.0:
+        assert expected
+
+@pytest.mark.parametrize("engine_class", [ExactSimilarityEngine, PrefixFilterSimilarityEngine])
+@pytest.mark.parametrize("threshold", [0.5, 0.8])
+def test_incremental_index_matches_find_pairs(messages, engine_class, threshold):
+    engine = engine_class(TokenCache())
+    index = engine.index(threshold)
+    reviews = engine.cache.tokenize_all(messages)
+    for message, review in zip(messages, reviews):
+        index.add(message, review)
+    assert rounded(index.pairs(messages, reviews)) == rounded(engine.find_pairs(messages, threshold, reviews))
+
+def test_engine_is_abstract():
+    with pytest.raises(TypeError):
+        SimilarityEngine()
@@ -0,0 +1,71 @@
+from ..analysis import PatternAnalyzer, FakeScorer, ExactSimilarityEngine
+from ..analysis.text import TokenCache, normalize
+from ..utils import calculate_similarity
+
+PUNCTUATION_VARIANTS = [
+    "Barang bagus, pengiriman cepat!",
+    "barang bagus pengiriman cepat",
+    "BARANG BAGUS... PENGIRIMAN CEPAT!!",
+    "Barang baguss, pengiriman cepaat",
+    "Mantap, seller ramah dan responsif",
+    "mantap seller ramah dan responsif!!!",
+    "Kualitas oke sesuai harga",
+    "Packing rapi, aman sampai tujuan",
+    "Warna sesuai foto, ukuran pas",
+    "Recommended seller, pasti order lagi"
+]
+
+def test_normalize():
+    assert normalize("Mantappp!! Barang OK 👍") == "mantap barang ok"
+    assert normalize("harga_murah, 100% ori") == "harga murah 100 ori"
+    assert normalize("...") == ""
+
+def test_punctuation_variants_pair_after_normalization():
+    messages = PUNCTUATION_VARIANTS
+    raw_pairs = [(i, j) for i in range(len(messages)) for j in range(i + 1, len(messages))
+                 if calculate_similarity(messages[i], messages[j]) > 0.8]
+    assert raw_pairs == []
+    
+    reviews = [{'message': message} for message in messages]
+    pairs = PatternAnalyzer.analyze(reviews)['suspiciously_similar']
+    assert [(i, j) for i, j, _ in pairs] == [(0, 1), (0, 2), (1, 2), (4, 5)]
+    assert PatternAnalyzer.analyze(reviews, ExactSimilarityEngine())['suspiciously_similar'] == pairs
+
+def test_normalization_score_shift():
+    patterns = PatternAnalyzer.analyze([{'message': message} for message in PUNCTUATION_VARIANTS])
+    buyers = {'burst_reviewers': [], 'anonymous_percentage': 0, 'verified_buyers': 100}
+    ratings = {'sudden_influx': [], 'all_same_rating': False, 'suspicious_pattern': False}
+    time_data = {'suspicious_hours': [], 'night_reviews': 0}
+    
+    score, rules = FakeScorer.evaluate(patterns, buyers, ratings, time_data)
+    assert 'similar_reviews' in rules
+    assert 'similar_reviews_high' not in rules
+    
+    before, _ = FakeScorer.evaluate(dict(patterns, suspiciously_similar=[]), buyers, ratings, time_data)
+    assert score - before == 10
+
+def test_token_cache_clear_resets_vocabulary():
+    cache = TokenCache()
+    cache.get("barang bagus")
+    cache.clear()
+    assert cache.stats()['entries'] == 0
+    assert len(cache.vocabulary) == 0
+    assert cache.get("seller ramah").tokens == (0, 1)
+
+def test_token_cache_bounds_vocabulary():
+    cache = TokenCache(max_words=10)
+    for i in range(20):
+        cache.get(f"kata{i} lain{i}")
+    assert len(cache.vocabulary) <= 11
+    assert cache.stats()['resets'] > 0
+
+def test_pinned_vocabulary_survives_reset():
+    cache = TokenCache(max_words=4)
+    vocabulary = cache.vocabulary
+    first = cache.get("barang bagus sekali", vocabulary)
+    cache.get("kirim cepat aman", vocabulary)
+    cache.get("seller ramah", vocabulary)
+    again = cache.get("barang bagus sekali", vocabulary)
+    assert vocabulary is not cache.vocabulary
+    assert again.tokens == first.tokens
+    assert vocabulary.decode(again.tokens) == "barang bagus sekali"
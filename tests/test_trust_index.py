@@ -0,0 +1,28 @@
+import time
+from ..core import TrustIndex
+
+class SlowShopAPI:
+    def __init__(self, delay: float = 0.2):
+        self.delay = delay
+    
+    def fetch_shop_detail(self, domains):
+        time.sleep(self.delay)
+        return [{'shopCore': {'shopID': 100 + index, 'domain': domain, 'shopScore': 90},
+                 'goldOS': {'isOfficial': True, 'isGold': True},
+                 'favoriteData': {'totalFavorite': 5000}} for index, domain in enumerate(domains)]
+    
+    def fetch_shop_rating(self, shop_ids):
+        return [{'ratingScore': '4.9', 'totalRating': 10000} for _ in shop_ids]
+
+def test_close_waits_for_background_refresh(tmp_path):
+    path = str(tmp_path / "trust.db")
+    index = TrustIndex(path, refresh_batch_size=2)
+    index.schedule_refresh(SlowShopAPI(), ['toko1', 'toko2', 'toko3'])
+    index.close()
+    assert index.refreshed == 3
+    
+    reopened = TrustIndex(path)
+    try:
+        assert reopened.stats()['entries'] == 3
+    finally:
+        reopened.close()
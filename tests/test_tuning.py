@@ -0,0 +1,67 @@
+import pytest
+from ..analysis import FakeScorer
+from ..analysis.table import np
+from ..tuning.corpus import TuningCorpus, MAX_DAILY, load_labels
+from ..tuning.search import ThresholdTuner
+
+pytestmark = pytest.mark.skipif(np is None, reason="numpy is not installed")
+
+GENERIC = [12, 7, 7, 0, 0]
+LABELS = [1, 1, 0, 0, 1]
+
+@pytest.fixture
+def corpus():
+    features = np.zeros((len(GENERIC), len(FakeScorer.FEATURES)))
+    features[:, FakeScorer.FEATURES.index('generic_reviews')] = GENERIC
+    features[:, FakeScorer.FEATURES.index('verified_buyers')] = 100
+    return TuningCorpus(
+        urls=[f"https://www.tokopedia.com/toko/p{index}" for index in range(len(GENERIC))],
+        labels=np.asarray(LABELS, dtype=np.int8),
+        features=features,
+        hours=np.zeros((len(GENERIC), 24), dtype=np.int32),
+        days_over=np.zeros((len(GENERIC), MAX_DAILY + 1), dtype=np.int32)
+    )
+
+def test_baseline_matches_scorer(corpus):
+    tuner = ThresholdTuner(corpus)
+    scores = tuner.scores(tuner.baseline())[0]
+    assert scores.tolist() == [15, 8, 8, 0, 0]
+    assert scores.tolist() == FakeScorer.score_batch(corpus.features).scores.tolist()
+
+def test_metrics_match_hand_computed_values(corpus):
+    tuner = ThresholdTuner(corpus)
+    configs = tuner.grid({'cutoff': [30.0, 5.0, 10.0]})
+    metrics = tuner.evaluate(configs)
+    assert metrics['flagged'].tolist() == [0, 3, 1]
+    assert metrics['precision'] == pytest.approx([0, 2 / 3, 1])
+    assert metrics['recall'] == pytest.approx([0, 2 / 3, 1 / 3])
+    assert metrics['f1'] == pytest.approx([0, 2 / 3, 0.5])
+    assert metrics['auc'] == pytest.approx([4 / 6] * 3)
+
+def test_threshold_change_moves_auc(corpus):
+    tuner = ThresholdTuner(corpus)
+    configs = tuner.grid({'generic_reviews_high.threshold': [10.0, 6.0]})
+    assert tuner.evaluate(configs)['auc'] == pytest.approx([4 / 6, 3.5 / 6])
+
+def test_search_ranks_by_objective(corpus):
+    tuner = ThresholdTuner(corpus)
+    best = tuner.search(tuner.grid({'cutoff': [30.0, 5.0, 10.0]}), 'f1', top=2)
+    assert [result.config['cutoff'] for result in best] == [5.0, 10.0]
+    assert best[0].flagged == 3
+    with pytest.raises(ValueError):
+        tuner.search(tuner.baseline(), 'accuracy')
+    with pytest.raises(ValueError):
+        tuner.grid({'no_such_parameter': [1.0]})
+
+def test_single_class_corpus_has_no_auc(corpus):
+    corpus.labels = np.ones(len(GENERIC), dtype=np.int8)
+    tuner = ThresholdTuner(corpus)
+    assert np.isnan(tuner.evaluate(tuner.baseline())['auc'][0])
+
+def test_load_labels(tmp_path):
+    path = tmp_path / "labels.txt"
+    path.write_text("# url label\nhttps://www.tokopedia.com/a/b fake\nhttps://www.tokopedia.com/a/c,asli\n", encoding="utf-8")
+    assert load_labels(str(path)) == {"https://www.tokopedia.com/a/b": 1, "https://www.tokopedia.com/a/c": 0}
+    path.write_text("https://www.tokopedia.com/a/b maybe\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="labels.txt:1:"):
+        load_labels(str(path))
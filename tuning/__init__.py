@@ -0,0 +1,11 @@
+from .corpus import TuningCorpus, load_labels
+from .search import ThresholdTuner, TuningResult, baseline_config, default_space
+
+__all__ = [
+    "TuningCorpus",
+    "load_labels",
+    "ThresholdTuner",
+    "TuningResult",
+    "baseline_config",
+    "default_space"
+]
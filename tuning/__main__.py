@@ -0,0 +1,129 @@
+import sys
+import json
+import time
+import argparse
+from rich.console import Console
+from rich.table import Table
+from ..core.result_store import ResultStore, DEFAULT_RESULT_STORE_PATH
+from .corpus import TuningCorpus, load_labels
+from .search import ThresholdTuner, baseline_config, default_space, METRICS
+
+def parse_values(option: str):
+    name, _, values = option.partition("=")
+    if not name or not values:
+        raise argparse.ArgumentTypeError(f"expected NAME=V1,V2,... but got {option!r}")
+    try:
+        return name, [float(value) for value in values.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"non-numeric value in {option!r}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Tune FakeScorer and analyzer thresholds against labeled products")
+    parser.add_argument("--labels", metavar="FILE", help="file with one '<product url> <fake|genuine>' per line")
+    parser.add_argument("--store", metavar="PATH", default=DEFAULT_RESULT_STORE_PATH, help="result store to replay stored analyses from")
+    parser.add_argument("--corpus", metavar="FILE", help="load precomputed features from an .npz corpus instead of the store")
+    parser.add_argument("--save-corpus", metavar="FILE", help="write the precomputed features to an .npz corpus")
+    parser.add_argument("--search", choices=["random", "grid"], default="random", help="search strategy")
+    parser.add_argument("--samples", type=int, default=20000, help="configurations to try in random search")
+    parser.add_argument("--set", dest="values", type=parse_values, action="append", default=[], metavar="NAME=V1,V2",
+                        help="candidate values for a parameter; grid search varies only these")
+    parser.add_argument("--objective", choices=METRICS, default="auc", help="metric to rank configurations by")
+    parser.add_argument("--top", type=int, default=10, help="number of best configurations to show")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for random search")
+    parser.add_argument("--output", metavar="FILE", help="write the baseline and best configurations as JSON to FILE")
+    parser.add_argument("--list-parameters", action="store_true", help="print tunable parameters with their defaults and exit")
+    return parser.parse_args(argv)
+
+def load_corpus(args, console: Console) -> TuningCorpus:
+    if args.corpus:
+        return TuningCorpus.load(args.corpus)
+    
+    store = ResultStore(args.store)
+    try:
+        labels = load_labels(args.labels)
+        corpus = TuningCorpus.from_store(store, labels)
+    finally:
+        store.close()
+    skipped = len(labels) - len(corpus)
+    if skipped:
+        console.print(f"[yellow]{skipped} labeled product(s) have no stored analysis and were skipped[/yellow]")
+    return corpus
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    console = Console()
+    
+    if args.list_parameters:
+        space = default_space()
+        for name, value in baseline_config().items():
+            candidates = ", ".join(f"{candidate:g}" for candidate in space.get(name, []))
+            console.print(f"{name} = {value:g}  [dim]{candidates}[/dim]")
+        return 0
+    
+    if not args.corpus and not args.labels:
+        console.print("[red]Pass --labels (with --store) or --corpus[/red]")
+        return 2
+    
+    corpus = load_corpus(args, console)
+    if args.save_corpus:
+        corpus.save(args.save_corpus)
+        console.print(f"[green]Saved {len(corpus)} products to {args.save_corpus}[/green]")
+    if not len(corpus):
+        console.print("[red]Corpus is empty[/red]")
+        return 1
+    console.print(f"[dim]{len(corpus)} products, {corpus.positives} labeled fake[/dim]")
+    
+    tuner = ThresholdTuner(corpus)
+    values = dict(args.values)
+    try:
+        if args.search == "grid":
+            configs = tuner.grid(values)
+        else:
+            configs = tuner.sample(dict(default_space(), **values), args.samples, args.seed)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        return 2
+    
+    baseline = tuner.baseline()
+    baseline_result = tuner.result(baseline, tuner.evaluate(baseline), 0)
+    start = time.perf_counter()
+    best = tuner.search(configs, args.objective, args.top)
+    elapsed = time.perf_counter() - start
+    console.print(f"[dim]{len(configs):,} configurations in {elapsed:.2f}s ({len(configs) / max(elapsed, 1e-9):,.0f}/s)[/dim]")
+    
+    table = Table(title="Threshold Tuning", show_header=True, header_style="bold magenta")
+    table.add_column("#", justify="right")
+    table.add_column("AUC", justify="right")
+    table.add_column("Precision", justify="right")
+    table.add_column("Recall", justify="right")
+    table.add_column("F1", justify="right")
+    table.add_column("Flagged", justify="right")
+    table.add_column("Changes", style="cyan")
+    
+    defaults = baseline_result.config
+    for label, result in [("base", baseline_result)] + [(str(rank), result) for rank, result in enumerate(best, 1)]:
+        changes = [f"{name}={value:g}" for name, value in result.config.items() if value != defaults[name]]
+        summary = ", ".join(changes) if len(changes) <= 4 else f"{len(changes)} parameters changed"
+        table.add_row(label, f"{result.auc:.3f}", f"{result.precision:.3f}", f"{result.recall:.3f}",
+                      f"{result.f1:.3f}", str(result.flagged), summary or "-")
+    console.print(table)
+    
+    if args.output:
+        report = {
+            'products': len(corpus),
+            'positives': corpus.positives,
+            'search': args.search,
+            'objective': args.objective,
+            'configurations': len(configs),
+            'seconds': elapsed,
+            'baseline': baseline_result.to_dict(),
+            'best': [result.to_dict() for result in best]
+        }
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        console.print(f"[green]Saved tuning report to {args.output}[/green]")
+    
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Tuple
+from ..analysis import FakeScorer, ReviewTable
+from ..analysis.table import np, ordered_counts
+from ..core.result import AnalysisResult
+
+MAX_DAILY = 64
+LABELS = {
+    '1': 1, 'fake': 1, 'palsu': 1, 'true': 1,
+    '0': 0, 'genuine': 0, 'asli': 0, 'false': 0
+}
+
+def require_numpy():
+    if np is None:
+        raise RuntimeError("numpy is required for threshold tuning (pip install numpy)")
+
+def load_labels(path: str) -> Dict[str, int]:
+    labels = {}
+    with open(path, encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            parts = line.replace(',', ' ').split()
+            if len(parts) != 2 or parts[1].lower() not in LABELS:
+                raise ValueError(f"{path}:{number}: expected '<url> <fake|genuine>'")
+            labels[parts[0]] = LABELS[parts[1].lower()]
+    return labels
+
+def review_histograms(reviews: List[Dict]) -> Tuple[List[int], List[int]]:
+    hours, weekdays, days = ReviewTable.from_reviews(reviews).calendar()
+    hour_counts = [0] * 24
+    for hour, count in ordered_counts(hours):
+        hour_counts[hour] = count
+    days_over = [0] * (MAX_DAILY + 1)
+    for day, count in ordered_counts(days):
+        for limit in range(min(count, MAX_DAILY + 1)):
+            days_over[limit] += 1
+    return hour_counts, days_over
+
+@dataclass
+class TuningCorpus:
+    urls: List[str]
+    labels: Any
+    features: Any
+    hours: Any
+    days_over: Any
+    
+    def __len__(self) -> int:
+        return len(self.urls)
+    
+    @property
+    def positives(self) -> int:
+        return int(self.labels.sum())
+    
+    @classmethod
+    def build(cls, rows: Iterable[Tuple[str, int, Dict, List[Dict]]]) -> "TuningCorpus":
+        require_numpy()
+        urls, labels, features, hours, days_over = [], [], [], [], []
+        for url, label, indicators, reviews in rows:
+            hour_counts, day_counts = review_histograms(reviews)
+            urls.append(url)
+            labels.append(label)
+            features.append(FakeScorer.indicator_vector(indicators))
+            hours.append(hour_counts)
+            days_over.append(day_counts)
+        return cls(
+            urls=urls,
+            labels=np.asarray(labels, dtype=np.int8),
+            features=np.asarray(features, dtype=np.float64).reshape(-1, len(FakeScorer.FEATURES)),
+            hours=np.asarray(hours, dtype=np.int32).reshape(-1, 24),
+            days_over=np.asarray(days_over, dtype=np.int32).reshape(-1, MAX_DAILY + 1)
+        )
+    
+    @classmethod
+    def from_results(cls, items: Iterable[Tuple[AnalysisResult, int, List[Dict]]]) -> "TuningCorpus":
+        return cls.build((result.product_url, label, result.indicators(), reviews)
+                         for result, label, reviews in items if result.ok)
+    
+    @classmethod
+    def from_store(cls, store, labels: Dict[str, int]) -> "TuningCorpus":
+        def rows():
+            for url, label in labels.items():
+                result = store.result(url)
+                reviews = store.reviews(url)
+                if result is not None and result.ok and reviews:
+                    yield result, label, reviews
+        return cls.from_results(rows())
+    
+    def save(self, path: str):
+        np.savez_compressed(path, urls=np.asarray(self.urls, dtype=str), labels=self.labels,
+                            features=self.features, hours=self.hours, days_over=self.days_over,
+                            feature_names=np.asarray(FakeScorer.FEATURES, dtype=str))
+    
+    @classmethod
+    def load(cls, path: str) -> "TuningCorpus":
+        require_numpy()
+        with np.load(path) as data:
+            if tuple(data['feature_names']) != FakeScorer.FEATURES:
+                raise ValueError(f"{path} was recorded with a different feature layout")
+            return cls(
+                urls=[str(url) for url in data['urls']],
+                labels=data['labels'],
+                features=data['features'],
+                hours=data['hours'],
+                days_over=data['days_over']
+            )
@@ -0,0 +1,211 @@
+import itertools
+from dataclasses import dataclass, asdict, replace
+from typing import Any, Dict, List, Optional, Sequence
+from ..analysis import FakeScorer
+from ..analysis.scorer import RuleTable, ScoreRule
+from ..analysis.ratings import INFLUX_PER_DAY
+from ..analysis.time_analysis import SUSPICIOUS_HOURS, SUSPICIOUS_HOUR_COUNT
+from ..analysis.table import np
+from .corpus import TuningCorpus, MAX_DAILY, require_numpy
+
+BOOLEAN_FEATURES = ('all_same_rating', 'suspicious_pattern', 'single_variant_dominance')
+ANALYZER_PARAMETERS = ('night_start', 'night_end', 'night_hour_count', 'influx_per_day', 'cutoff')
+METRICS = ('auc', 'f1', 'precision', 'recall')
+DEFAULT_CUTOFF = 30
+THRESHOLD_FACTORS = (0.5, 0.75, 1.0, 1.25, 1.5)
+POINT_STEPS = (-5, 0, 5)
+MAX_GRID = 10_000_000
+
+def baseline_config(table: Optional[RuleTable] = None) -> Dict[str, float]:
+    table = table or FakeScorer.TABLE
+    config = {}
+    for rule in table.rules:
+        config[f"{rule.name}.threshold"] = float(rule.threshold)
+        config[f"{rule.name}.points"] = float(rule.points)
+    config.update({
+        'night_start': float(SUSPICIOUS_HOURS[0]),
+        'night_end': float(SUSPICIOUS_HOURS[1]),
+        'night_hour_count': float(SUSPICIOUS_HOUR_COUNT),
+        'influx_per_day': float(INFLUX_PER_DAY),
+        'cutoff': float(DEFAULT_CUTOFF)
+    })
+    return config
+
+def default_space(table: Optional[RuleTable] = None) -> Dict[str, List[float]]:
+    table = table or FakeScorer.TABLE
+    space = {}
+    for rule in table.rules:
+        if rule.feature not in BOOLEAN_FEATURES:
+            limit = 100 if rule.feature.endswith('percentage') else None
+            values = {max(0, round(rule.threshold * factor)) for factor in THRESHOLD_FACTORS}
+            space[f"{rule.name}.threshold"] = sorted(float(min(value, limit) if limit else value) for value in values)
+        space[f"{rule.name}.points"] = sorted({float(max(0, rule.points + step)) for step in POINT_STEPS})
+    space.update({
+        'night_start': [0.0, 1.0, 2.0, 3.0],
+        'night_end': [4.0, 5.0, 6.0],
+        'night_hour_count': [3.0, 5.0, 8.0],
+        'influx_per_day': [5.0, 10.0, 15.0, 20.0],
+        'cutoff': [20.0, 30.0, 40.0, 50.0]
+    })
+    return space
+
+@dataclass
+class TuningResult:
+    config: Dict[str, float]
+    precision: float
+    recall: float
+    f1: float
+    auc: float
+    flagged: int
+    
+    def rules(self, table: Optional[RuleTable] = None) -> List[ScoreRule]:
+        table = table or FakeScorer.TABLE
+        return [replace(rule, threshold=self.config[f"{rule.name}.threshold"],
+                        points=int(round(self.config[f"{rule.name}.points"])))
+                for rule in table.rules]
+    
+    def analyzer_settings(self) -> Dict[str, float]:
+        return {name: self.config[name] for name in ANALYZER_PARAMETERS}
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'precision': self.precision,
+            'recall': self.recall,
+            'f1': self.f1,
+            'auc': self.auc,
+            'flagged': self.flagged,
+            'analyzers': self.analyzer_settings(),
+            'rules': [asdict(rule) for rule in self.rules()]
+        }
+
+class ThresholdTuner:
+    def __init__(self, corpus: TuningCorpus, table: Optional[RuleTable] = None, chunk_cells: int = 1 << 22):
+        require_numpy()
+        self.corpus = corpus
+        self.table = table or FakeScorer.TABLE
+        self.chunk_cells = chunk_cells
+        self.parameters = list(baseline_config(self.table))
+        self.index = {name: position for position, name in enumerate(self.parameters)}
+        
+        rules = self.table.rules
+        self._thresholds = np.asarray([self.index[f"{rule.name}.threshold"] for rule in rules], dtype=np.int64)
+        self._points = np.asarray([self.index[f"{rule.name}.points"] for rule in rules], dtype=np.int64)
+        self._directions = np.asarray([1.0 if rule.above else -1.0 for rule in rules])
+        self._values = corpus.features[:, self.table.columns] * self._directions
+        self._hour_rules = [position for position, rule in enumerate(rules) if rule.feature == 'suspicious_hours']
+        self._influx_rules = [position for position, rule in enumerate(rules) if rule.feature == 'sudden_influx']
+        self._group_start = np.asarray([self.table.group_starts[group] for group in self.table.group_of], dtype=np.int64)
+        self._labels = corpus.labels.astype(bool)
+    
+    def baseline(self):
+        return np.asarray([list(baseline_config(self.table).values())], dtype=np.float64)
+    
+    def _check(self, space: Dict[str, Sequence[float]]):
+        unknown = [name for name in space if name not in self.index]
+        if unknown:
+            raise ValueError(f"Unknown parameter(s): {', '.join(unknown)}")
+    
+    def grid(self, space: Dict[str, Sequence[float]]):
+        self._check(space)
+        size = 1
+        for values in space.values():
+            size *= len(values)
+        if size > MAX_GRID:
+            raise ValueError(f"Grid has {size:,} configurations, use random search instead")
+        
+        names = list(space)
+        configs = np.repeat(self.baseline(), size, axis=0)
+        if names:
+            configs[:, [self.index[name] for name in names]] = np.asarray(list(itertools.product(*space.values())), dtype=np.float64)
+        return configs
+    
+    def sample(self, space: Dict[str, Sequence[float]], count: int, seed: int = 0):
+        self._check(space)
+        rng = np.random.default_rng(seed)
+        configs = np.repeat(self.baseline(), count, axis=0)
+        for name, values in space.items():
+            values = np.asarray(values, dtype=np.float64)
+            configs[:, self.index[name]] = values[rng.integers(len(values), size=count)]
+        return configs
+    
+    def scores(self, configs):
+        configs = np.asarray(configs, dtype=np.float64).reshape(-1, len(self.parameters))
+        thresholds = configs[:, self._thresholds] * self._directions
+        points = configs[:, self._points].astype(np.float32)
+        mask = self._values[None, :, :] > thresholds[:, None, :]
+        
+        if self._hour_rules:
+            hours = np.arange(24)
+            start = configs[:, self.index['night_start']]
+            end = configs[:, self.index['night_end']]
+            window = (hours >= start[:, None]) & (hours <= end[:, None])
+            over = self.corpus.hours[None, :, :] > configs[:, self.index['night_hour_count'], None, None]
+            suspicious = np.count_nonzero(over & window[:, None, :], axis=2)
+            for position in self._hour_rules:
+                mask[:, :, position] = suspicious * self._directions[position] > thresholds[:, position, None]
+        
+        if self._influx_rules:
+            limits = np.clip(np.floor(configs[:, self.index['influx_per_day']]), 0, MAX_DAILY).astype(np.int64)
+            influx = self.corpus.days_over[:, limits].T
+            for position in self._influx_rules:
+                mask[:, :, position] = influx * self._directions[position] > thresholds[:, position, None]
+        
+        counts = np.cumsum(mask, axis=2, dtype=np.int16)
+        padded = np.concatenate((np.zeros(counts.shape[:2] + (1,), dtype=np.int16), counts), axis=2)
+        fired = mask & (counts - padded[:, :, self._group_start] == 1)
+        scores = np.matmul(fired.astype(np.float32), points[:, :, None])[:, :, 0]
+        return np.minimum(scores, FakeScorer.MAX_SCORE)
+    
+    def _metrics(self, configs, scores) -> Dict[str, Any]:
+        labels = self._labels
+        positives = int(labels.sum())
+        negatives = len(labels) - positives
+        
+        flagged = scores > configs[:, self.index['cutoff'], None]
+        predicted = np.count_nonzero(flagged, axis=1)
+        tp = np.count_nonzero(flagged & labels, axis=1)
+        precision = np.divide(tp, predicted, out=np.zeros(len(configs)), where=predicted > 0)
+        recall = tp / positives if positives else np.zeros(len(configs))
+        total = precision + recall
+        f1 = np.divide(2 * precision * recall, total, out=np.zeros(len(configs)), where=total > 0)
+        
+        if positives and negatives:
+            bins = FakeScorer.MAX_SCORE + 1
+            binned = np.clip(np.rint(scores), 0, FakeScorer.MAX_SCORE).astype(np.int64) + np.arange(len(configs))[:, None] * bins
+            positive_counts = np.bincount(binned[:, labels].ravel(), minlength=len(configs) * bins).reshape(-1, bins)
+            negative_counts = np.bincount(binned[:, ~labels].ravel(), minlength=len(configs) * bins).reshape(-1, bins)
+            below = np.cumsum(negative_counts, axis=1) - negative_counts
+            auc = (positive_counts * (below + 0.5 * negative_counts)).sum(axis=1) / (positives * negatives)
+        else:
+            auc = np.full(len(configs), np.nan)
+        
+        return {'precision': precision, 'recall': recall, 'f1': f1, 'auc': auc, 'flagged': predicted}
+    
+    def evaluate(self, configs) -> Dict[str, Any]:
+        configs = np.asarray(configs, dtype=np.float64).reshape(-1, len(self.parameters))
+        step = max(1, self.chunk_cells // max(1, len(self.corpus) * max(len(self.table), 24)))
+        chunks = []
+        for start in range(0, len(configs), step):
+            chunk = configs[start:start + step]
+            chunks.append(self._metrics(chunk, self.scores(chunk)))
+        if not chunks:
+            return {name: np.zeros(0) for name in METRICS + ('flagged',)}
+        return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
+    
+    def result(self, configs, metrics: Dict[str, Any], position: int) -> TuningResult:
+        return TuningResult(
+            config=dict(zip(self.parameters, configs[position].tolist())),
+            precision=float(metrics['precision'][position]),
+            recall=float(metrics['recall'][position]),
+            f1=float(metrics['f1'][position]),
+            auc=float(metrics['auc'][position]),
+            flagged=int(metrics['flagged'][position])
+        )
+    
+    def search(self, configs, objective: str = 'auc', top: int = 10) -> List[TuningResult]:
+        if objective not in METRICS:
+            raise ValueError(f"Unknown objective: {objective}")
+        configs = np.asarray(configs, dtype=np.float64).reshape(-1, len(self.parameters))
+        metrics = self.evaluate(configs)
+        order = np.lexsort((-np.nan_to_num(metrics['f1'], nan=-1.0), -np.nan_to_num(metrics[objective], nan=-1.0)))
+        return [self.result(configs, metrics, int(position)) for position in order[:top]]
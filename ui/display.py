@@ -1,16 +1,43 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 from rich.text import Text
+from ..metrics import summarize_stages
 
 class DisplayManager:
     def __init__(self, console: Console):
         self.console = console
     
+    def display_analysis(self, result):
+        if result.status == 'not_found':
+            self.console.print("[red]Product not found[/red]")
+            return
+        if result.status == 'rate_limited':
+            self.console.print(f"[red]Tokopedia is rate limiting requests, try again later ({result.error})[/red]")
+            return
+        if result.status == 'fetch_failed':
+            self.console.print(f"[red]Failed to fetch product information: {result.error}[/red]")
+            return
+        if result.status == 'no_reviews':
+            self.console.print("[yellow]No reviews found for this product[/yellow]")
+            return
+        if result.status == 'error':
+            self.console.print(f"[red]Error: {result.error}[/red]")
+            return
+        
+        self.display_results(result.product_info, result.fake_score, result.review_patterns,
+                             result.suspicious_buyers, result.rating_anomalies, result.time_patterns,
+                             result.rating_topics, result.variants, result.confidence, result.sample, result.rings)
+        
+        if result.trusted_sellers:
+            self.display_trusted_sellers(result.trusted_sellers)
+    
     def display_results(self, product_info: Dict, fake_score: float, patterns: Dict, 
                        buyers: Dict, ratings: Dict, time_data: Dict, 
-                       rating_topics: Optional[Dict] = None, variants: Optional[Dict] = None):
+                       rating_topics: Optional[Dict] = None, variants: Optional[Dict] = None,
+                       confidence: Optional[float] = None, sample: Optional[Dict] = None,
+                       rings: Optional[Dict] = None):
         self.console.clear()
         
         header_panel = Panel.fit(
@@ -32,17 +59,21 @@ class DisplayManager:
             
             self.console.print(product_table)
         
-        risk_color = "red" if fake_score > 70 else "yellow" if fake_score > 40 else "green"
-        risk_level = "HIGH" if fake_score > 70 else "MEDIUM" if fake_score > 40 else "LOW"
+        risk_level, risk_color = self.risk_level(fake_score)
+        score_text = f"Fake Detection Score: {fake_score:.1f}%\nRisk Level: {risk_level}"
+        if confidence is not None:
+            score_text += f"\nConfidence: {confidence * 100:.0f}%"
+            if sample and sample.get('population'):
+                score_text += f" ({sample.get('reviews', 0):,} of {sample['population']:,} reviews sampled)"
         
         score_panel = Panel(
-            Text(f"Fake Detection Score: {fake_score:.1f}%\nRisk Level: {risk_level}", style=f"bold {risk_color}"),
+            Text(score_text, style=f"bold {risk_color}"),
             title="Analysis Result",
             border_style=risk_color
         )
         self.console.print(score_panel)
         
-        self._display_findings(patterns, buyers, ratings, time_data, variants)
+        self._display_findings(patterns, buyers, ratings, time_data, variants, rings)
         self._display_rating_details(rating_topics, ratings)
         
         if variants and variants.get('variant_distribution'):
@@ -51,8 +82,16 @@ class DisplayManager:
         if buyers.get('labeled_users'):
             self._display_user_labels(buyers)
     
+    @staticmethod
+    def risk_level(fake_score: float) -> Tuple[str, str]:
+        if fake_score > 70:
+            return "HIGH", "red"
+        if fake_score > 40:
+            return "MEDIUM", "yellow"
+        return "LOW", "green"
+    
     def _display_findings(self, patterns: Dict, buyers: Dict, ratings: Dict, 
-                         time_data: Dict, variants: Optional[Dict]):
+                         time_data: Dict, variants: Optional[Dict], rings: Optional[Dict] = None):
         findings_table = Table(title="Detection Findings", show_header=True, header_style="bold yellow")
         findings_table.add_column("Category", style="cyan")
         findings_table.add_column("Finding", style="white")
@@ -92,6 +131,9 @@ class DisplayManager:
             if variants.get('variant_count', 0) == 1:
                 findings_table.add_row("Variant Analysis", "Only one variant reviewed", "Medium")
         
+        if rings and rings.get('ring_reviewers', 0) > 0:
+            findings_table.add_row("Reviewer Ring", f"{rings['ring_percentage']:.1f}% reviewers in a {rings['ring_products']}-product review ring", "High" if rings['ring_percentage'] > 30 else "Medium")
+        
         if buyers.get('verified_buyers', 0) < 20:
             findings_table.add_row("Buyer Verification", f"Only {buyers.get('verified_buyers', 0):.1f}% verified buyers", "Medium")
         
@@ -265,3 +307,78 @@ class DisplayManager:
                     self.console.print(f"  • {reason}")
             
             self.console.print()
+    
+    def display_batch_summary(self, rows: List[Dict]):
+        summary_table = Table(title="Batch Analysis Summary", show_header=True, header_style="bold magenta")
+        summary_table.add_column("#", style="dim")
+        summary_table.add_column("Product", style="cyan")
+        summary_table.add_column("Fake Score", style="white")
+        summary_table.add_column("Risk", style="white")
+        summary_table.add_column("Confidence", style="white")
+        summary_table.add_column("Reviews", style="white")
+        summary_table.add_column("Status", style="white")
+        
+        for idx, row in enumerate(rows, 1):
+            name = row['product_name'] or row['product_url']
+            if row['fake_score'] is None:
+                score_text, risk_text = "-", "-"
+            else:
+                risk_level, risk_color = self.risk_level(row['fake_score'])
+                score_text = f"[{risk_color}]{row['fake_score']:.1f}%[/{risk_color}]"
+                risk_text = f"[{risk_color}]{risk_level}[/{risk_color}]"
+            confidence_text = f"{row['confidence'] * 100:.0f}%" if row.get('confidence') is not None else "-"
+            status = row['status'] if not row.get('error') else f"{row['status']}: {row['error'][:40]}"
+            summary_table.add_row(str(idx), name[:60], score_text, risk_text, confidence_text, str(row['review_count']), status)
+        
+        self.console.print(summary_table)
+    
+    def display_shop_report(self, report):
+        if report.status == 'not_found':
+            self.console.print(f"[red]Shop {report.shop_domain} not found[/red]")
+            return
+        
+        trust = report.trust
+        summary = report.summary
+        shop_table = Table(title=f"Shop Sweep: {report.shop_domain}", show_header=True, header_style="bold magenta")
+        shop_table.add_column("Metric", style="cyan")
+        shop_table.add_column("Value", style="white")
+        
+        trust_color = "green" if trust.get('trust_score', 0) >= 70 else "yellow" if trust.get('trust_score', 0) >= 50 else "red"
+        shop_table.add_row("Trust Score", f"[{trust_color}]{trust.get('trust_score', 0)}%[/{trust_color}]")
+        shop_table.add_row("Products", f"{summary.get('analyzed', 0)} analyzed of {report.catalog_size} ({summary.get('deep', 0)} deep)")
+        shop_table.add_row("Reviews Sampled", f"{summary.get('reviews', 0):,}")
+        
+        risk_level, risk_color = self.risk_level(summary.get('weighted_score', 0))
+        shop_table.add_row("Weighted Fake Score", f"[{risk_color}]{summary.get('weighted_score', 0):.1f}% ({risk_level})[/{risk_color}]")
+        shop_table.add_row("Mean / Max Score", f"{summary.get('mean_score', 0):.1f}% / {summary.get('max_score', 0):.1f}%")
+        shop_table.add_row("High / Medium Risk", f"{summary.get('high_risk', 0)} / {summary.get('medium_risk', 0)} products")
+        if summary.get('ring_products'):
+            shop_table.add_row("Reviewer Rings", f"{summary['ring_products']} products share ring reviewers")
+        
+        self.console.print(shop_table)
+        if report.products:
+            self.display_batch_summary(report.products)
+    
+    def display_trace(self, stages: List[Dict]):
+        trace_table = Table(title="Stage Timings", show_header=True, header_style="bold magenta")
+        trace_table.add_column("Stage", style="cyan", overflow="fold")
+        trace_table.add_column("Calls", justify="right")
+        trace_table.add_column("Time", justify="right")
+        trace_table.add_column("Requests", justify="right")
+        trace_table.add_column("Received", justify="right")
+        trace_table.add_column("Cache Hits", justify="right")
+        trace_table.add_column("Reviews", justify="right")
+        
+        for total in summarize_stages(stages):
+            color = "red" if total['errors'] else "white"
+            trace_table.add_row(
+                total['stage'],
+                str(total['calls']),
+                f"[{color}]{total['seconds'] * 1000:.1f} ms[/{color}]",
+                str(total['requests']) if total['requests'] else "-",
+                f"{total['bytes_received'] / 1024:.1f} KiB" if total['bytes_received'] else "-",
+                str(total['cache_hits']) if total['cache_hits'] else "-",
+                str(total['reviews']) if total['reviews'] else "-"
+            )
+        
+        self.console.print(trace_table)
@@ -1,4 +1,4 @@
 from .headers import HeaderGenerator
-from .helpers import calculate_similarity
+from .helpers import calculate_similarity, parse_timestamp, timestamp_to_datetime, review_key, WIB, WIB_OFFSET
 
-__all__ = ["HeaderGenerator", "calculate_similarity"]
+__all__ = ["HeaderGenerator", "calculate_similarity", "parse_timestamp", "timestamp_to_datetime", "review_key", "WIB", "WIB_OFFSET"]
@@ -1,3 +1,8 @@
+import json
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
 def calculate_similarity(text1: str, text2: str) -> float:
     if not text1 or not text2:
         return 0.0
@@ -18,3 +23,27 @@ def calculate_similarity(text1: str, text2: str) -> float:
     union = words1.union(words2)
     
     return len(intersection) / len(union) if union else 0.0
+
+WIB_OFFSET = 7 * 3600
+WIB = timezone(timedelta(seconds=WIB_OFFSET), "WIB")
+
+def parse_timestamp(value: Any) -> int:
+    try:
+        return int(value) if value else 0
+    except (ValueError, TypeError):
+        return 0
+
+def timestamp_to_datetime(timestamp: int) -> Optional[datetime]:
+    if timestamp <= 0:
+        return None
+    try:
+        return datetime.fromtimestamp(timestamp, WIB)
+    except (ValueError, OverflowError, OSError):
+        return None
+
+def review_key(review: Dict) -> str:
+    review_id = review.get('id')
+    if review_id:
+        return str(review_id)
+    payload = json.dumps(review, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return "sha1:" + hashlib.sha1(payload.encode('utf-8')).hexdigest()